@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+
+Icon Panel Layout Benchmark
+===========================
+
+Compares the two IconPanel layouts, a String_Knob per icon against a single
+html grid Text_Knob per tab, by how many knobs the panel holds, how long it
+takes to build, and how long it takes to fill every page of every tab.
+
+## Usage
+
+Panels are built, so this needs to run within Nuke. From the root of the
+repository:
+::
+    nuke -t benchmarks/icon_panel_layout.py [repeats]
+
+Which defaults to building each layout 10 times.
+
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Imports
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Thorium Imports
+from thorium.iconPanel import iconPanel
+
+# =============================================================================
+# GLOBALS
+# =============================================================================
+
+REPEATS = 10
+
+# =============================================================================
+# PRIVATE FUNCTIONS
+# =============================================================================
+
+
+def _build(grid):
+    """Returns a new panel of the layout, and how long it took to build"""
+    start = time.time()
+    panel = iconPanel.IconPanel(grid=grid)
+
+    return panel, time.time() - start
+
+
+def _fill(panel):
+    """Returns how long it takes to show every page of every list"""
+    start = time.time()
+    for name in ('external', 'internal'):
+        pages = -(-len(panel.icon_lists[name]) // panel.batch)
+        for page in xrange(pages):
+            panel.show_page(name, page)
+
+    return time.time() - start
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+
+def main(repeats=REPEATS):
+    """Prints the knob count, build and fill times of each layout"""
+    # Scan the icon directories once up front, so the first build doesn't
+    # pay for writing the icon index.
+    iconPanel.find_icon_paths()
+
+    print '{0:>14} {1:>8} {2:>12} {3:>12}'.format(
+        'layout', 'knobs', 'build', 'fill'
+    )
+    for name, grid in (('knob per icon', False), ('html grid', True)):
+        builds = []
+        fills = []
+        for _ in xrange(repeats):
+            panel, elapsed = _build(grid)
+            builds.append(elapsed)
+            fills.append(_fill(panel))
+
+        print '{0:>14} {1:>8} {2:>11.4f}s {3:>11.4f}s'.format(
+            name,
+            len(panel.knobs()),
+            sum(builds) / repeats,
+            sum(fills) / repeats
+        )
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(int(sys.argv[1]))
+    else:
+        main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+"""
+
+Reconcile Execute Benchmark
+===========================
+
+Times evaluating an increasing number of Reconcile3D nodes over a frame range,
+comparing executing each node in turn with `nuke.execute`, as older versions
+of cardToTrack did, against executing them all in a single pass with
+`nuke.executeMultiple` through `cardToTrack._execute_reconciles`.
+
+Each Reconcile3D tracks its own Axis through an animated camera, just as the
+corners of a card are tracked. The nodes are rebuilt for every run, so
+neither method reads back values the other already evaluated.
+
+## Usage
+
+Nodes are created and executed, so this needs to run within Nuke. From the
+root of the repository:
+::
+    nuke -t benchmarks/reconcile_execute.py [frames] [reconcile counts...]
+
+Which defaults to 1000 frames, and 1, 4 and 16 Reconcile3D nodes.
+
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Imports
+import os
+import random
+import sys
+import time
+
+# Nuke Imports
+import nuke
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Thorium Imports
+from thorium.cardToTrack import cardToTrack
+
+# =============================================================================
+# GLOBALS
+# =============================================================================
+
+FRAMES = 1000
+RECONCILE_COUNTS = [1, 4, 16]
+
+# =============================================================================
+# PRIVATE FUNCTIONS
+# =============================================================================
+
+
+def _scene(frames):
+    """Returns an animated camera and a background to track through"""
+    camera = nuke.nodes.Camera2()
+    camera['translate'].setAnimated()
+    camera['rotate'].setAnimated()
+    for frame, translate, rotate in [
+        (1, (0.0, 0.0, 10.0), (0.0, 0.0, 0.0)),
+        (frames, (5.0, 2.0, 12.0), (5.0, 20.0, 0.0)),
+    ]:
+        for i in xrange(3):
+            camera['translate'].setValueAt(translate[i], frame, i)
+            camera['rotate'].setValueAt(rotate[i], frame, i)
+
+    background = nuke.nodes.Constant()
+
+    return camera, background
+
+
+def _reconciles(count, camera, background):
+    """Returns count Reconcile3D nodes, each tracking its own Axis"""
+    reconciles = []
+    for i in xrange(count):
+        axis = nuke.nodes.Axis()
+        axis['translate'].setValue(
+            [random.uniform(-2, 2) for _ in xrange(3)]
+        )
+        reconciles.append(
+            cardToTrack._create_reconcile3D(
+                axis, camera, background, 'Track{0}'.format(i)
+            )
+        )
+
+    return reconciles
+
+
+def _cleanup(reconciles):
+    """Deletes reconciles along with the Axis each one tracks"""
+    for reconcile in reconciles:
+        axis = reconcile.input(2)
+        nuke.delete(reconcile)
+        nuke.delete(axis)
+
+
+def _per_node(reconciles, frames):
+    """Executes each Reconcile3D over the range in turn"""
+    for reconcile in reconciles:
+        nuke.execute(reconcile, 1, frames)
+
+
+def _multiple(reconciles, frames):
+    """Executes every Reconcile3D over the range in a single pass"""
+    cardToTrack._execute_reconciles(reconciles, [(1, frames)])
+
+
+def _time(executor, count, camera, background, frames):
+    """Returns how long executor takes to evaluate count Reconcile3D nodes"""
+    reconciles = _reconciles(count, camera, background)
+
+    start = time.time()
+    executor(reconciles, frames)
+    elapsed = time.time() - start
+
+    _cleanup(reconciles)
+
+    return elapsed
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+
+def main(frames=FRAMES, reconcile_counts=RECONCILE_COUNTS):
+    """Prints a table of execution time against Reconcile3D count"""
+    executors = [
+        ('per node', _per_node),
+        ('multiple', _multiple),
+    ]
+
+    camera, background = _scene(frames)
+
+    print '{0} frames'.format(frames)
+    print '{0:>10} {1}'.format(
+        'reconciles',
+        ' '.join(['{0:>12}'.format(name) for name, _ in executors])
+    )
+    for count in reconcile_counts:
+        print '{0:>10} {1}'.format(
+            count,
+            ' '.join(
+                [
+                    '{0:>11.3f}s'.format(
+                        _time(executor, count, camera, background, frames)
+                    ) for _, executor in executors
+                ]
+            )
+        )
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(
+            int(sys.argv[1]),
+            [int(arg) for arg in sys.argv[2:]] or RECONCILE_COUNTS
+        )
+    else:
+        main()
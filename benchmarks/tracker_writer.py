@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+
+Tracker Writer Benchmark
+========================
+
+Times creating Tracker nodes holding an increasing number of tracks. The
+legacy Tracker3 holds 4 tracks, so it needs a node for every 4 tracks, keyed
+either one value at a time or a curve at a time. A Tracker4 holds every track
+in its `tracks` table, which is timed adding and keying each track through
+python, and written in a single knob script by `tracks_to_tracker`.
+
+## Usage
+
+Nodes are created, so this needs to run within Nuke. From the root of the
+repository:
+::
+    nuke -t benchmarks/tracker_writer.py [frames] [track counts...]
+
+Which defaults to 100 frames, and 4, 16, 64, 256 and 512 tracks.
+
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Imports
+import os
+import random
+import sys
+import time
+
+# Nuke Imports
+import nuke
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Thorium Imports
+from thorium.cardToTrack import cardToTrack
+
+# =============================================================================
+# GLOBALS
+# =============================================================================
+
+FRAMES = 100
+TRACK_COUNTS = [4, 16, 64, 256, 512]
+
+# =============================================================================
+# PRIVATE FUNCTIONS
+# =============================================================================
+
+
+def _cleanup():
+    """Deletes every Tracker3 and Tracker4 node in the root"""
+    for node in nuke.allNodes('Tracker3') + nuke.allNodes('Tracker4'):
+        nuke.delete(node)
+
+
+def _random_tracks(count, frames):
+    """Returns count random tracks over frames"""
+    return [
+        dict(
+            (frame, (random.uniform(0, 2048), random.uniform(0, 1556)))
+            for frame in xrange(1, frames + 1)
+        ) for _ in xrange(count)
+    ]
+
+
+def _per_value(tracks):
+    """Keys every frame of every track on Tracker3 nodes with setValueAt"""
+    for start in xrange(0, len(tracks), 4):
+        tracker = nuke.nodes.Tracker3()
+        for i, track in enumerate(tracks[start:start + 4]):
+            tracker['enable{0}'.format(i + 1)].setValue(1)
+            knob = tracker['track{0}'.format(i + 1)]
+            knob.setAnimated()
+            for frame in sorted(track):
+                knob.setValueAt(track[frame][0], frame, 0)
+                knob.setValueAt(track[frame][1], frame, 1)
+
+
+def _per_curve(tracks):
+    """Keys each track curve on Tracker3 nodes in a single addKey call"""
+    for start in xrange(0, len(tracks), 4):
+        tracker = nuke.nodes.Tracker3()
+        for i, track in enumerate(tracks[start:start + 4]):
+            tracker['enable{0}'.format(i + 1)].setValue(1)
+            cardToTrack._set_keys(tracker['track{0}'.format(i + 1)], track, 0)
+
+
+def _per_cell(tracks):
+    """Adds each track to a Tracker4, then keys its table cells"""
+    tracker = nuke.nodes.Tracker4()
+    table = tracker['tracks']
+    columns = len(cardToTrack.TRACKS_COLUMNS)
+    for i, track in enumerate(tracks):
+        tracker['add_track'].execute()
+        for frame in sorted(track):
+            table.setValueAt(track[frame][0], frame, i * columns + 2)
+            table.setValueAt(track[frame][1], frame, i * columns + 3)
+
+
+def _bulk(tracks):
+    """Writes every track onto a Tracker4 with a single knob script"""
+    cardToTrack.tracks_to_tracker(tracks, translate_only=True)
+
+
+def _time(writer, tracks):
+    """Returns how long writer takes to write tracks"""
+    start = time.time()
+    writer(tracks)
+    elapsed = time.time() - start
+    _cleanup()
+
+    return elapsed
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+
+def main(frames=FRAMES, track_counts=TRACK_COUNTS):
+    """Prints a table of creation time against track count for each writer"""
+    writers = [
+        ('T3 value', _per_value),
+        ('T3 curve', _per_curve),
+        ('T4 cell', _per_cell),
+        ('T4 script', _bulk),
+    ]
+
+    print '{0:>8} {1}'.format(
+        'tracks', ' '.join(['{0:>12}'.format(name) for name, _ in writers])
+    )
+    for count in track_counts:
+        tracks = _random_tracks(count, frames)
+        print '{0:>8} {1}'.format(
+            count,
+            ' '.join(
+                [
+                    '{0:>11.3f}s'.format(_time(writer, tracks))
+                    for _, writer in writers
+                ]
+            )
+        )
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(
+            int(sys.argv[1]),
+            [int(arg) for arg in sys.argv[2:]] or TRACK_COUNTS
+        )
+    else:
+        main()
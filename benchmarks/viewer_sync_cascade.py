@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+"""
+
+Viewer Sync Cascade Benchmark
+=============================
+
+Counts the callbacks a single knob change sets off across a group of synced
+viewers, with and without the sync transaction that suppresses callbacks set
+off by a sync's own writes.
+
+Whether Nuke raises knob changes for values set from Python depends on the
+session, so the Viewer dispatcher is removed, and each knob change is raised
+here instead, straight after the value is set, as Nuke would raise it.
+
+For each group size, the table shows the callbacks raised, the syncs they went
+on to apply, and the target knobs read or written by those syncs.
+
+## Usage
+
+Nodes are created, so this needs to run within Nuke. From the root of the
+repository:
+::
+    nuke -t benchmarks/viewer_sync_cascade.py [viewer counts...]
+
+Which defaults to 2, 4, 8, 16 and 32 synced viewers.
+
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Imports
+from contextlib import contextmanager
+import os
+import sys
+
+# Nuke Imports
+import nuke
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Thorium Imports
+from thorium.viewerSync import viewerSync
+
+# =============================================================================
+# GLOBALS
+# =============================================================================
+
+VIEWER_COUNTS = [2, 4, 8, 16, 32]
+
+# =============================================================================
+# PRIVATE FUNCTIONS
+# =============================================================================
+
+
+def _cleanup():
+    """Deletes every Viewer node in the root"""
+    for node in nuke.allNodes('Viewer'):
+        nuke.delete(node)
+
+
+def _count(caller, value, guarded):
+    """Returns the callbacks, syncs and knob visits of one change"""
+    counts = {'callbacks': 0, 'syncs': 0, 'visits': 0}
+    handle_event = viewerSync._handle_event
+    sync_knob = viewerSync._sync_knob
+    sync_transaction = viewerSync._sync_transaction
+
+    def raise_change(node, knob):
+        """Raises a knob change on node, as Nuke would"""
+        counts['callbacks'] += 1
+        handle_event(node, knob)
+
+    def cascading_sync(source, targets, knob):
+        """Syncs knob, raising a change on every target written"""
+        counts['syncs'] += 1
+        counts['visits'] += len(targets)
+        value = source[knob].value()
+        written = [
+            target for target in targets if target[knob].value() != value
+        ]
+        skipped = sync_knob(source, targets, knob)
+        for target in written:
+            raise_change(target, knob)
+
+        return skipped
+
+    @contextmanager
+    def no_transaction():
+        """Stands in for the sync transaction, without suppressing"""
+        yield
+
+    viewerSync._sync_knob = cascading_sync
+    if not guarded:
+        viewerSync._sync_transaction = no_transaction
+    try:
+        caller['masking_ratio'].setValue(value)
+        raise_change(caller, 'masking_ratio')
+    finally:
+        viewerSync._sync_knob = sync_knob
+        viewerSync._sync_transaction = sync_transaction
+
+    return counts
+
+
+def _setup(count):
+    """Returns count viewers synced together"""
+    viewers = [nuke.nodes.Viewer() for _ in xrange(count)]
+    for node in nuke.allNodes():
+        node.setSelected(node in viewers)
+    viewerSync.setup_sync()
+
+    # Knob changes are raised by `_count` instead.
+    nuke.removeKnobChanged(viewerSync._dispatch, nodeClass='Viewer')
+
+    return viewers
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+
+def main(viewer_counts=VIEWER_COUNTS):
+    """Prints a table of the callbacks set off by one change"""
+    print '{0:>8} {1:>30} {2:>30}'.format(
+        'viewers', 'unguarded', 'transaction'
+    )
+    print '{0:>8} {1}'.format(
+        '', ' '.join(['{0:>10}'.format(title) for title in (
+            'callbacks', 'syncs', 'visits'
+        ) * 2])
+    )
+    for count in viewer_counts:
+        viewers = _setup(count)
+        masking_ratios = viewers[0]['masking_ratio'].values()
+
+        results = []
+        for i, guarded in enumerate((False, True)):
+            # A different value each run, so every target needs writing.
+            value = masking_ratios[(i + 1) % len(masking_ratios)]
+            counts = _count(viewers[0], value, guarded)
+            results.extend(
+                [counts['callbacks'], counts['syncs'], counts['visits']]
+            )
+
+        print '{0:>8} {1}'.format(
+            count, ' '.join(['{0:>10}'.format(result) for result in results])
+        )
+
+        _cleanup()
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or VIEWER_COUNTS)
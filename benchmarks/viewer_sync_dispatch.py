@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+"""
+
+Viewer Sync Dispatch Benchmark
+==============================
+
+Compares how many Viewer knob changes a second viewerSync can handle through
+a knobChanged script on every synced viewer, as older versions used, against
+the single Viewer dispatcher added by `viewerSync.register_callbacks`.
+
+The script path is measured the way Nuke runs it, by compiling and running
+the knobChanged script for every event. The dispatcher path is measured by
+calling its handler directly. Nuke's own cost of raising the event is left
+out of both.
+
+Two kinds of events are timed. Ignored events are changes to Viewer knobs
+viewerSync doesn't sync, which are the vast majority while working. Synced
+events are changes to `masking_ratio`, which is synced by default.
+
+## Usage
+
+Nodes are created, so this needs to run within Nuke. From the root of the
+repository:
+::
+    nuke -t benchmarks/viewer_sync_dispatch.py [events] [viewer counts...]
+
+Which defaults to 10000 events, across 2, 4 and 6 synced viewers.
+
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Imports
+import os
+import sys
+import time
+
+# Nuke Imports
+import nuke
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Thorium Imports
+from thorium.viewerSync import viewerSync
+
+# =============================================================================
+# GLOBALS
+# =============================================================================
+
+EVENTS = 10000
+VIEWER_COUNTS = [2, 4, 6]
+
+# The knobChanged script older versions of viewerSync set on each viewer.
+SCRIPT = '_script_event(caller, caller_knob, {viewers})'
+
+# =============================================================================
+# PRIVATE FUNCTIONS
+# =============================================================================
+
+
+def _cleanup():
+    """Deletes every Viewer node in the root"""
+    for node in nuke.allNodes('Viewer'):
+        nuke.delete(node)
+
+
+def _script_event(caller, caller_knob, viewers):
+    """The body of sync_viewers as older versions of viewerSync ran it"""
+    if caller_knob not in ['inputChange', 'knobChanged']:
+        if caller_knob not in (viewerSync.SYNC_DEFAULTS.keys() +
+                               viewerSync.VIEWER_SYNC_KNOBS):
+            return
+
+        if caller_knob not in viewerSync.VIEWER_SYNC_KNOBS:
+            if not caller['vs_{knob}'.format(knob=caller_knob)].value():
+                return
+
+    viewer_nodes = [
+        nuke.toNode(viewer) for viewer in viewers if nuke.toNode(viewer)
+    ]
+    viewerSync._sync_knob(caller, viewer_nodes, caller_knob)
+
+
+def _setup(count):
+    """Returns count viewers synced together"""
+    viewers = [nuke.nodes.Viewer() for _ in xrange(count)]
+    for node in nuke.allNodes():
+        node.setSelected(node in viewers)
+    viewerSync.setup_sync()
+
+    return viewers
+
+
+def _time_dispatcher(caller, knobs, events):
+    """Returns events a second handled by the Viewer dispatcher"""
+    start = time.time()
+    for i in xrange(events):
+        viewerSync._handle_event(caller, knobs[i % len(knobs)])
+
+    return events / (time.time() - start)
+
+
+def _time_script(caller, knobs, events, viewers):
+    """Returns events a second handled by a knobChanged script"""
+    script = SCRIPT.format(
+        viewers=[
+            viewer.fullName() for viewer in viewers if viewer is not caller
+        ]
+    )
+    namespace = {'_script_event': _script_event, 'caller': caller}
+
+    start = time.time()
+    for i in xrange(events):
+        namespace['caller_knob'] = knobs[i % len(knobs)]
+        exec compile(script, '<knobChanged>', 'exec') in namespace
+
+    return events / (time.time() - start)
+
+# =============================================================================
+# MAIN
+# =============================================================================
+
+
+def main(events=EVENTS, viewer_counts=VIEWER_COUNTS):
+    """Prints a table of events a second for each path and kind of event"""
+    print '{0:>8} {1:>8} {2:>14} {3:>14}'.format(
+        'viewers', 'events', 'script /s', 'dispatcher /s'
+    )
+    for count in viewer_counts:
+        viewers = _setup(count)
+        caller = viewers[0]
+
+        kinds = [
+            (
+                'ignored',
+                [
+                    knob for knob in caller.knobs()
+                    if knob not in viewerSync.EVENT_KNOBS and
+                    not knob.startswith('vs_')
+                ]
+            ),
+            ('synced', ['masking_ratio']),
+        ]
+        for kind, knobs in kinds:
+            print '{0:>8} {1:>8} {2:>14,.0f} {3:>14,.0f}'.format(
+                count,
+                kind,
+                _time_script(caller, knobs, events, viewers),
+                _time_dispatcher(caller, knobs, events)
+            )
+
+        _cleanup()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        main(
+            int(sys.argv[1]),
+            [int(arg) for arg in sys.argv[2:]] or VIEWER_COUNTS
+        )
+    else:
+        main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Tests the functions of animatedSnap3D
+
+REQUIREMENTS:
+
+mock
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Imports
+import mock
+import sys
+import unittest
+
+sys.path.append('../')
+
+# Thorium Imports
+from thorium.animatedSnap3D import animatedSnap3D
+
+# =============================================================================
+# TEST CLASSES
+# =============================================================================
+
+
+class testAnimatedSnap(unittest.TestCase):
+    """Tests the animated_snap() function"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(animatedSnap3D, 'nuke', create=True),
+            mock.patch.object(animatedSnap3D, 'snap3d', create=True),
+            mock.patch.object(animatedSnap3D, '_frange_percent'),
+            mock.patch.object(animatedSnap3D.xforms, 'invalidate'),
+            mock.patch.object(animatedSnap3D.xforms, 'get_cache'),
+        ]
+        self.nuke, self.snap3d, _, self.invalidate, get_cache = [
+            patch.start() for patch in patches
+        ]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+        self.cache = get_cache.return_value
+
+        self.nuke.ProgressTask.return_value.isCancelled.return_value = False
+        self.nuke.math.Vector3.side_effect = lambda *point: point
+        self.node = mock.MagicMock()
+        self.node.inputs.return_value = 0
+
+        # A single selected vertex, with the selection rebuilt as a list.
+        self.snap3d.getSelection.return_value = [
+            mock.MagicMock(position=mock.MagicMock(x=1.0, y=2.0, z=3.0))
+        ]
+        self.snap3d.VertexSelection.side_effect = lambda: mock.MagicMock(
+            spec=['add'], add=mock.MagicMock()
+        )
+        self.snap3d.VertexInfo.side_effect = (
+            lambda objnum, index, value, position: position
+        )
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_translate(self):
+        """Tests snapping translate over a frame range"""
+
+        animatedSnap3D.animated_snap(
+            transforms=['translate'], node=self.node, frange=[1, 2, 3]
+        )
+
+        self.assertEqual(
+            3,
+            self.snap3d.translateToPointsVerified.call_count
+        )
+
+        self.invalidate.assert_called_once_with(self.node)
+
+    # =========================================================================
+
+    def test_parent_space(self):
+        """Tests vertices are moved into the space of the node's parent"""
+
+        parent = mock.MagicMock()
+        parent.Class.return_value = 'Axis2'
+        self.node.inputs.return_value = 1
+        self.node.input.return_value = parent
+        self.cache.world_matrix.side_effect = lambda node, frame, view: (
+            1.0, 0.0, 0.0, float(frame),
+            0.0, 1.0, 0.0, 0.0,
+            0.0, 0.0, 1.0, 0.0,
+            0.0, 0.0, 0.0, 1.0,
+        )
+
+        animatedSnap3D.animated_snap(
+            transforms=['translate'], node=self.node, frange=[1, 2]
+        )
+
+        self.assertEqual(
+            [(parent, 1, None), (parent, 2, None)],
+            [call[0] for call in self.cache.world_matrix.call_args_list]
+        )
+
+        self.assertEqual(
+            [[(0.0, 2.0, 3.0)], [(-1.0, 2.0, 3.0)]],
+            [
+                [add_call[0][0] for add_call in call[0][1].add.call_args_list]
+                for call in
+                self.snap3d.translateToPointsVerified.call_args_list
+            ]
+        )
+
+    # =========================================================================
+
+    def test_cancelled_dialog(self):
+        """Tests that nothing is snapped if no frame range is given"""
+
+        self.nuke.getInput.return_value = ''
+
+        animatedSnap3D.animated_snap(transforms=['translate'], node=self.node)
+
+        self.assertFalse(
+            self.snap3d.translateToPointsVerified.called
+        )
+
+        self.assertFalse(
+            self.invalidate.called
+        )
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,1349 @@
+#!/usr/bin/env python
+"""
+Tests the helper functions of cardToTrack
+
+REQUIREMENTS:
+
+mock
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Imports
+import json
+import mock
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.append('../')
+
+# Thorium Imports
+from thorium.cardToTrack import cardToTrack
+
+# =============================================================================
+# TEST CLASSES
+# =============================================================================
+
+
+class testCardToTrackViews(unittest.TestCase):
+    """Tests tracking the views of a multi-view script"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+        patches = [
+            mock.patch.object(cardToTrack, 'nuke', create=True),
+            mock.patch.object(cardToTrack, '_card_to_track_panel'),
+            mock.patch.object(cardToTrack, '_project_card'),
+            mock.patch.object(cardToTrack, '_key_outputs'),
+            mock.patch.object(cardToTrack, '_evaluate_points'),
+            mock.patch.object(cardToTrack, '_cache_key'),
+            mock.patch.object(cardToTrack, '_source_record'),
+            mock.patch.object(cardToTrack, '_record_source'),
+            mock.patch.object(
+                cardToTrack, 'CACHE_DIR',
+                os.path.join(self.temp_dir, 'cardToTrack')
+            ),
+        ]
+        (self.nuke, self.panel, self.project, self.key_outputs,
+         self.evaluate, self.cache_key, self.source_record,
+         self.record_source, _) = [patch.start() for patch in patches]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+        self.nuke.FrameRange.side_effect = lambda frange: [1, 2]
+        self.nuke.ProgressTask.return_value.isCancelled.return_value = False
+        self.project.side_effect = self.fake_project
+        self.evaluate.side_effect = self.fake_evaluate
+        self.cache_key.side_effect = (
+            lambda card, camera, background, frange, translate_only,
+            view=None, split=False: '{0}_{1}'.format(view, split)
+        )
+        self.source_record.side_effect = (
+            lambda card, camera, background, frange, ref_frame,
+            translate_only, view=None, split=False: (view, split)
+        )
+
+        self.card = mock.MagicMock()
+        self.card['xpos'].value.return_value = 0
+        self.card['ypos'].value.return_value = 0
+        self.camera = mock.MagicMock()
+
+    # =========================================================================
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    # =========================================================================
+
+    def fake_project(self, card, cameras, background, frames,
+                     translate_only=False):
+        """Projects every view of every frame to the frame and view"""
+        for frame in frames:
+            yield frame, dict(
+                (view, (frame, view)) for view in cameras
+            )
+
+    # =========================================================================
+
+    def fake_evaluate(self, card, camera, background, intervals,
+                      translate_only=False, view=None):
+        """Evaluates every frame to the frame and view"""
+        return dict(
+            (frame, (frame, view))
+            for frame in cardToTrack._interval_frames(intervals)
+        )
+
+    # =========================================================================
+
+    def track(self, views, output='CornerPin', use_cache=False):
+        """Runs card_to_track with the given views chosen in the panel"""
+        self.panel.return_value = {
+            'frange': '1-2',
+            'ref_frame': 1,
+            'output': output,
+            'axis': False,
+            'views': views,
+        }
+
+        return cardToTrack.card_to_track(
+            self.card, self.camera, mock.MagicMock(), use_cache=use_cache
+        )
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_single_view(self):
+        """Tests a single chosen view is evaluated as that view, unsplit"""
+
+        self.track(['right'])
+
+        self.assertFalse(
+            self.project.called
+        )
+
+        # Both the reference frame and the range are evaluated as the view.
+        self.assertEqual(
+            [({1: (1, 'right'), 2: (2, 'right')}, (1, 'right'), None)],
+            [
+                (call[0][1], call[0][2], call[1].get('view'))
+                for call in self.key_outputs.call_args_list
+            ]
+        )
+
+        self.assertEqual(
+            [('right', False)],
+            [call[0][2] for call in self.record_source.call_args_list]
+        )
+
+    # =========================================================================
+
+    def test_split_views(self):
+        """Tests every chosen view is keyed on its own split"""
+
+        self.track(['left', 'right'])
+
+        self.assertEqual(
+            [
+                ({1: (1, 'left'), 2: (2, 'left')}, (1, 'left'), 'left'),
+                ({1: (1, 'right'), 2: (2, 'right')}, (1, 'right'), 'right'),
+            ],
+            [
+                (call[0][1], call[0][2], call[1]['view'])
+                for call in self.key_outputs.call_args_list
+            ]
+        )
+
+    # =========================================================================
+
+    def test_split_roto(self):
+        """Tests no Roto is made when several views are tracked"""
+
+        self.track(['left', 'right'], output='All')
+
+        self.assertEqual(
+            ['tracker', 'corner_pin', 'corner_matrix'],
+            [role for _, role in self.key_outputs.call_args[0][0]]
+        )
+
+        self.assertFalse(
+            self.nuke.nodes.Roto.called
+        )
+
+    # =========================================================================
+
+    def test_split_records(self):
+        """Tests every output records each view it was keyed for"""
+
+        self.track(['left', 'right'], output='All')
+
+        self.assertEqual(
+            [
+                (role, (view, True)) for view in ['left', 'right']
+                for role in ['tracker', 'corner_pin', 'corner_matrix']
+            ],
+            [call[0][1:] for call in self.record_source.call_args_list]
+        )
+
+    # =========================================================================
+
+    def test_split_cache(self):
+        """Tests each view is cached, then read back instead of projected"""
+
+        self.track(['left', 'right'], use_cache=True)
+
+        self.assertEqual(
+            ['left_True.jsonl', 'right_True.jsonl'],
+            sorted(os.listdir(cardToTrack.CACHE_DIR))
+        )
+
+        self.project.reset_mock()
+        self.key_outputs.reset_mock()
+        self.track(['left', 'right'], use_cache=True)
+
+        # Only the reference frame is projected.
+        self.assertEqual(
+            [[1]],
+            [call[0][3] for call in self.project.call_args_list]
+        )
+
+        self.assertEqual(
+            [
+                {1: (1, 'left'), 2: (2, 'left')},
+                {1: (1, 'right'), 2: (2, 'right')},
+            ],
+            [call[0][1] for call in self.key_outputs.call_args_list]
+        )
+
+    # =========================================================================
+
+    def test_split_cache_partial(self):
+        """Tests only the views missing from the cache are projected"""
+
+        self.track(['left', 'right'], use_cache=True)
+        os.remove(os.path.join(cardToTrack.CACHE_DIR, 'left_True.jsonl'))
+
+        self.project.reset_mock()
+        self.track(['left', 'right'], use_cache=True)
+
+        self.assertEqual(
+            [['left', 'right'], ['left']],
+            [sorted(call[0][1]) for call in self.project.call_args_list]
+        )
+
+
+class testCardToTrackCache(unittest.TestCase):
+    """Tests card_to_track() with evaluated points already cached"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(cardToTrack, 'nuke', create=True),
+            mock.patch.object(cardToTrack, '_card_to_track_panel'),
+            mock.patch.object(cardToTrack, '_cache_key'),
+            mock.patch.object(cardToTrack, '_read_point_cache'),
+            mock.patch.object(cardToTrack, '_evaluate_points'),
+            mock.patch.object(cardToTrack, '_create_output'),
+            mock.patch.object(cardToTrack, '_key_outputs'),
+            mock.patch.object(cardToTrack, '_source_record'),
+            mock.patch.object(cardToTrack, '_record_source'),
+        ]
+        (self.nuke, self.panel, _, self.read_cache, self.evaluate,
+         self.create_output, self.key_outputs, _, _) = [
+            patch.start() for patch in patches
+        ]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+        self.nuke.FrameRange.side_effect = lambda frange: [1, 2]
+        self.nuke.ProgressTask.return_value.isCancelled.return_value = False
+        self.panel.return_value = {
+            'frange': '1-2',
+            'ref_frame': 2,
+            'output': 'CornerPin',
+            'axis': False,
+            'views': [],
+        }
+
+        self.opened = 0
+        self.closed = 0
+        self.read_cache.side_effect = lambda key: self.cache_entry()
+
+        self.card = mock.MagicMock()
+        self.card['xpos'].value.return_value = 0
+        self.card['ypos'].value.return_value = 0
+
+    # =========================================================================
+
+    def cache_entry(self):
+        """Yields a single cached chunk, counting when it's closed"""
+        self.opened += 1
+        try:
+            yield {1: (1.0,) * 8, 2: (2.0,) * 8}
+        finally:
+            self.closed += 1
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_ref_points(self):
+        """Tests the reference frame is read from the cache, then closed"""
+
+        cardToTrack.card_to_track(
+            self.card, mock.MagicMock(), mock.MagicMock()
+        )
+
+        self.assertFalse(
+            self.evaluate.called
+        )
+
+        self.assertEqual(
+            (2.0,) * 8,
+            self.create_output.call_args[1]['ref_points']
+        )
+
+        self.assertEqual(
+            (2, 2),
+            (self.opened, self.closed)
+        )
+
+
+class testFrameIntervals(unittest.TestCase):
+    """Tests the _frame_intervals() function"""
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_consecutive(self):
+        """Tests consecutive frames collapse into a single interval"""
+
+        self.assertEqual(
+            [(1, 5)],
+            cardToTrack._frame_intervals(range(1, 6))
+        )
+
+    # =========================================================================
+
+    def test_gaps(self):
+        """Tests unordered frames with gaps are split at the gaps"""
+
+        self.assertEqual(
+            [(-2, -1), (4, 4), (10, 12)],
+            cardToTrack._frame_intervals([12, 4, -1, 10, 11, -2])
+        )
+
+    # =========================================================================
+
+    def test_stepped(self):
+        """Tests every frame of a stepped range is its own interval"""
+
+        self.assertEqual(
+            [(1, 1), (3, 3), (5, 5)],
+            cardToTrack._frame_intervals(range(1, 6, 2))
+        )
+
+    # =========================================================================
+
+    def test_empty(self):
+        """Tests no frames give no intervals"""
+
+        self.assertEqual(
+            [],
+            cardToTrack._frame_intervals([])
+        )
+
+
+class testChunkSignatures(unittest.TestCase):
+    """Tests the _chunk_signatures() function"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(cardToTrack.transforms, 'get_cache'),
+            mock.patch.object(cardToTrack.transforms, 'chain_signatures'),
+        ]
+        self.get_cache, self.chain_signatures = [
+            patch.start() for patch in patches
+        ]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+        self.chain_signatures.side_effect = lambda node, intervals: [
+            '{0}{1}'.format(node.name, interval) for interval in intervals
+        ]
+
+        self.card = mock.MagicMock()
+        self.card.name = 'card'
+        self.camera = mock.MagicMock()
+        self.camera.name = 'camera'
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_per_chunk(self):
+        """Tests a signature is made per chunk, not per frame"""
+
+        signatures = cardToTrack._chunk_signatures(
+            self.card, self.camera, range(1, cardToTrack.CHUNK_SIZE * 2 + 2)
+        )
+
+        self.assertEqual(
+            3,
+            len(signatures)
+        )
+
+        size = cardToTrack.CHUNK_SIZE
+        self.assertEqual(
+            [(1, size), (size + 1, size * 2), (size * 2 + 1, size * 2 + 1)],
+            self.chain_signatures.call_args[0][1]
+        )
+
+    # =========================================================================
+
+    def test_step(self):
+        """Tests a stepped range is signed over its first and last frame"""
+
+        cardToTrack._chunk_signatures(self.card, self.camera, range(1, 8, 3))
+
+        self.assertEqual(
+            [[(1, 7)], [(1, 7)]],
+            [call[0][1] for call in self.chain_signatures.call_args_list]
+        )
+
+    # =========================================================================
+
+    def test_no_evaluation(self):
+        """Tests nothing is read through the per-frame transform cache"""
+
+        cardToTrack._chunk_signatures(
+            self.card, self.camera, range(1, cardToTrack.CHUNK_SIZE * 4)
+        )
+
+        self.assertFalse(
+            self.get_cache.called
+        )
+
+    # =========================================================================
+
+    def test_changed_chunk(self):
+        """Tests only the chunk whose camera changed is signed anew"""
+
+        frames = range(1, cardToTrack.CHUNK_SIZE * 2 + 1)
+        before = cardToTrack._chunk_signatures(self.card, self.camera, frames)
+
+        # The camera moved within the second chunk.
+        self.chain_signatures.side_effect = lambda node, intervals: [
+            '{0}{1}{2}'.format(
+                node.name, interval, '*' if node is self.camera and i else ''
+            ) for i, interval in enumerate(intervals)
+        ]
+        after = cardToTrack._chunk_signatures(self.card, self.camera, frames)
+
+        self.assertEqual(
+            [True, False],
+            [old == new for old, new in zip(before, after)]
+        )
+
+
+class testPointCache(unittest.TestCase):
+    """Tests writing, reading and pruning the evaluated point cache"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, 'cardToTrack')
+
+        patch = mock.patch.object(cardToTrack, 'CACHE_DIR', self.cache_dir)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        self.chunks = [
+            {1: (0.0, 1.0), 2: (2.0, 3.0)},
+            {3: (4.0, 5.0)},
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    # =========================================================================
+
+    def write(self, key, task=None):
+        """Passes our chunks through _cache_points under key"""
+        return list(cardToTrack._cache_points(key, iter(self.chunks), task))
+
+    # =========================================================================
+
+    def entry(self, name, size, age):
+        """Writes a cache file of size bytes, last used age seconds ago"""
+        path = os.path.join(self.cache_dir, name)
+        with open(path, 'w') as entry_file:
+            entry_file.write('x' * size)
+        used = time.time() - age
+        os.utime(path, (used, used))
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_round_trip(self):
+        """Tests chunks are read back a line at a time as they were written"""
+
+        self.assertEqual(
+            self.chunks,
+            self.write('key')
+        )
+
+        self.assertEqual(
+            self.chunks,
+            list(cardToTrack._read_point_cache('key'))
+        )
+
+        with open(cardToTrack._cache_path('key')) as cache_file:
+            self.assertEqual(
+                2,
+                len(cache_file.readlines())
+            )
+
+    # =========================================================================
+
+    def test_missing(self):
+        """Tests nothing is read when nothing was cached"""
+
+        self.assertIsNone(
+            cardToTrack._read_point_cache('key')
+        )
+
+    # =========================================================================
+
+    def test_cancelled(self):
+        """Tests a cancelled run leaves no entry behind"""
+
+        task = mock.MagicMock()
+        task.isCancelled.return_value = True
+        self.write('key', task)
+
+        self.assertEqual(
+            [],
+            os.listdir(self.cache_dir)
+        )
+
+    # =========================================================================
+
+    def test_unreadable(self):
+        """Tests an unreadable chunk ends the read and removes the entry"""
+
+        self.write('key')
+        with open(cardToTrack._cache_path('key'), 'a') as cache_file:
+            cache_file.write('[[4, 6.0\n')
+
+        self.assertEqual(
+            self.chunks,
+            list(cardToTrack._read_point_cache('key'))
+        )
+
+        self.assertFalse(
+            os.path.exists(cardToTrack._cache_path('key'))
+        )
+
+    # =========================================================================
+
+    def test_prune_age(self):
+        """Tests entries and temp files unused for too long are pruned"""
+
+        os.makedirs(self.cache_dir)
+        self.entry('old.jsonl', 10, cardToTrack.CACHE_MAX_AGE + 60)
+        self.entry('old.jsonl.tmp', 10, cardToTrack.CACHE_MAX_AGE + 60)
+        self.entry('recent.jsonl', 10, 60)
+        self.entry('recent.jsonl.tmp', 10, 60)
+
+        self.write('key')
+
+        self.assertEqual(
+            ['key.jsonl', 'recent.jsonl', 'recent.jsonl.tmp'],
+            sorted(os.listdir(self.cache_dir))
+        )
+
+    # =========================================================================
+
+    def test_prune_size(self):
+        """Tests the least recently used entries go once past the limit"""
+
+        os.makedirs(self.cache_dir)
+        for age, name in enumerate(['a', 'b', 'c', 'd']):
+            self.entry(name + '.jsonl', 100, (age + 1) * 60)
+
+        with mock.patch.object(cardToTrack, 'CACHE_MAX_SIZE', 150):
+            removed = cardToTrack._prune_cache(
+                keep=os.path.join(self.cache_dir, 'd.jsonl')
+            )
+
+        self.assertEqual(
+            ['a.jsonl', 'd.jsonl'],
+            sorted(os.listdir(self.cache_dir))
+        )
+
+        self.assertEqual(
+            2,
+            removed
+        )
+
+    # =========================================================================
+
+    def test_stale_chunks(self):
+        """Tests chunks are evaluated once the cache stops lining up"""
+
+        evaluated = {3: (4.0, 5.0), 4: (6.0, 7.0)}
+        patches = [
+            mock.patch.object(
+                cardToTrack, '_evaluate_points', return_value=evaluated
+            ),
+            mock.patch.object(
+                cardToTrack, '_frame_chunks',
+                return_value=iter([[1, 2], [3, 4]])
+            ),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+        # The second cached chunk is missing frame 4.
+        self.assertEqual(
+            [self.chunks[0], evaluated],
+            list(
+                cardToTrack._point_chunks(
+                    None, None, None, [1, 2, 3, 4], cached=iter(self.chunks)
+                )
+            )
+        )
+
+
+class testSourceRecords(unittest.TestCase):
+    """Tests recording and refreshing the source of each view of an output"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(cardToTrack, 'nuke', create=True),
+            mock.patch.object(cardToTrack, '_refresh_outputs'),
+        ]
+        self.nuke, self.refresh = [patch.start() for patch in patches]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+        self.refresh.return_value = 0
+
+        self.source = ''
+        knob = mock.MagicMock()
+        knob.value.side_effect = lambda: self.source
+        knob.setValue.side_effect = lambda value: setattr(
+            self, 'source', value
+        )
+
+        self.node = mock.MagicMock()
+        self.node.knobs.return_value = {cardToTrack.SOURCE_KNOB: knob}
+        self.node.__getitem__.return_value = knob
+
+    # =========================================================================
+
+    def record(self, view, signature='a'):
+        """Returns a source record of a view"""
+        return {
+            'card': 'Card1', 'camera': 'Camera1', 'background': 'Read1',
+            'first': 1, 'last': 10, 'step': 1, 'ref_frame': 1,
+            'translate_only': False, 'view': view, 'split': bool(view),
+            'signatures': [signature],
+        }
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_replace_view(self):
+        """Tests recording a view only replaces that view's record"""
+
+        cardToTrack._record_source(self.node, 'tracker', self.record('left'))
+        cardToTrack._record_source(self.node, 'tracker', self.record('right'))
+        cardToTrack._record_source(
+            self.node, 'tracker', self.record('left', 'b')
+        )
+
+        self.assertEqual(
+            [('left', ['b']), ('right', ['a'])],
+            [
+                (record['view'], record['signatures'])
+                for record in json.loads(self.source)
+            ]
+        )
+
+    # =========================================================================
+
+    def test_refresh_per_view(self):
+        """Tests each view of an output is refreshed on its own"""
+
+        for view in ['left', 'right']:
+            cardToTrack._record_source(
+                self.node, 'tracker', self.record(view)
+            )
+
+        cardToTrack.refresh_outputs([self.node])
+
+        self.assertEqual(
+            ['left', 'right'],
+            sorted(
+                call[0][0][0][1]['view']
+                for call in self.refresh.call_args_list
+            )
+        )
+
+
+class testPointsToTracks(unittest.TestCase):
+    """Tests the points_to_tracks() function"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(cardToTrack, 'nuke', create=True),
+            mock.patch.object(cardToTrack.transforms, 'get_cache'),
+            mock.patch.object(cardToTrack.transforms, 'project_points'),
+            mock.patch.object(cardToTrack, 'tracks_to_tracker'),
+        ]
+        self.nuke, _, self.project, self.to_trackers = [
+            patch.start() for patch in patches
+        ]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+        self.nuke.Node = type('Node', (object,), {})
+        self.nuke.ProgressTask.return_value.isCancelled.return_value = False
+        self.background = mock.MagicMock()
+        self.background.format.return_value.width.return_value = 100
+        self.background.format.return_value.height.return_value = 100
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_hidden_placeholder(self):
+        """Tests a point that's never visible keeps an empty track"""
+
+        self.project.side_effect = lambda camera, points, frame, fmt: [
+            (frame, 1.0), None, (frame, 3.0)
+        ]
+
+        cardToTrack.points_to_tracks(
+            [(0, 0, 0), (0, 0, 50), (1, 0, 0)], mock.MagicMock(),
+            self.background, [1, 2]
+        )
+
+        self.assertEqual(
+            [
+                {1: (1, 1.0), 2: (2, 1.0)},
+                {},
+                {1: (1, 3.0), 2: (2, 3.0)},
+            ],
+            self.to_trackers.call_args[0][0]
+        )
+
+    # =========================================================================
+
+    def test_single_node(self):
+        """Tests every point is tracked on the one node returned"""
+
+        self.project.side_effect = lambda camera, points, frame, fmt: [
+            (frame, float(i)) for i in xrange(len(points))
+        ]
+
+        tracker = cardToTrack.points_to_tracks(
+            [(i, 0, 0) for i in xrange(9)], mock.MagicMock(),
+            self.background, [1, 2]
+        )
+
+        self.to_trackers.assert_called_once_with(
+            mock.ANY, None, None, translate_only=True
+        )
+        self.assertEqual(9, len(self.to_trackers.call_args[0][0]))
+        self.assertEqual(self.to_trackers.return_value, tracker)
+
+    # =========================================================================
+
+    def test_cancelled(self):
+        """Tests nothing is created when cancelled"""
+
+        self.nuke.ProgressTask.return_value.isCancelled.return_value = True
+
+        self.assertEqual(
+            None,
+            cardToTrack.points_to_tracks(
+                [(0, 0, 0)], mock.MagicMock(), self.background, [1, 2]
+            )
+        )
+        self.assertFalse(self.to_trackers.called)
+
+
+class testCurveScript(unittest.TestCase):
+    """Tests the _curve_script() function"""
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_consecutive(self):
+        """Tests only the first of consecutive frames is written"""
+
+        self.assertEqual(
+            '{curve x1 0.5 0.75 1.0}',
+            cardToTrack._curve_script([(1, 0.5), (2, 0.75), (3, 1)])
+        )
+
+    # =========================================================================
+
+    def test_gaps(self):
+        """Tests a frame is written after every gap"""
+
+        self.assertEqual(
+            '{curve x-2 0.0 x5 1.0 2.0 x10 3.0}',
+            cardToTrack._curve_script(
+                [(-2, 0.0), (5, 1.0), (6, 2.0), (10, 3.0)]
+            )
+        )
+
+    # =========================================================================
+
+    def test_subframes(self):
+        """Tests subframes are written as they are"""
+
+        self.assertEqual(
+            '{curve x1.5 0.5 x2 0.75}',
+            cardToTrack._curve_script([(1.5, 0.5), (2.0, 0.75)])
+        )
+
+    # =========================================================================
+
+    def test_empty(self):
+        """Tests no keys give an empty curve"""
+
+        self.assertEqual(
+            '{curve}',
+            cardToTrack._curve_script([])
+        )
+
+
+class testTrackerScript(unittest.TestCase):
+    """Tests the _tracker_script() function"""
+
+    # =========================================================================
+
+    def rows(self, script):
+        """Returns the cells of each row of a tracks table script
+
+        Cells are split on whitespace, unless they're wrapped in braces or
+        quotes, just as Nuke splits them.
+
+        """
+        self.assertTrue(
+            script.startswith('tracks {')
+        )
+        table = script[len('tracks {'):script.rindex('}')]
+        header, columns, body = self.groups(table)
+        rows = [self.groups(row) for row in self.groups(body)]
+
+        # The version, the number of columns, then the number of rows.
+        self.assertEqual(
+            ['1', str(len(cardToTrack.TRACKS_COLUMNS)), str(len(rows))],
+            header.split()
+        )
+
+        self.assertEqual(
+            len(cardToTrack.TRACKS_COLUMNS),
+            len(self.groups(columns))
+        )
+
+        return rows
+
+    # =========================================================================
+
+    def groups(self, text):
+        """Splits text into its top level cells, stripping their braces"""
+        cells = []
+        cell = ''
+        depth = 0
+        quoted = False
+        for char in text:
+            if quoted:
+                if char == '"':
+                    quoted = False
+                cell += char
+            elif char == '"':
+                quoted = True
+                cell += char
+            elif char == '{':
+                if depth:
+                    cell += char
+                depth += 1
+            elif char == '}':
+                depth -= 1
+                if depth:
+                    cell += char
+                else:
+                    cells.append(cell.strip())
+                    cell = ''
+            elif depth:
+                cell += char
+            elif char.isspace():
+                if cell:
+                    cells.append(cell)
+                    cell = ''
+            else:
+                cell += char
+        if cell:
+            cells.append(cell)
+
+        return cells
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_tracks(self):
+        """Tests every track gets a full row, keyed with its curves"""
+
+        rows = self.rows(
+            cardToTrack._tracker_script(
+                [
+                    {2: (1.0, 11.0), 1: (0.0, 10.0)},
+                    {3: (5.0, 6.0)},
+                ]
+            )
+        )
+
+        self.assertEqual(
+            [len(cardToTrack.TRACKS_COLUMNS)] * 2,
+            [len(row) for row in rows]
+        )
+
+        self.assertEqual(
+            [
+                ['1', '"track 1"', 'curve x1 0.0 1.0', 'curve x1 10.0 11.0'],
+                ['1', '"track 2"', 'curve x3 5.0', 'curve x3 6.0'],
+            ],
+            [row[:4] for row in rows]
+        )
+
+        # Each track affects translation, rotation and scale.
+        self.assertEqual(
+            [['1', '1', '1']] * 2,
+            [row[6:9] for row in rows]
+        )
+
+    # =========================================================================
+
+    def test_many(self):
+        """Tests hundreds of tracks all go in the one table"""
+
+        rows = self.rows(
+            cardToTrack._tracker_script(
+                [{1: (float(i), 0.0)} for i in xrange(300)]
+            )
+        )
+
+        self.assertEqual(
+            300,
+            len(rows)
+        )
+
+        self.assertEqual(
+            '"track 300"',
+            rows[-1][1]
+        )
+
+    # =========================================================================
+
+    def test_placeholder(self):
+        """Tests an empty track keeps a disabled row in its place"""
+
+        rows = self.rows(
+            cardToTrack._tracker_script([{}, {1: (1.0, 2.0)}])
+        )
+
+        self.assertEqual(
+            [['0', '"track 1"'], ['1', '"track 2"']],
+            [row[:2] for row in rows]
+        )
+
+        self.assertEqual(
+            len(cardToTrack.TRACKS_COLUMNS),
+            len(rows[0])
+        )
+
+    # =========================================================================
+
+    def test_translate_only(self):
+        """Tests translate only tracks don't affect rotation or scale"""
+
+        rows = self.rows(
+            cardToTrack._tracker_script([{1: (1.0, 2.0)}], True)
+        )
+
+        self.assertEqual(
+            ['1', '0', '0'],
+            rows[0][6:9]
+        )
+
+
+class testReconcileToTracks(unittest.TestCase):
+    """Tests the reconcile_to_tracks() function"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(cardToTrack, 'nuke', create=True),
+            mock.patch.object(cardToTrack, 'tracks_to_tracker'),
+        ]
+        self.nuke, self.to_trackers = [patch.start() for patch in patches]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+        self.nuke.frame.return_value = 7
+
+    # =========================================================================
+
+    def reconcile(self, curves, value=(100.0, 200.0)):
+        """Returns a Reconcile3D whose output has the given curves
+
+        Each curve is a list of (frame, value) keys, or None if that index
+        isn't animated. Between keys, a curve evaluates to its frame.
+
+        """
+        output = mock.MagicMock()
+        output.isAnimated.side_effect = lambda index: bool(curves[index])
+        output.animation.side_effect = lambda index: mock.MagicMock(
+            keys=mock.MagicMock(
+                return_value=[
+                    mock.MagicMock(x=frame, y=key_value)
+                    for frame, key_value in curves[index]
+                ]
+            )
+        )
+        output.value.side_effect = lambda index: value[index]
+        output.getValueAt.side_effect = lambda frame, index: float(frame)
+
+        return {'output': output}
+
+    # =========================================================================
+
+    def tracks(self, *reconciles):
+        """Returns the tracks reconcile_to_tracks writes from reconciles"""
+        cardToTrack.reconcile_to_tracks(list(reconciles))
+        return self.to_trackers.call_args[0][0]
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_matching_keys(self):
+        """Tests x and y keys on the same frames are paired up"""
+
+        self.assertEqual(
+            [{1: (0.5, 1.5), 2: (2.5, 3.5)}],
+            self.tracks(
+                self.reconcile([[(1, 0.5), (2, 2.5)], [(1, 1.5), (2, 3.5)]])
+            )
+        )
+
+    # =========================================================================
+
+    def test_mismatched_keys(self):
+        """Tests keys are merged by frame, evaluating the missing curve"""
+
+        self.assertEqual(
+            [{1: (0.5, 1.0), 2: (2.0, 3.5), 3: (4.5, 5.5)}],
+            self.tracks(
+                self.reconcile([[(1, 0.5), (3, 4.5)], [(2, 3.5), (3, 5.5)]])
+            )
+        )
+
+    # =========================================================================
+
+    def test_partly_animated(self):
+        """Tests a curve that isn't animated uses the knob's value"""
+
+        self.assertEqual(
+            [{4: (100.0, 1.0)}],
+            self.tracks(self.reconcile([None, [(4, 1.0)]]))
+        )
+
+    # =========================================================================
+
+    def test_not_animated(self):
+        """Tests an output without animation is held at the current frame"""
+
+        self.assertEqual(
+            [{7: (100.0, 200.0)}, {1: (0.5, 1.5)}],
+            self.tracks(
+                self.reconcile([None, None]),
+                self.reconcile([[(1, 0.5)], [(1, 1.5)]])
+            )
+        )
+
+    # =========================================================================
+
+    def test_many(self):
+        """Tests any number of Reconcile3D nodes go onto a single tracker"""
+
+        reconciles = [
+            self.reconcile([[(1, float(i))], [(1, 0.0)]]) for i in xrange(6)
+        ]
+
+        cardToTrack.reconcile_to_tracks(reconciles)
+
+        self.assertEqual(
+            1,
+            self.to_trackers.call_count
+        )
+
+        self.assertEqual(
+            6,
+            len(self.to_trackers.call_args[0][0])
+        )
+
+
+class testTracksToTracker(unittest.TestCase):
+    """Tests the tracks_to_tracker() function"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        patch = mock.patch.object(cardToTrack, 'nuke', create=True)
+        self.nuke = patch.start()
+        self.addCleanup(patch.stop)
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_single_node(self):
+        """Tests every track is read onto one Tracker4 in a single call"""
+
+        tracks = [{1: (float(i), 0.0)} for i in xrange(100)]
+
+        tracker = cardToTrack.tracks_to_tracker(
+            tracks, pos=(10, 20), label='Points'
+        )
+
+        self.assertIs(
+            self.nuke.nodes.Tracker4.return_value,
+            tracker
+        )
+
+        self.assertFalse(
+            self.nuke.nodes.Tracker3.called
+        )
+
+        tracker.readKnobs.assert_called_once_with(
+            cardToTrack._tracker_script(tracks)
+        )
+
+
+class testWriteRows(unittest.TestCase):
+    """Tests the _write_rows() function"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.columns = ['frame', 'x', 'y']
+        self.rows = [[1, 0.5, 1.5], [2, 2.5, 3.5]]
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    # =========================================================================
+
+    def write(self, name, rows=None, task=None):
+        """Writes our rows to name, returning the count and the file"""
+        path = os.path.join(self.temp_dir, name)
+        count = cardToTrack._write_rows(
+            iter(self.rows if rows is None else rows), path, self.columns,
+            task
+        )
+        with open(path, 'rb') as export_file:
+            return count, export_file.read()
+
+    # =========================================================================
+
+    def existing(self, name):
+        """Writes a file the user already had at name"""
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w') as user_file:
+            user_file.write('original')
+
+        return path
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_csv(self):
+        """Tests a .csv starts with the column names"""
+
+        self.assertEqual(
+            (2, 'frame,x,y\r\n1,0.5,1.5\r\n2,2.5,3.5\r\n'),
+            self.write('corners.csv')
+        )
+
+    # =========================================================================
+
+    def test_chan(self):
+        """Tests .chan is refused, as corners aren't a Nuke channel file"""
+
+        self.assertRaises(
+            ValueError,
+            self.write, 'corners.chan'
+        )
+
+    # =========================================================================
+
+    def test_bin(self):
+        """Tests a .bin holds its header, then the rows as floats"""
+
+        count, data = self.write('corners.BIN')
+
+        self.assertEqual(
+            2,
+            count
+        )
+
+        self.assertEqual(
+            ('CTT1', 3, 9, 'frame,x,y'),
+            struct.unpack('<4sH', data[:6]) +
+            struct.unpack('<I', data[6:10]) + (data[10:19],)
+        )
+
+        self.assertEqual(
+            (1.0, 0.5, 1.5, 2.0, 2.5, 3.5),
+            struct.unpack('<6f', data[19:])
+        )
+
+    # =========================================================================
+
+    def test_bad_extension(self):
+        """Tests an unknown extension raises without writing anything"""
+
+        self.assertRaises(
+            ValueError,
+            cardToTrack._write_rows,
+            iter(self.rows), os.path.join(self.temp_dir, 'corners.txt'),
+            self.columns
+        )
+
+        self.assertEqual(
+            [],
+            os.listdir(self.temp_dir)
+        )
+
+    # =========================================================================
+
+    def test_replaces(self):
+        """Tests an existing file is replaced, without a temp file left"""
+
+        self.existing('corners.csv')
+
+        self.assertEqual(
+            (1, 'frame,x,y\r\n1,0.5,1.5\r\n'),
+            self.write('corners.csv', rows=self.rows[:1])
+        )
+
+        self.assertEqual(
+            ['corners.csv'],
+            os.listdir(self.temp_dir)
+        )
+
+    # =========================================================================
+
+    def test_cancelled(self):
+        """Tests a cancelled export leaves an existing file untouched"""
+
+        self.existing('corners.csv')
+        task = mock.MagicMock()
+        task.isCancelled.return_value = True
+
+        self.assertEqual(
+            (2, 'original'),
+            self.write('corners.csv', task=task)
+        )
+
+        self.assertEqual(
+            ['corners.csv'],
+            os.listdir(self.temp_dir)
+        )
+
+    # =========================================================================
+
+    def test_failed(self):
+        """Tests a failed export leaves an existing file untouched"""
+
+        path = self.existing('corners.csv')
+
+        def rows():
+            """Yields a row, then fails"""
+            yield self.rows[0]
+            raise RuntimeError("Evaluation failed")
+
+        self.assertRaises(
+            RuntimeError,
+            cardToTrack._write_rows, rows(), path, self.columns
+        )
+
+        self.assertEqual(
+            ['corners.csv'],
+            os.listdir(self.temp_dir)
+        )
+
+        with open(path) as user_file:
+            self.assertEqual(
+                'original',
+                user_file.read()
+            )
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,365 @@
+#!/usr/bin/env python
+"""
+Tests the icon index file, icon search and icon atlas of iconPanel
+
+REQUIREMENTS:
+
+mock
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Imports
+import mock
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+sys.path.append('../')
+
+# Thorium Imports
+# iconPanel subclasses nukescripts.PythonPanel, so it can't be imported
+# without nuke and nukescripts in place.
+with mock.patch.dict(
+        sys.modules,
+        {'nuke': mock.MagicMock(), 'nukescripts': mock.MagicMock(
+            PythonPanel=object
+        )}):
+    from thorium.iconPanel import iconPanel
+
+# iconView needs Qt, which is stood in for with mocks. Widgets and models are
+# plain objects, so the classes built on them can still be defined.
+with mock.patch.dict(
+        sys.modules,
+        {
+            'nuke': mock.MagicMock(),
+            'nukescripts': mock.MagicMock(),
+            'PySide2': mock.MagicMock(),
+            'PySide2.QtCore': mock.MagicMock(QAbstractListModel=object),
+            'PySide2.QtGui': mock.MagicMock(),
+            'PySide2.QtWidgets': mock.MagicMock(QWidget=object),
+        }):
+    from thorium.iconPanel import iconView
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class _Image(object):
+    """Stands in for QImage, both for atlas pages and the icons drawn in"""
+
+    Format_ARGB32_Premultiplied = 'ARGB32_Premultiplied'
+
+    def __init__(self, *args):
+        self.args = args
+
+    def fill(self, value):
+        pass
+
+    def height(self):
+        return iconView.ICON_SIZE
+
+    def isNull(self):
+        return False
+
+    def save(self, path, image_format):
+        open(path, 'w').close()
+        return True
+
+    def scaled(self, *args):
+        return self
+
+    def width(self):
+        return iconView.ICON_SIZE
+
+# =============================================================================
+# TEST CLASSES
+# =============================================================================
+
+
+class testIconIndex(unittest.TestCase):
+    """Tests the IconIndex class"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        self.icons = [
+            ('Blur.png', False),
+            ('MotionBlur.png', False),
+            ('Roto/BlurTool.png', True),
+            ('Grade.png', False),
+            ('Blend.png', False),
+        ]
+        self.index = iconPanel.IconIndex(self.icons)
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_empty_query(self):
+        """Tests an empty query returns every icon in order"""
+
+        self.assertEqual(
+            self.icons,
+            self.index.search('  ')
+        )
+
+    # =========================================================================
+
+    def test_prefix_first(self):
+        """Tests prefix matches come first, sorted, then substring matches"""
+
+        self.assertEqual(
+            [
+                ('Blur.png', False),
+                ('Roto/BlurTool.png', True),
+                ('MotionBlur.png', False),
+            ],
+            self.index.search('BLUR')
+        )
+
+    # =========================================================================
+
+    def test_short_query(self):
+        """Tests queries under 3 letters only match the start of names"""
+
+        self.assertEqual(
+            [('Blend.png', False), ('Blur.png', False),
+             ('Roto/BlurTool.png', True)],
+            self.index.search('bl')
+        )
+
+    # =========================================================================
+
+    def test_no_match(self):
+        """Tests a query with an unknown trigram matches nothing"""
+
+        self.assertEqual(
+            [],
+            self.index.search('xyz')
+        )
+
+        self.assertEqual(
+            5,
+            len(self.index)
+        )
+
+
+class testGetIconPanel(unittest.TestCase):
+    """Tests the get_icon_panel() function"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(iconPanel, 'IconPanel'),
+            mock.patch.object(iconPanel, '_ICON_PANEL', None),
+        ]
+        self.panel_class = patches[0].start()
+        patches[1].start()
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_single_instance(self):
+        """Tests one panel is built and handed back for the whole session"""
+
+        panel = iconPanel.get_icon_panel()
+
+        self.assertIs(
+            panel,
+            iconPanel.get_icon_panel()
+        )
+
+        self.assertEqual(
+            1,
+            self.panel_class.call_count
+        )
+
+
+class testIconAtlas(unittest.TestCase):
+    """Tests packing, caching and pruning the IconAtlas"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.paths = ['a.png', 'b.png', 'c.png', 'd.png', 'e.png']
+
+        patches = [
+            mock.patch.object(iconView, 'ATLAS_DIR', self.temp_dir),
+            mock.patch.object(iconView, 'ATLAS_COLUMNS', 2),
+            mock.patch.object(iconView, 'ATLAS_ROWS', 2),
+            mock.patch.object(iconView.QtGui, 'QImage', _Image),
+            mock.patch.object(iconView.QtGui, 'QPainter'),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.painter = iconView.QtGui.QPainter
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_pages(self):
+        """Tests icons past a full page start a new page"""
+
+        atlas = iconView.IconAtlas(self.paths, 'key')
+
+        self.assertEqual(
+            [(64, 64), (64, 32)],
+            [image.args[:2] for image in atlas.images]
+        )
+
+        self.assertEqual(
+            (0, 32, 32, 32, 32),
+            atlas.cells['d.png']
+        )
+
+        self.assertEqual(
+            (1, 0, 0, 32, 32),
+            atlas.cells['e.png']
+        )
+
+        self.assertIsNone(
+            atlas.icon('f.png')
+        )
+
+    # =========================================================================
+
+    def test_reload(self):
+        """Tests a cached atlas is read back rather than built again"""
+
+        built = iconView.IconAtlas(self.paths, 'key')
+        self.painter.reset_mock()
+
+        loaded = iconView.IconAtlas(self.paths, 'key')
+
+        self.assertFalse(
+            self.painter.called
+        )
+
+        self.assertEqual(
+            built.cells,
+            loaded.cells
+        )
+
+        self.assertEqual(
+            2,
+            len(loaded.images)
+        )
+
+    # =========================================================================
+
+    def test_prune(self):
+        """Tests only atlases unused for too long are removed"""
+
+        old = time.time() - iconView.ATLAS_MAX_AGE - 60
+        for name in ['atlas_stale.json', 'atlas_stale_0.png']:
+            path = os.path.join(self.temp_dir, name)
+            open(path, 'w').close()
+            os.utime(path, (old, old))
+        for name in ['atlas_recent.json', 'atlas_recent_0.png', 'index.json']:
+            open(os.path.join(self.temp_dir, name), 'w').close()
+
+        iconView.IconAtlas(self.paths, 'key')
+
+        self.assertEqual(
+            [
+                'atlas_key.json', 'atlas_key_0.png', 'atlas_key_1.png',
+                'atlas_recent.json', 'atlas_recent_0.png', 'index.json',
+            ],
+            sorted(os.listdir(self.temp_dir))
+        )
+
+
+class testIndexFile(unittest.TestCase):
+    """Tests reading and writing the on-disk icon index"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.index_path = os.path.join(self.temp_dir, 'cache', 'index.json')
+
+        patch = mock.patch.object(iconPanel, 'INDEX_PATH', self.index_path)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_round_trip(self):
+        """Tests the index reads back as written, without a temp file"""
+
+        index = {'/icons': {'mtime': 1.0, 'pattern': '*.png', 'files': ['a']}}
+        iconPanel._write_index(index)
+
+        self.assertEqual(
+            index,
+            iconPanel._read_index()
+        )
+
+        self.assertEqual(
+            ['index.json'],
+            os.listdir(os.path.dirname(self.index_path))
+        )
+
+    # =========================================================================
+
+    def test_overwrite(self):
+        """Tests a new index replaces the old one"""
+
+        iconPanel._write_index({'/old': {}})
+        iconPanel._write_index({'/new': {}})
+
+        self.assertEqual(
+            {'/new': {}},
+            iconPanel._read_index()
+        )
+
+    # =========================================================================
+
+    def test_truncated(self):
+        """Tests a truncated index reads as empty"""
+
+        iconPanel._write_index({'/icons': {}})
+        with open(self.index_path, 'r+') as index_file:
+            index_file.truncate(10)
+
+        self.assertEqual(
+            {},
+            iconPanel._read_index()
+        )
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,548 @@
+#!/usr/bin/env python
+"""
+Tests the transform cache and projection functions of thorium.utils.transforms
+
+REQUIREMENTS:
+
+mock
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Imports
+import mock
+import sys
+import unittest
+
+sys.path.append('../')
+
+# Thorium Imports
+from thorium.utils import transforms
+
+# =============================================================================
+# PRIVATE FUNCTIONS
+# =============================================================================
+
+
+def _node(name, parent=None):
+    """Returns a mock transform node, parented to parent if given"""
+    node = mock.MagicMock()
+    node.fullName.return_value = name
+    node.Class.return_value = 'Axis2'
+    node.inputs.return_value = 1 if parent else 0
+    node.input.return_value = parent
+    node.writeKnobs.return_value = 'translate {0 0 0}'
+
+    return node
+
+# =============================================================================
+# TEST CLASSES
+# =============================================================================
+
+
+class testTransformCache(unittest.TestCase):
+    """Tests the TransformCache class"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        patch = mock.patch.object(transforms, 'nuke', create=True)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        self.cache = transforms.TransformCache()
+        self.evaluate = mock.MagicMock(return_value=(1.0,) * 16)
+
+        self.parent = _node('Parent')
+        self.child = _node('Child', self.parent)
+        self.other = _node('Other')
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_hit(self):
+        """Tests that a value is only evaluated once"""
+
+        for _ in xrange(3):
+            self.cache._get('world', self.child, 1, None, self.evaluate)
+
+        self.assertEqual(
+            (1, 2),
+            (self.cache.misses, self.cache.hits)
+        )
+
+    # =========================================================================
+
+    def test_invalidate_chain(self):
+        """Tests invalidating a parent drops its children, and only them"""
+
+        for node in (self.parent, self.child, self.other):
+            self.cache._get('world', node, 1, None, self.evaluate)
+
+        self.cache.invalidate(self.parent)
+
+        self.assertEqual(
+            1,
+            len(self.cache)
+        )
+
+        self.assertEqual(
+            ['Other'],
+            self.cache._hashes.keys()
+        )
+
+    # =========================================================================
+
+    def test_invalidate_leaf(self):
+        """Tests invalidating a child leaves its parent cached"""
+
+        for node in (self.parent, self.child):
+            self.cache._get('world', node, 1, None, self.evaluate)
+
+        self.cache.invalidate(self.child)
+
+        self.assertEqual(
+            [('world', 'Parent')],
+            [key[:2] for key in self.cache._entries]
+        )
+
+    # =========================================================================
+
+    def test_eviction(self):
+        """Tests the least recently used values are evicted"""
+
+        self.cache.max_entries = 2
+        for frame in xrange(3):
+            self.cache._get('world', self.child, frame, None, self.evaluate)
+
+        self.assertEqual(
+            [1, 2],
+            [key[3] for key in self.cache._entries]
+        )
+
+        self.assertEqual(
+            2,
+            len(self.cache._keys['Child'])
+        )
+
+
+class testCallbacks(unittest.TestCase):
+    """Tests the callbacks that keep the session cache in step with Nuke"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(transforms, 'nuke', create=True),
+            mock.patch.object(transforms, '_CACHE', None),
+        ]
+        self.nuke, _ = [patch.start() for patch in patches]
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+        self.cache = transforms.get_cache()
+        self.evaluate = mock.MagicMock(return_value=(1.0,) * 16)
+
+        self.parent = _node('Parent')
+        self.child = _node('Child', self.parent)
+        for node in (self.parent, self.child):
+            self.cache._get('world', node, 1, None, self.evaluate)
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_registered(self):
+        """Tests both callbacks are registered for every transform class"""
+
+        self.assertEqual(
+            len(transforms.TRANSFORM_CLASSES),
+            self.nuke.addKnobChanged.call_count
+        )
+
+        self.nuke.addOnDestroy.assert_any_call(
+            transforms._on_destroy, nodeClass='Axis2'
+        )
+
+    # =========================================================================
+
+    def test_ignored_knob(self):
+        """Tests changing a knob that doesn't transform keeps the cache"""
+
+        self.nuke.thisKnob.return_value.name.return_value = 'label'
+        self.nuke.thisNode.return_value = self.parent
+        transforms._knob_changed()
+
+        self.assertEqual(
+            2,
+            len(self.cache)
+        )
+
+    # =========================================================================
+
+    def test_transform_knob(self):
+        """Tests changing a transform knob invalidates the node's chain"""
+
+        self.nuke.thisKnob.return_value.name.return_value = 'translate'
+        self.nuke.thisNode.return_value = self.child
+        transforms._knob_changed()
+
+        self.assertEqual(
+            [('world', 'Parent')],
+            [key[:2] for key in self.cache._entries]
+        )
+
+    # =========================================================================
+
+    def test_renamed(self):
+        """Tests renaming a node clears every name from the cache"""
+
+        self.nuke.thisKnob.return_value.name.return_value = 'name'
+        self.child.fullName.return_value = 'Renamed'
+        self.nuke.thisNode.return_value = self.child
+        transforms._knob_changed()
+
+        self.assertEqual(
+            (0, {}),
+            (len(self.cache), self.cache._hashes)
+        )
+
+    # =========================================================================
+
+    def test_destroyed(self):
+        """Tests a deleted node's name doesn't carry its values to another"""
+
+        self.nuke.thisNode.return_value = self.child
+        transforms._on_destroy()
+
+        replacement = _node('Child')
+        replacement.writeKnobs.return_value = 'translate {1 0 0}'
+        self.cache._get('world', replacement, 1, None, self.evaluate)
+
+        self.assertEqual(
+            (0, 3),
+            (self.cache.hits, self.cache.misses)
+        )
+
+
+class testToParentSpace(unittest.TestCase):
+    """Tests the to_parent_space() function"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        patch = mock.patch.object(transforms, 'get_cache')
+        self.cache = patch.start().return_value
+        self.addCleanup(patch.stop)
+
+        # Scaled by 2 and moved 10 along x.
+        self.cache.world_matrix.return_value = (
+            2.0, 0.0, 0.0, 10.0,
+            0.0, 2.0, 0.0, 0.0,
+            0.0, 0.0, 2.0, 0.0,
+            0.0, 0.0, 0.0, 1.0,
+        )
+
+        self.parent = _node('Parent')
+        self.node = _node('Node', self.parent)
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_parented(self):
+        """Tests points are moved into the parent's space"""
+
+        self.assertEqual(
+            [(0.0, 0.0, 0.0), (-4.0, 1.0, 2.0)],
+            transforms.to_parent_space(
+                self.node, [(10, 0, 0), (2, 2, 4)], 5
+            )
+        )
+
+        self.cache.world_matrix.assert_called_once_with(self.parent, 5, None)
+
+    # =========================================================================
+
+    def test_unparented(self):
+        """Tests points are unchanged without a transform parent"""
+
+        self.parent.Class.return_value = 'ReadGeo2'
+
+        self.assertEqual(
+            [(2, 2, 4)],
+            transforms.to_parent_space(self.node, [(2, 2, 4)], 5)
+        )
+
+        self.assertFalse(
+            self.cache.world_matrix.called
+        )
+
+
+class testChainSignatures(unittest.TestCase):
+    """Tests the chain_signatures() function"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        patch = mock.patch.object(transforms, 'nuke', create=True)
+        self.nuke = patch.start()
+        self.addCleanup(patch.stop)
+
+        self.nuke.Array_Knob = type('Array_Knob', (object,), {})
+
+        # A key every 10 frames, from 0 to 100.
+        self.keys = [
+            mock.MagicMock(
+                x=frame, y=0.0, lslope=0.0, rslope=0.0, la=0.0, ra=0.0,
+                interpolation=0, extrapolation=0
+            ) for frame in xrange(0, 101, 10)
+        ]
+        curve = mock.MagicMock()
+        curve.keys.return_value = self.keys
+        curve.knobIndex.return_value = 0
+        curve.view.return_value = 'main'
+
+        knob = self.nuke.Array_Knob()
+        knob.isAnimated = lambda: True
+        knob.animations = lambda: [curve]
+
+        self.node = _node('Node')
+        self.node.knobs.return_value = {'translate': knob}
+        self.node.writeKnobs.return_value = (
+            'translate {{curve x0 0 x100 0} 0 0}'
+        )
+
+        self.intervals = [(0, 29), (30, 59), (60, 100)]
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_changed_key(self):
+        """Tests moving a key only changes the intervals it shapes"""
+
+        before = transforms.chain_signatures(self.node, self.intervals)
+        self.keys[8].y = 5.0
+        after = transforms.chain_signatures(self.node, self.intervals)
+
+        self.assertEqual(
+            [True, True, False],
+            [old == new for old, new in zip(before, after)]
+        )
+
+    # =========================================================================
+
+    def test_neighbor_key(self):
+        """Tests keys just outside an interval are signed along with it"""
+
+        before = transforms.chain_signatures(self.node, self.intervals)
+        self.keys[6].y = 5.0
+        after = transforms.chain_signatures(self.node, self.intervals)
+
+        self.assertEqual(
+            [True, False, False],
+            [old == new for old, new in zip(before, after)]
+        )
+
+    # =========================================================================
+
+    def test_static_knob(self):
+        """Tests changing a static knob changes every interval"""
+
+        before = transforms.chain_signatures(self.node, self.intervals)
+        self.node.writeKnobs.return_value = (
+            'translate {{curve x0 0 x100 0} 0 1}'
+        )
+        after = transforms.chain_signatures(self.node, self.intervals)
+
+        self.assertEqual(
+            [False, False, False],
+            [old == new for old, new in zip(before, after)]
+        )
+
+    # =========================================================================
+
+    def test_curve_script(self):
+        """Tests curves are only signed by their keys, not their script"""
+
+        before = transforms.chain_signatures(self.node, self.intervals)
+        self.node.writeKnobs.return_value = (
+            'translate {{curve x0 0 x50 0 x100 0} 0 0}'
+        )
+        after = transforms.chain_signatures(self.node, self.intervals)
+
+        self.assertEqual(
+            before,
+            after
+        )
+
+
+class testInvertMatrix(unittest.TestCase):
+    """Tests the _invert_matrix() function"""
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_inverse(self):
+        """Tests a matrix times its inverse is the identity"""
+
+        matrix = [
+            2.0, 0.0, 0.0, 5.0,
+            0.0, 0.0, -3.0, 1.0,
+            0.0, 4.0, 0.0, -2.0,
+            0.0, 0.0, 0.0, 1.0,
+        ]
+        inverse = transforms._invert_matrix(matrix)
+
+        product = [
+            sum(matrix[row * 4 + i] * inverse[i * 4 + col] for i in xrange(4))
+            for row in xrange(4) for col in xrange(4)
+        ]
+        identity = [1.0 if i % 5 == 0 else 0.0 for i in xrange(16)]
+        for value, expected in zip(product, identity):
+            self.assertAlmostEqual(
+                expected,
+                value
+            )
+
+    # =========================================================================
+
+    def test_translation(self):
+        """Tests a translation inverts to the opposite translation"""
+
+        matrix = [
+            1.0, 0.0, 0.0, 1.0,
+            0.0, 1.0, 0.0, -2.0,
+            0.0, 0.0, 1.0, 3.0,
+            0.0, 0.0, 0.0, 1.0,
+        ]
+
+        self.assertEqual(
+            [-1.0, 2.0, -3.0],
+            [transforms._invert_matrix(matrix)[i] for i in (3, 7, 11)]
+        )
+
+    # =========================================================================
+
+    def test_singular(self):
+        """Tests a singular matrix raises ValueError"""
+
+        self.assertRaises(
+            ValueError,
+            transforms._invert_matrix,
+            [1.0, 2.0, 3.0, 4.0] * 4
+        )
+
+
+class testProjectPoints(unittest.TestCase):
+    """Tests the project_points() function"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        self.cache = mock.MagicMock()
+        # A camera 10 units along z, looking down -z at the origin.
+        self.cache.world_matrix.return_value = (
+            1.0, 0.0, 0.0, 0.0,
+            0.0, 1.0, 0.0, 0.0,
+            0.0, 0.0, 1.0, 10.0,
+            0.0, 0.0, 0.0, 1.0,
+        )
+        self.cache.projection.return_value = {
+            'focal': 50.0,
+            'haperture': 25.0,
+            'near': 0.1,
+            'win_translate': (0.0, 0.0),
+            'win_scale': (1.0, 1.0),
+            'winroll': 0.0,
+        }
+
+        patch = mock.patch.object(
+            transforms, 'get_cache', return_value=self.cache
+        )
+        patch.start()
+        self.addCleanup(patch.stop)
+
+        self.camera = mock.MagicMock()
+        self.image_format = (2000, 1000, 1.0)
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_center(self):
+        """Tests a point in front of the camera lands in the center"""
+
+        self.assertEqual(
+            [(1000.0, 500.0)],
+            transforms.project_points(
+                self.camera, [(0.0, 0.0, 0.0)], 1, self.image_format
+            )
+        )
+
+    # =========================================================================
+
+    def test_offset(self):
+        """Tests an offset point lands where the lens puts it"""
+
+        # A lens of 4 spans 2.5 units either side at a depth of 10.
+        x, y = transforms.project_points(
+            self.camera, [(1.25, -0.5, 0.0)], 1, self.image_format
+        )[0]
+
+        self.assertAlmostEqual(
+            1500.0,
+            x
+        )
+
+        self.assertAlmostEqual(
+            300.0,
+            y
+        )
+
+    # =========================================================================
+
+    def test_cull(self):
+        """Tests points behind the camera or off the format are culled"""
+
+        points = [(0.0, 0.0, 20.0), (10.0, 0.0, 0.0), (0.0, 0.0, 0.0)]
+
+        projected = transforms.project_points(
+            self.camera, points, 1, self.image_format
+        )
+
+        self.assertEqual(
+            [None, None, (1000.0, 500.0)],
+            projected
+        )
+
+        projected = transforms.project_points(
+            self.camera, points, 1, self.image_format, cull=False
+        )
+
+        self.assertEqual(
+            [True, True, True],
+            [point is not None for point in projected]
+        )
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,564 @@
+#!/usr/bin/env python
+"""
+Tests syncing viewers with viewerSync
+
+REQUIREMENTS:
+
+mock
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Imports
+import mock
+import sys
+import unittest
+
+sys.path.append('../')
+
+# Thorium Imports
+from thorium.viewerSync import viewerSync
+
+# =============================================================================
+# PRIVATE CLASSES
+# =============================================================================
+
+
+class _Knob(object):
+    """A knob holding a single value, or a list of values for an array"""
+
+    def __init__(self, name, value=None):
+        self._name = name
+        self._value = value
+
+    def name(self):
+        return self._name
+
+    def setFlag(self, flag):
+        pass
+
+    def setTooltip(self, tooltip):
+        pass
+
+    def setValue(self, value):
+        self._value = value
+
+    def toScript(self, quote=False):
+        """Returns the value as Nuke would, only quoting it if asked"""
+        if isinstance(self._value, list):
+            script = ' '.join(str(value) for value in self._value)
+            return '{' + script + '}' if quote else script
+        script = str(self._value)
+        if quote and ' ' in script:
+            return '"' + script + '"'
+        return script
+
+    def value(self):
+        return self._value
+
+
+class _Viewer(object):
+    """A Viewer node holding knobs, which reads knob scripts like Nuke
+
+    Once deleted is set, using the viewer raises ValueError, as using a
+    deleted node does in Nuke.
+
+    """
+
+    def __init__(self, name, **values):
+        self.deleted = False
+        self._name = name
+        self._knobs = {'knobChanged': _Knob('knobChanged', '')}
+        for knob, value in values.items():
+            self._knobs[knob] = _Knob(knob, value)
+        self._inputs = []
+
+    def __getitem__(self, knob):
+        self._check()
+        try:
+            return self._knobs[knob]
+        except KeyError:
+            raise NameError(knob)
+
+    def _check(self):
+        if self.deleted:
+            raise ValueError('A PythonObject is not attached to a node')
+
+    def addKnob(self, knob):
+        self._knobs[knob.name()] = knob
+
+    def fullName(self):
+        self._check()
+        return self._name
+
+    def input(self, i):
+        return self._inputs[i] if i < len(self._inputs) else None
+
+    def inputs(self):
+        return len(self._inputs)
+
+    def knobs(self):
+        self._check()
+        return dict(self._knobs)
+
+    def readKnobs(self, script):
+        """Sets knobs from a script of names and values
+
+        Values are split on whitespace, unless they're wrapped in braces or
+        quotes, just as Nuke splits them. Unknown knobs raise.
+
+        """
+        tokens = []
+        token = ''
+        closing = None
+        for char in script:
+            if closing:
+                if char == closing:
+                    tokens.append(token)
+                    token = ''
+                    closing = None
+                else:
+                    token += char
+            elif char in '{"':
+                closing = '}' if char == '{' else '"'
+            elif char == ' ':
+                if token:
+                    tokens.append(token)
+                    token = ''
+            else:
+                token += char
+        if token:
+            tokens.append(token)
+
+        for name, value in zip(tokens[::2], tokens[1::2]):
+            knob = self[name]
+            if isinstance(knob.value(), list):
+                value = [type(knob.value()[0])(v) for v in value.split()]
+            else:
+                value = type(knob.value())(value)
+            knob.setValue(value)
+
+    def setName(self, name):
+        self._name = name
+
+    def setInput(self, i, node):
+        self._inputs.extend([None] * (i + 1 - len(self._inputs)))
+        self._inputs[i] = node
+
+# =============================================================================
+# TEST CLASSES
+# =============================================================================
+
+
+class testCoalescing(unittest.TestCase):
+    """Tests queueing syncs while coalescing"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        self.now = [100.0]
+        patches = [
+            mock.patch.object(viewerSync, 'nuke', create=True),
+            mock.patch.object(viewerSync.threading, 'Timer'),
+            mock.patch.object(
+                viewerSync.time, 'time', side_effect=lambda: self.now[0]
+            ),
+            mock.patch.dict(viewerSync._COALESCING, {
+                'enabled': True,
+                'interval': 0.1,
+                'last_flush': 0.0,
+                'scheduled': False,
+            }),
+            mock.patch.dict(viewerSync._PENDING_SYNCS, clear=True),
+        ]
+        self.nuke, self.timer = [patch.start() for patch in patches[:2]]
+        for patch in patches[2:]:
+            patch.start()
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+        self.caller = _Viewer('Viewer1', gain=1.0)
+        self.target = _Viewer('Viewer2', gain=1.0)
+
+    # =========================================================================
+
+    def change(self, value):
+        """Changes gain on the caller and queues a sync of it"""
+        self.caller['gain'].setValue(value)
+        viewerSync._queue_sync(self.caller, [self.target], 'gain')
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_first_change_applied(self):
+        """Tests a change after a quiet interval is synced straight away"""
+
+        self.change(2.0)
+
+        self.assertEqual(
+            2.0,
+            self.target['gain'].value()
+        )
+
+        self.assertFalse(
+            self.timer.called
+        )
+
+    # =========================================================================
+
+    def test_rapid_changes_coalesced(self):
+        """Tests rapid changes are held, and only the latest is synced"""
+
+        self.change(2.0)
+        self.now[0] += 0.01
+        self.change(3.0)
+        self.change(4.0)
+
+        self.assertEqual(
+            2.0,
+            self.target['gain'].value()
+        )
+
+        self.assertEqual(
+            1,
+            self.timer.call_count
+        )
+
+        self.assertEqual(
+            1,
+            len(viewerSync._PENDING_SYNCS)
+        )
+
+        # The timer hands the flush to the main thread.
+        wait, function, args = self.timer.call_args[0]
+        self.assertAlmostEqual(
+            0.09,
+            wait
+        )
+        function(*args)
+        self.nuke.executeInMainThread.call_args[0][0]()
+
+        self.assertEqual(
+            4.0,
+            self.target['gain'].value()
+        )
+
+        self.assertFalse(
+            viewerSync._PENDING_SYNCS
+        )
+
+    # =========================================================================
+
+    def test_disable_flushes(self):
+        """Tests turning coalescing off syncs anything still held"""
+
+        self.change(2.0)
+        self.now[0] += 0.01
+        self.change(3.0)
+
+        viewerSync.set_coalescing(False)
+
+        self.assertEqual(
+            3.0,
+            self.target['gain'].value()
+        )
+
+    # =========================================================================
+
+    def test_deleted_target_dropped(self):
+        """Tests a target deleted while a sync waited doesn't stop the rest"""
+
+        deleted = _Viewer('Viewer3', gain=1.0)
+        self.change(2.0)
+        self.now[0] += 0.01
+        self.caller['gain'].setValue(3.0)
+        viewerSync._queue_sync(self.caller, [deleted, self.target], 'gain')
+        deleted.deleted = True
+
+        viewerSync._flush_syncs()
+
+        self.assertEqual(
+            3.0,
+            self.target['gain'].value()
+        )
+
+
+class testSyncKnobs(unittest.TestCase):
+    """Tests the _sync_knobs() function"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        self.knobs = ['viewerProcess', 'gain', 'masking_ratio']
+        self.source = _Viewer(
+            'Viewer1',
+            viewerProcess='sRGB (ACES)',
+            gain=[1.0, 2.0, 3.0, 1.0],
+            masking_ratio='1.85:1',
+        )
+        self.targets = [
+            _Viewer(
+                'Viewer{0}'.format(i),
+                viewerProcess='None',
+                gain=[1.0, 1.0, 1.0, 1.0],
+                masking_ratio='1.85:1',
+            ) for i in (2, 3)
+        ]
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_quoted_values(self):
+        """Tests values with spaces and array values sync as one value"""
+
+        skipped = viewerSync._sync_knobs(self.source, self.targets, self.knobs)
+
+        for target in self.targets:
+            self.assertEqual(
+                'sRGB (ACES)',
+                target['viewerProcess'].value()
+            )
+            self.assertEqual(
+                [1.0, 2.0, 3.0, 1.0],
+                target['gain'].value()
+            )
+
+        # Only masking_ratio already matched.
+        self.assertEqual(
+            2,
+            skipped
+        )
+
+    # =========================================================================
+
+    def test_read_failure(self):
+        """Tests every knob is synced one by one if a script can't be read"""
+
+        target = self.targets[0]
+        target.readKnobs = mock.MagicMock(side_effect=RuntimeError)
+
+        viewerSync._sync_knobs(self.source, [target], self.knobs)
+
+        self.assertTrue(
+            target.readKnobs.called
+        )
+
+        self.assertEqual(
+            ('sRGB (ACES)', [1.0, 2.0, 3.0, 1.0]),
+            (target['viewerProcess'].value(), target['gain'].value())
+        )
+
+    # =========================================================================
+
+    def test_misread_knobs_restored(self):
+        """Tests knobs set wrongly by a misread script are synced again"""
+
+        target = self.targets[0]
+
+        def misread(script):
+            """Reads the script, but clobbers a knob that already matched"""
+            _Viewer.readKnobs(target, script)
+            target['masking_ratio'].setValue('2.39:1')
+
+        target.readKnobs = misread
+
+        viewerSync._sync_knobs(self.source, [target], self.knobs)
+
+        self.assertEqual(
+            '1.85:1',
+            target['masking_ratio'].value()
+        )
+
+
+class testSetupSync(unittest.TestCase):
+    """Tests the setup_sync() function"""
+
+    # =========================================================================
+    # SETUP & TEARDOWN
+    # =========================================================================
+
+    def setUp(self):
+        patches = [
+            mock.patch.object(viewerSync, 'nuke', create=True),
+            mock.patch.object(viewerSync, '_SYNC_GROUPS', {}),
+        ]
+        self.nuke = patches[0].start()
+        patches[1].start()
+        for patch in patches:
+            self.addCleanup(patch.stop)
+
+        for knob_class in ('Boolean_Knob', 'String_Knob', 'Tab_Knob',
+                           'Text_Knob'):
+            getattr(self.nuke, knob_class).side_effect = (
+                lambda name, label='': _Knob(name, False)
+            )
+
+        self.viewers = [
+            _Viewer('Viewer1', masking_ratio='1.85:1', gain=1.0),
+            _Viewer('Viewer2', masking_ratio='2.39:1', gain=2.0),
+            _Viewer('Viewer3', masking_ratio='1.33:1', gain=3.0),
+        ]
+        self.nuke.selectedNodes.return_value = list(self.viewers)
+        self.nuke.activeViewer.return_value.node.return_value = (
+            self.viewers[1]
+        )
+        self.nuke.toNode.side_effect = self.to_node
+
+    # =========================================================================
+
+    def dispatch(self, viewer, knob):
+        """Calls the Viewer dispatcher as Nuke would after knob changed"""
+        self.nuke.thisNode.return_value = viewer
+        self.nuke.thisKnob.return_value = _Knob(knob)
+        viewerSync._dispatch()
+
+    # =========================================================================
+
+    def to_node(self, name):
+        """Finds a viewer by name, as nuke.toNode does"""
+        for viewer in self.viewers:
+            if not viewer.deleted and viewer.fullName() == name:
+                return viewer
+        return None
+
+    # =========================================================================
+    # TESTS
+    # =========================================================================
+
+    def test_synced_from_active(self):
+        """Tests a new group is synced from the active viewer"""
+
+        viewerSync.setup_sync()
+
+        self.assertEqual(
+            ['2.39:1'] * 3,
+            [viewer['masking_ratio'].value() for viewer in self.viewers]
+        )
+
+        # Gain isn't synced by default.
+        self.assertEqual(
+            [1.0, 2.0, 3.0],
+            [viewer['gain'].value() for viewer in self.viewers]
+        )
+
+    # =========================================================================
+
+    def test_inputs_synced(self):
+        """Tests inputs are synced once vs_inputs is on"""
+
+        viewerSync.setup_sync()
+        source = mock.MagicMock()
+        self.viewers[0].setInput(0, source)
+        self.viewers[0]['vs_inputs'].setValue(True)
+
+        viewerSync._handle_event(self.viewers[0], 'inputChange')
+
+        self.assertEqual(
+            [source] * 3,
+            [viewer.input(0) for viewer in self.viewers]
+        )
+
+    # =========================================================================
+
+    def test_knob_changed_ignored(self):
+        """Tests edits to the knobChanged knob aren't synced"""
+
+        viewerSync.setup_sync()
+        self.viewers[0]['knobChanged'].setValue('print "changed"')
+
+        with mock.patch.object(viewerSync, '_linked_viewers') as linked:
+            self.dispatch(self.viewers[0], 'knobChanged')
+
+        self.assertFalse(
+            linked.called
+        )
+
+        self.assertEqual(
+            ['', ''],
+            [viewer['knobChanged'].value() for viewer in self.viewers[1:]]
+        )
+
+    # =========================================================================
+
+    def test_renamed(self):
+        """Tests a renamed viewer stays synced, and its old name is freed"""
+
+        viewerSync.setup_sync()
+        self.viewers[0].setName('Viewer4')
+        self.dispatch(self.viewers[0], 'name')
+
+        self.assertEqual(
+            ['Viewer3 Viewer2', 'Viewer4 Viewer3', 'Viewer4 Viewer2'],
+            [viewer['vs_viewers'].value() for viewer in self.viewers]
+        )
+
+        # A new viewer given the old name isn't synced.
+        self.viewers.append(_Viewer('Viewer1', masking_ratio='1.33:1'))
+        self.viewers[1]['masking_ratio'].setValue('1.85:1')
+        self.dispatch(self.viewers[1], 'masking_ratio')
+
+        self.assertEqual(
+            ['1.85:1', '1.85:1', '1.85:1', '1.33:1'],
+            [viewer['masking_ratio'].value() for viewer in self.viewers]
+        )
+
+    # =========================================================================
+
+    def test_deleted(self):
+        """Tests a deleted viewer is unlinked, and its old name is freed"""
+
+        viewerSync.setup_sync()
+        viewerSync._forget_viewer(self.viewers[2])
+        self.viewers[2].deleted = True
+
+        self.assertEqual(
+            ['Viewer2', 'Viewer1'],
+            [viewer['vs_viewers'].value() for viewer in self.viewers[:2]]
+        )
+
+        # A new viewer given the old name isn't synced.
+        self.viewers.append(_Viewer('Viewer3', masking_ratio='1.33:1'))
+        self.viewers[1]['masking_ratio'].setValue('1.85:1')
+        self.dispatch(self.viewers[1], 'masking_ratio')
+
+        self.assertEqual(
+            ['1.85:1', '1.85:1', '1.33:1'],
+            [viewer['masking_ratio'].value()
+             for viewer in self.viewers[:2] + self.viewers[3:]]
+        )
+
+    # =========================================================================
+
+    def test_deleted_unheard(self):
+        """Tests a viewer deleted without a callback is dropped on sync"""
+
+        viewerSync.setup_sync()
+        self.viewers[2].deleted = True
+
+        self.viewers[1]['masking_ratio'].setValue('1.85:1')
+        self.dispatch(self.viewers[1], 'masking_ratio')
+
+        self.assertEqual(
+            ['1.85:1', '1.85:1'],
+            [viewer['masking_ratio'].value() for viewer in self.viewers[:2]]
+        )
+
+        self.assertEqual(
+            ['Viewer2', 'Viewer1'],
+            [viewer['vs_viewers'].value() for viewer in self.viewers[:2]]
+        )
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+if __name__ == '__main__':
+    unittest.main()
@@ -50,6 +50,9 @@ try:
 except ImportError:
     pass
 
+# Thorium Imports
+from ..utils import transforms as xforms
+
 # =============================================================================
 # EXPORTS
 # =============================================================================
@@ -119,6 +122,55 @@ def _frange_percent(frame, frange):
     return int(percent * 100)
 
 # =============================================================================
+
+
+def _parent_space(node, vertices, frame):
+    """Moves a vertex selection into the space of the node's parent
+
+    The snap functions place a node at the world space position of the
+    vertices, but its knobs are relative to any transform node it's parented
+    to. The parent's world matrix is read through the shared transform
+    cache, so each frame only evaluates it once.
+
+    Args:
+        node : (<nuke.Node>)
+            The node being snapped.
+
+        vertices : (<snap3d.VertexSelection>)
+            The selected vertices, in world space.
+
+        frame : (int)
+            The frame to evaluate the parent at.
+
+    Returns:
+        (<snap3d.VertexSelection>)
+            The same vertices, in the space of the node's parent.
+
+    Raises:
+        N/A
+
+    """
+    infos = list(vertices)
+    points = xforms.to_parent_space(
+        node,
+        [
+            (info.position.x, info.position.y, info.position.z)
+            for info in infos
+        ],
+        frame
+    )
+
+    selection = snap3d.VertexSelection()
+    for info, point in zip(infos, points):
+        selection.add(
+            snap3d.VertexInfo(
+                info.objnum, info.index, info.value, nuke.math.Vector3(*point)
+            )
+        )
+
+    return selection
+
+# =============================================================================
 # PUBLIC FUNCTIONS
 # =============================================================================
 
@@ -126,6 +178,10 @@ def _frange_percent(frame, frange):
 def animated_snap(transforms=None, node=None, vertices=None, frange=None):
     """A wrapper to call the relevant snap functions within a frame range loop
 
+    At each frame the selected vertices are moved into the space of any
+    transform the node is parented to, through the shared transform cache,
+    before the node is snapped to them.
+
     Args:
         transforms=None : [str]
             A list of transforms to apply to the snapped object. Should be
@@ -241,7 +297,11 @@ def animated_snap(transforms=None, node=None, vertices=None, frange=None):
             break
         else:
             # Call the passed snap function from the nukescripts.snap3d module
-            snap_func(node, vertices)
+            snap_func(node, _parent_space(node, vertices, frame))
 
     if temp:
         nuke.delete(temp)
+
+    # Keys set through python don't reliably trigger knobChanged, so we need
+    # to tell the shared transform cache that this node has new values.
+    xforms.invalidate(node)
@@ -19,7 +19,33 @@ translation tracked, check that box.
 
 CardToTrack will then create the intermediate nodes required to calculate the
 final desired output, run through the frame range, create the output nodes, and
-finally clean up after itself.
+finally clean up after itself. The range is worked through a chunk of frames at
+a time, so even very long shots can be tracked with little memory, and the
+progress bar can cancel between chunks.
+
+The evaluated corner positions are cached in `~/.nuke/cache/cardToTrack`,
+keyed by the card and camera knobs and animation, the background format and
+the frame range. Running CardToTrack again with unchanged inputs (to pick a
+different output, for instance) skips the evaluation and only builds the
+output nodes. Entries unused for 30 days are pruned, as are the least recently
+used ones once the cache passes 512MB.
+
+If the camera solve or card animation changes after the fact, select the
+output nodes and choose CardToTrack Refresh. Only the chunks of frames where
+the card or camera actually changed are evaluated again and re-keyed on the
+existing nodes.
+
+In stereo and other multi-view scripts, the panel also asks which views to
+track. Each chosen view is tracked as that view, whichever view is current.
+Several views are tracked in a single pass, and each output node gets a split
+of its knobs keyed for every view. Every view is cached and refreshed on its
+own. Roto output isn't available for more than one view, as Roto can't hold a
+matrix per view.
+
+To hand the corner tracks to other software, `cardToTrack.export_corners()`
+writes the projected corners (and optionally the corner pin matrix relative to
+a reference frame) for every frame straight to a .csv or binary file, without
+building any nodes.
 
 More usage information is available in this YouTube video from the creator,
 Alexey Kuchinski:
@@ -81,7 +107,9 @@ except ImportError:
 # cardToTrack Imports
 from .cardToTrack import (
     card_to_track, card_to_track_wrapper, corner_pin_to_corner_matrix,
-    matrix_to_roto_matrix, reconcile_to_corner, reconcile_to_tracks
+    export_corners, matrix_to_roto_matrix, points_to_tracks,
+    reconcile_to_corner, reconcile_to_tracks, refresh_outputs,
+    tracks_to_tracker
 )
 
 # ==============================================================================
@@ -109,10 +137,14 @@ __all__ = [
     'card_to_track',
     'card_to_track_wrapper',
     'corner_pin_to_corner_matrix',
+    'export_corners',
     'matrix_to_roto_matrix',
+    'points_to_tracks',
     'reconcile_to_corner',
     'reconcile_to_tracks',
+    'refresh_outputs',
     'run',
+    'tracks_to_tracker',
 ]
 
 # ==============================================================================
@@ -216,3 +248,9 @@ def run(menu=None, submenu=None, submenu_index=None, item_index=None):
         index=item_index if item_index is not None else
         _get_menu_item_index(dest_menu, 'CardToTrack')
     )
+    dest_menu.addCommand(
+        'CardToTrack Refresh',
+        'cardToTrack.refresh_outputs()',
+        index=item_index + 1 if item_index is not None else
+        _get_menu_item_index(dest_menu, 'CardToTrack Refresh')
+    )
@@ -22,16 +22,32 @@ well as a small collection of useful conversion functions.
         Transforms a CornerPin's to and from corners into a transformation
         matrix based CornerPin, leaving the to/from knobs completely free.
 
+    export_corners()
+        Streams the projected corners of a card, and optionally their corner
+        pin matrices, straight to a .csv or binary file.
+
     matrix_to_roto_matrix()
         Copies any node's transformation matrix into a Roto node's matrix.
 
+    points_to_tracks()
+        Projects any number of 3D points or Axis nodes through a camera into
+        2D tracks in a single pass, without any Reconcile3D nodes.
+
     reconcile_to_corner()
         Takes 4 Reconcile3D nodes and converts them into points on a corner pin
         based on a reference frame.
 
     reconcile_to_tracks()
-        Takes up to 4 Reconcile3D nodes and copies their values into a Tracker
-        node.
+        Takes any number of Reconcile3D nodes and copies their values into a
+        single Tracker node.
+
+    refresh_outputs()
+        Re-evaluates and re-keys only the frames of existing outputs whose
+        card or camera changed since they were created.
+
+    tracks_to_tracker()
+        Writes any number of tracks onto a single Tracker4 node, with one
+        knob script holding its whole tracks table.
 
 ## License
 
@@ -63,12 +79,120 @@ SOFTWARE.
 # IMPORTS
 # =============================================================================
 
+# Standard Imports
+import contextlib
+import csv
+import hashlib
+import itertools
+import json
+import os
+import struct
+import time
+
 # Nuke Imports
 try:
     import nuke
 except ImportError:
     pass
 
+# Thorium Imports
+from ..utils import transforms
+
+# =============================================================================
+# GLOBALS
+# =============================================================================
+
+# Where evaluated corner positions are cached between runs.
+CACHE_DIR = os.path.join(
+    os.path.expanduser('~'), '.nuke', 'cache', 'cardToTrack'
+)
+
+# Cache entries unused for this many seconds, or past this many bytes in
+# total, are pruned whenever a new entry is written. The least recently used
+# entries go first.
+CACHE_MAX_AGE = 30 * 24 * 60 * 60
+CACHE_MAX_SIZE = 512 * 1024 * 1024
+
+# Bump whenever the evaluation changes in a way that makes old cached
+# positions invalid.
+CACHE_VERSION = 1
+
+# How many frames are evaluated and keyed at a time. Memory use is bounded
+# by this rather than by the length of the frame range.
+CHUNK_SIZE = 250
+
+# Columns written by `export_corners`, after the frame. Corners are ordered
+# counter clockwise from the lower left, matrix values are in the order they
+# appear on a CornerPin's `transform_matrix` knob.
+CORNER_COLUMNS = [
+    'll_x', 'll_y', 'lr_x', 'lr_y', 'ur_x', 'ur_y', 'ul_x', 'ul_y',
+]
+MATRIX_COLUMNS = ['m{0}'.format(i) for i in xrange(16)]
+
+# File extensions `export_corners` can write. Nuke's .chan files only hold a
+# camera or transform per frame, which our corners and matrices aren't.
+EXPORT_FORMATS = ['.bin', '.csv']
+
+# Identifies the binary export format, followed by the format version.
+EXPORT_MAGIC = 'CTT1'
+
+# The output roles built for each choice of the panel's Output pulldown.
+OUTPUT_ROLES = {
+    'All': ['tracker', 'corner_pin', 'corner_matrix', 'roto'],
+    'CornerPin': ['corner_pin'],
+    'CornerPin(Matrix)': ['corner_matrix'],
+    'Roto': ['roto'],
+    'Tracker': ['tracker'],
+}
+
+# Horizontal offset from the card that each output role is placed at.
+OUTPUT_OFFSETS = {
+    'tracker': -150,
+    'corner_pin': -50,
+    'corner_matrix': 50,
+    'roto': 150,
+}
+
+# The hidden knob on output nodes recording what they were generated from.
+SOURCE_KNOB = 'ctt_source'
+
+# The columns of a Tracker4 `tracks` table as they appear in its knob script:
+# the cell type, if it's editable, its width in the interface, its name and
+# its label.
+TRACKS_COLUMNS = [
+    (5, 1, 20, 'enable', 'e'),
+    (3, 1, 75, 'name', 'name'),
+    (2, 1, 58, 'track_x', 'track_x'),
+    (2, 1, 58, 'track_y', 'track_y'),
+    (2, 1, 63, 'offset_x', 'offset_x'),
+    (2, 1, 63, 'offset_y', 'offset_y'),
+    (4, 1, 27, 'T', 'T'),
+    (4, 1, 27, 'R', 'R'),
+    (4, 1, 27, 'S', 'S'),
+    (2, 0, 45, 'error', 'error'),
+    (1, 1, 0, 'error_min', 'error_min'),
+    (1, 1, 0, 'error_max', 'error_max'),
+    (1, 1, 0, 'pattern_x', 'pattern_x'),
+    (1, 1, 0, 'pattern_y', 'pattern_y'),
+    (1, 1, 0, 'pattern_r', 'pattern_r'),
+    (1, 1, 0, 'pattern_t', 'pattern_t'),
+    (1, 1, 0, 'search_x', 'search_x'),
+    (1, 1, 0, 'search_y', 'search_y'),
+    (1, 1, 0, 'search_r', 'search_r'),
+    (1, 1, 0, 'search_t', 'search_t'),
+    (2, 1, 0, 'key_track', 'key_track'),
+    (2, 1, 0, 'key_search_x', 'key_search_x'),
+    (2, 1, 0, 'key_search_y', 'key_search_y'),
+    (2, 1, 0, 'key_search_r', 'key_search_r'),
+    (2, 1, 0, 'key_search_t', 'key_search_t'),
+    (2, 1, 0, 'key_track_x', 'key_track_x'),
+    (2, 1, 0, 'key_track_y', 'key_track_y'),
+    (2, 1, 0, 'key_track_r', 'key_track_r'),
+    (2, 1, 0, 'key_track_t', 'key_track_t'),
+    (2, 1, 0, 'key_centre_offset_x', 'key_centre_offset_x'),
+    (2, 1, 0, 'key_centre_offset_y', 'key_centre_offset_y'),
+]
+
 # =============================================================================
 # EXPORTS
 # =============================================================================
@@ -77,9 +201,13 @@ __all__ = [
     'card_to_track',
     'card_to_track_wrapper',
     'corner_pin_to_corner_matrix',
+    'export_corners',
     'matrix_to_roto_matrix',
+    'points_to_tracks',
     'reconcile_to_corner',
     'reconcile_to_tracks',
+    'refresh_outputs',
+    'tracks_to_tracker',
 ]
 
 # =============================================================================
@@ -87,6 +215,151 @@ __all__ = [
 # =============================================================================
 
 
+def _cache_key(card, camera, background, frange, translate_only, view=None,
+               split=False):
+    """Returns a key that changes whenever the evaluated points would change
+
+    Args:
+        card : (<nuke.nodes.Card2>)
+            The card being tracked.
+
+        camera : (<nuke.nodes.Camera2>)
+            The camera the card is being tracked through.
+
+        background : (<nuke.Node>)
+            The image node providing the format.
+
+        frange : (<nuke.FrameRange>)
+            The frame range being evaluated.
+
+        translate_only : (bool)
+            If only the card's center is being tracked.
+
+        view=None : (str)
+            The view being evaluated, if one was chosen.
+
+        split=False : (bool)
+            If the view is projected in python along with other views,
+            rather than evaluated through Reconcile3D nodes.
+
+    Returns:
+        (str)
+            A hex digest of the knobs and animations of the card and camera
+            (along with anything they're parented to), the card size, the
+            background format, the frame range and the view.
+
+    Raises:
+        N/A
+
+    """
+    bg_format = background.format()
+
+    digest = hashlib.sha1()
+    for value in [
+        CACHE_VERSION,
+        transforms.chain_hash(card, refresh=True),
+        transforms.chain_hash(camera, refresh=True),
+        card.width(),
+        card.height(),
+        bg_format.width(),
+        bg_format.height(),
+        bg_format.pixelAspect(),
+        frange,
+        translate_only,
+        view,
+        split,
+    ]:
+        digest.update(str(value))
+
+    return digest.hexdigest()
+
+# =============================================================================
+
+
+def _cache_path(key):
+    """Returns the path of the cache entry for a key from `_cache_key`"""
+    return os.path.join(CACHE_DIR, key + '.jsonl')
+
+# =============================================================================
+
+
+def _cache_points(key, chunks, task=None, view=None):
+    """Writes chunks of evaluated points to the cache as they pass through
+
+    Each chunk is written to a temporary file as a line of json rows as it's
+    yielded on, so the full range is never held in memory. The file only
+    replaces the cache entry once every chunk has gone through, so a
+    cancelled or failed run never leaves a partial entry behind. Once an
+    entry is written, the cache is pruned with `_prune_cache`.
+
+    Caching is best effort, failing to write will not raise.
+
+    Args:
+        key : (str)
+            The cache key as returned by `_cache_key`.
+
+        chunks : (iter)
+            Chunks of projected points as yielded by `_point_chunks`.
+
+        task=None : (<nuke.ProgressTask>)
+            If given and cancelled once chunks runs out, nothing is cached.
+
+        view=None : (str)
+            If given, chunks hold the points of several views, as yielded by
+            `_view_chunks`, and only this view's points are cached.
+
+    Yields:
+        {int: (float, ...)}|{str: {int: (float, ...)}}
+            Each chunk of chunks, unchanged.
+
+    Raises:
+        N/A
+
+    """
+    path = _cache_path(key)
+    temp_path = path + '.tmp'
+
+    try:
+        if not os.path.isdir(CACHE_DIR):
+            os.makedirs(CACHE_DIR)
+        cache_file = open(temp_path, 'w')
+    except (IOError, OSError):
+        cache_file = None
+
+    complete = False
+    try:
+        for points in chunks:
+            if cache_file:
+                view_points = points[view] if view else points
+                cache_file.write(
+                    json.dumps(
+                        [
+                            [frame] + list(view_points[frame])
+                            for frame in sorted(view_points)
+                        ]
+                    ) + '\n'
+                )
+            yield points
+        complete = not task or not task.isCancelled()
+    finally:
+        if cache_file:
+            try:
+                cache_file.close()
+                if complete:
+                    if os.path.exists(path):
+                        os.remove(path)
+                    os.rename(temp_path, path)
+                else:
+                    os.remove(temp_path)
+            except (IOError, OSError):
+                complete = False
+
+    if complete:
+        _prune_cache(keep=path)
+
+# =============================================================================
+
+
 def _card_to_track_panel():
     """GUI panel for getting card_to_track settings
 
@@ -100,7 +373,8 @@ def _card_to_track_panel():
             'last': (int) Last Frame,
             'ref_frame': (int) Reference Frame,
             'output': Output Type,
-            'axis': Translate Only Bool
+            'axis': Translate Only Bool,
+            'views': [str] Views to track, empty if the script isn't multi-view
          }
 
     Raises:
@@ -137,6 +411,11 @@ def _card_to_track_panel():
     panel.addSingleLineInput("Ref frame:", frame)
     panel.addBooleanCheckBox('Translate Only', False)
 
+    # Stereo and multi-view scripts can track every view in the same pass.
+    views = nuke.views()
+    if len(views) > 1:
+        panel.addSingleLineInput("Views:", ' '.join(views))
+
     # Show Panel
     if not panel.show():
         return
@@ -146,17 +425,287 @@ def _card_to_track_panel():
     panel_results['ref_frame'] = int(panel.value("Ref frame:"))
     panel_results['output'] = panel.value("Output:")
     panel_results['axis'] = panel.value("Translate Only")
+    if len(views) > 1:
+        panel_results['views'] = panel.value("Views:").split()
+    else:
+        panel_results['views'] = []
 
-    # Split returned range
-    first, last = panel_results['frange'].split("-")
-    panel_results['first'] = int(first)
-    panel_results['last'] = int(last)
+    # Split returned range, which can carry a step such as '1-100x2'
+    frange = nuke.FrameRange(panel_results['frange'])
+    panel_results['first'] = frange.first()
+    panel_results['last'] = frange.last()
 
     return panel_results
 
 # =============================================================================
 
 
+def _card_to_track_views(card, cameras, background, frange, settings,
+                         use_cache=True):
+    """Tracks a card through several chosen views of a multi-view script
+
+    The card's world matrix is read once per frame, its corners are placed
+    in world space and then projected through each view's camera, all in
+    python, so every view is evaluated as that view rather than as the
+    current one. Each output node is created once by `_create_output` and
+    keyed a chunk of frames at a time by `_key_outputs`, with every view
+    keyed on its own split of the knobs. As with `transforms.project_points`,
+    orthographic and lens distorted cameras aren't handled.
+
+    Each view is cached on its own entry and gets its own source record, so
+    any of them can be read back or refreshed later.
+
+    Roto layers can't hold a matrix per view, so no Roto output is made.
+
+    Args:
+        card : (<nuke.nodes.Card2>)
+            The card whose corners we wish to track.
+
+        cameras : {str: <nuke.nodes.Camera2>}
+            The camera to track each view through. The same camera can be
+            given for several views if its knobs are split.
+
+        background : (<nuke.Node>)
+            An image type background we can use to determine the format
+            for the trackers.
+
+        frange : (<nuke.FrameRange>)
+            The frames to track.
+
+        settings : {str: any}
+            The settings as returned by `_card_to_track_panel`.
+
+        use_cache=True : (bool)
+            If True, each view's points are read from and written to the
+            point cache, as in `card_to_track`.
+
+    Returns:
+        (<nuke.nodes.Tracker3>|<nuke.nodes.CornerPin2D>)
+            The selected node types (or all) will be returned.
+
+    Raises:
+        N/A
+
+    """
+    translate_only = settings['axis']
+    ref_frame = settings['ref_frame']
+    views = sorted(cameras)
+
+    if settings['output'] == 'Roto' and not translate_only:
+        nuke.message(
+            "Roto can't be keyed per view. Choose another output to track "
+            "multiple views."
+        )
+        return
+
+    card_pos_x = card['xpos'].value()
+    card_pos_y = card['ypos'].value()
+    card_label = card['label'].value()
+
+    # Corner pins and matrices are all relative to the reference frame.
+    ref_points = dict((view, None) for view in views)
+    if not translate_only:
+        ref_points = next(
+            _project_card(card, cameras, background, [ref_frame])
+        )[1]
+
+    if translate_only:
+        roles = ['tracker']
+        offsets = {'tracker': 0}
+    else:
+        roles = [
+            role for role in OUTPUT_ROLES[settings['output']]
+            if role != 'roto'
+        ]
+        offsets = OUTPUT_OFFSETS
+
+    outputs = [
+        (
+            _create_output(
+                role,
+                pos=(card_pos_x + offsets[role], card_pos_y + 60),
+                label=card_label,
+                ref_frame=ref_frame,
+                translate_only=translate_only
+            ),
+            role
+        ) for role in roles
+    ]
+
+    for node, role in outputs:
+        if role == 'corner_pin':
+            for view in views:
+                _set_ref_points(node, ref_points[view], view)
+
+    # Views we've projected before are read back from their own cache entry.
+    cache_keys = {}
+    cached = {}
+    if use_cache:
+        for view in views:
+            cache_keys[view] = _cache_key(
+                card, cameras[view], background, frange, translate_only,
+                view, split=True
+            )
+            view_cached = _read_point_cache(cache_keys[view])
+            if view_cached is not None:
+                cached[view] = view_cached
+
+    # Every other view of a chunk is projected together and written to its
+    # cache entry, then the chunk is keyed view by view.
+    task = nuke.ProgressTask("CardToTrack")
+    chunks = _view_chunks(
+        card, cameras, background, frange, translate_only, task=task,
+        cached=cached
+    )
+    for view in views:
+        if use_cache and view not in cached:
+            chunks = _cache_points(cache_keys[view], chunks, task, view=view)
+
+    for i, points in enumerate(chunks):
+        for view in views:
+            _key_outputs(
+                outputs, points[view], ref_points[view], replace=not i,
+                view=view
+            )
+
+    cancelled = task.isCancelled()
+    del task
+
+    if cancelled:
+        for node, _ in outputs:
+            nuke.delete(node)
+        return
+
+    # Every output records what each view was generated from, so that they
+    # can be refreshed later with `refresh_outputs`.
+    for view in views:
+        source = _source_record(
+            card, cameras[view], background, frange, ref_frame,
+            translate_only, view, split=True
+        )
+        for node, role in outputs:
+            _record_source(node, role, source)
+
+    if len(outputs) == 1:
+        return outputs[0][0]
+
+    return tuple(node for node, _ in outputs)
+
+# =============================================================================
+
+
+def _chunk_signatures(card, camera, frames):
+    """Returns a signature of the card and camera for each chunk of frames
+
+    Signatures come from `transforms.chain_signatures`, which reads the knob
+    scripts and animation keys of the card and camera chains once, rather
+    than evaluating either of them at every frame. Comparing signatures
+    tells us which chunks would project differently, while keeping the
+    record on each output small however long the range.
+
+    Args:
+        card : (<nuke.nodes.Card2>)
+            The card being tracked.
+
+        camera : (<nuke.nodes.Camera2>)
+            The camera the card is being tracked through.
+
+        frames : (<nuke.FrameRange>|[int])
+            The frames to sign, split into chunks as `_frame_chunks` does.
+
+    Returns:
+        [str]
+            A signature for each chunk, in the same order as the chunks.
+
+    Raises:
+        N/A
+
+    """
+    intervals = [(chunk[0], chunk[-1]) for chunk in _frame_chunks(frames)]
+
+    return [
+        hashlib.sha1(card_signature + camera_signature).hexdigest()
+        for card_signature, camera_signature in zip(
+            transforms.chain_signatures(card, intervals),
+            transforms.chain_signatures(camera, intervals)
+        )
+    ]
+
+# =============================================================================
+
+
+def _corner_matrix(to_corners, from_corners):
+    """Returns the transformation matrix between two sets of corners
+
+    Args:
+        to_corners : [float]
+            A flat list of the x, y values of the 4 destination corners.
+
+        from_corners : [float]
+            A flat list of the x, y values of the 4 source corners.
+
+    Returns:
+        [float]
+            The 16 values of the transposed matrix mapping the source
+            corners onto the destination corners, ready to be set on a
+            `transform_matrix` knob.
+
+    Raises:
+        N/A
+
+    """
+    to_matrix = nuke.math.Matrix4()
+    from_matrix = nuke.math.Matrix4()
+
+    # Pass our flat lists into the matrix methods.
+    to_matrix.mapUnitSquareToQuad(*to_corners)
+    from_matrix.mapUnitSquareToQuad(*from_corners)
+
+    corner_pin_matrix = to_matrix * from_matrix.inverse()
+    corner_pin_matrix.transpose()
+
+    return [corner_pin_matrix[i] for i in xrange(16)]
+
+# =============================================================================
+
+
+def _corner_pin_matrices(corner_pin, frames):
+    """Yields the matrix between a CornerPin's to and from corners per frame
+
+    Args:
+        corner_pin : (<nuke.nodes.CornerPin2D>)
+            The corner_pin node whose corners we want the matrices of.
+
+        frames : (iter)
+            The frames to read.
+
+    Yields:
+        (int, [float])
+            The frame and the 16 values of its transposed matrix.
+
+    Raises:
+        N/A
+
+    """
+    to_knobs = [corner_pin[knob] for knob in ['to1', 'to2', 'to3', 'to4']]
+    from_knobs = [
+        corner_pin[knob] for knob in ['from1', 'from2', 'from3', 'from4']
+    ]
+
+    for frame in frames:
+        # Each knob returns a tuple pair, which we unpack into a flat list.
+        to_corners = [
+            value for knob in to_knobs for value in knob.valueAt(frame)
+        ]
+        from_corners = [
+            value for knob in from_knobs for value in knob.valueAt(frame)
+        ]
+
+        yield frame, _corner_matrix(to_corners, from_corners)
+
+# =============================================================================
+
+
 def _create_axis(card, offset, parent_axis, name, xform=True):
     """Creates an axis along the plane of a card.
 
@@ -211,6 +760,80 @@ def _create_axis(card, offset, parent_axis, name, xform=True):
 # =============================================================================
 
 
+def _create_output(role, pos=None, label=None, ref_frame=None,
+                   ref_points=None, translate_only=False):
+    """Creates an empty output node, ready to be keyed by `_key_outputs`
+
+    Args:
+        role : (str)
+            What to create: 'tracker', 'corner_pin', 'corner_matrix' or
+            'roto'.
+
+        pos=None : (int, int)
+            Position to place the node.
+
+        label=None : (str)
+            What to label the node.
+
+        ref_frame=None : (int)
+            The reference frame, shown on the label of corner pins.
+
+        ref_points=None : (float, ...)
+            The projected corners at the reference frame, which a corner
+            pin's 'from' knobs are set to. If not given, they're left to be
+            set by `_set_ref_points`.
+
+        translate_only=False : (bool)
+            If True, a tracker gets a single translate only track rather than
+            a track for each corner.
+
+    Returns:
+        (<nuke.nodes.Tracker3>|<nuke.nodes.CornerPin2D>|<nuke.nodes.Roto>)
+            The created node.
+
+    Raises:
+        N/A
+
+    """
+    if role == 'tracker':
+        node = nuke.nodes.Tracker3()
+        for i in xrange(1 if translate_only else 4):
+            node['enable{0}'.format(i + 1)].setValue(1)
+            if not translate_only:
+                node['use_for{0}'.format(i + 1)].setValue(7)
+        if label:
+            node['label'].setValue(label)
+    elif role == 'corner_pin':
+        node = nuke.nodes.CornerPin2D()
+        if ref_points:
+            _set_ref_points(node, ref_points)
+        node['label'].setValue(
+            "{label}ref frame: {ref_frame}".format(
+                label=label + ' ' if label else '',
+                ref_frame=ref_frame
+            )
+        )
+    elif role == 'corner_matrix':
+        node = nuke.nodes.CornerPin2D()
+        node['label'].setValue(
+            "{label}Matrix".format(
+                label=label if label else 'CornerPin'
+            )
+        )
+    else:
+        node = nuke.nodes.Roto()
+        if label:
+            node['label'].setValue(label)
+
+    if pos:
+        node['xpos'].setValue(pos[0])
+        node['ypos'].setValue(pos[1])
+
+    return node
+
+# =============================================================================
+
+
 def _create_reconcile3D(axis, camera, background, name):
     """Creates a reconcile3D node attached to the axis
 
@@ -244,12 +867,49 @@ def _create_reconcile3D(axis, camera, background, name):
     return track
 
 # =============================================================================
-# PUBLIC FUNCTIONS
+
+
+def _curve_script(keys):
+    """Serializes keys into the knob script of an animation curve
+
+    Consecutive frames only need their values listed, so a frame is only
+    written out where there's a gap.
+
+    Args:
+        keys : [(int, float)]
+            The frame and value of each key, in frame order.
+
+    Returns:
+        (str)
+            The curve as it would appear in a knob script, for example
+            '{curve x1 0.5 0.75 x10 1.0}'.
+
+    Raises:
+        N/A
+
+    """
+    tokens = ['curve']
+    next_frame = None
+    for frame, value in keys:
+        if frame != next_frame:
+            tokens.append(
+                'x{0}'.format(int(frame) if frame == int(frame) else frame)
+            )
+        tokens.append(repr(float(value)))
+        next_frame = frame + 1
+
+    return '{' + ' '.join(tokens) + '}'
+
 # =============================================================================
 
 
-def card_to_track(card, camera, background):
-    """Takes the corners of a card and convert it to a variety of 2D outputs
+def _evaluate_points(card, camera, background, intervals,
+                     translate_only=False, view=None):
+    """Projects the corners of a card through a camera for every frame
+
+    Builds the intermediate Axis and Reconcile3D nodes needed, evaluates them
+    over the frame range, reads back their positions and cleans up after
+    itself.
 
     Args:
         card : (<nuke.nodes.Card2>)
@@ -262,56 +922,58 @@ def card_to_track(card, camera, background):
             An image type background we can use to determine the format
             for the trackers.
 
+        intervals : [(int, int)]
+            The first and last frame of each interval to evaluate.
+
+        translate_only=False : (bool)
+            If True, only the center of the card is projected.
+
+        view=None : (str)
+            If given, the Reconcile3D nodes are evaluated as this view,
+            rather than as the current one.
+
     Returns:
-        (<nuke.nodes.Tracker3>|<nuke.nodes.CornerPin2D>|<nuke.nodes.Roto>)
-            The selected node types (or all) will be returned.
+        {int: (float, ...)}
+            For every frame, a flat tuple of the x and y position of each
+            projected point. Corners are ordered lower left, lower right,
+            upper right, upper left (counter clockwise from lower left).
 
     Raises:
         N/A
 
     """
-
-    # Open a panel to grab our required settings and return a dictionary.
-    settings = _card_to_track_panel()
-    if not settings:  # If panel canceled, we'll cancel.
-        return
-
-    # Turn our frame range into a nuke.FrameRange object we can iterate over.
-    frange = nuke.FrameRange(settings['frange'])
-
-    # Card values
     card_pos_x = card['xpos'].value()
     card_pos_y = card['ypos'].value()
-    card_translate = card['translate'].value()
-    card_rotate = card['rotate'].value()
-    card_label = card['label'].value()
 
     # Create our Main Axis node
     main_axis = nuke.nodes.Axis()
     main_axis['xform_order'].setValue(3)
-    main_axis['translate'].setValue(card_translate)
-    main_axis['rotate'].setValue(card_rotate)
+    main_axis['translate'].setValue(card['translate'].value())
+    main_axis['rotate'].setValue(card['rotate'].value())
     main_axis['name'].setValue("MainAxis")
     main_axis['xpos'].setValue(card_pos_x)
     main_axis['ypos'].setValue(card_pos_y + 40)
 
-    # Full card_to_track:
-    if not settings['axis']:
-
-        # Check if our card translates in space
-        if card['translate'].isAnimated():
-            main_axis['translate'].copyAnimations(
-                card['translate'].animations()
-            )
+    # Check if our card translates in space
+    if card['translate'].isAnimated():
+        main_axis['translate'].copyAnimations(
+            card['translate'].animations()
+        )
 
-        # Check if our card rotates in space
-        if card['rotate'].isAnimated():
-            main_axis['rotate'].copyAnimations(
-                card['rotate'].animations()
-            )
+    # Check if our card rotates in space
+    if card['rotate'].isAnimated():
+        main_axis['rotate'].copyAnimations(
+            card['rotate'].animations()
+        )
 
-        # TODO: What about animated scaling?
+    # TODO: What about animated scaling?
 
+    if translate_only:
+        axes = []
+        tracks = [
+            _create_reconcile3D(main_axis, camera, background, "MainTrack")
+        ]
+    else:
         # Create our axes at the corners of the card.
         upper_left = _create_axis(
             card, (-0.5, 0.5), main_axis, 'UpperLeft'
@@ -361,95 +1023,47 @@ def card_to_track(card, camera, background):
             track['xpos'].setValue(card_pos_x + x)
             track['ypos'].setValue(card_pos_y + y)
 
-        # Evaluate our Reconciles for each frame
-        for reconcile in tracks:
-            nuke.execute(reconcile, settings['first'], settings['last'])
-
-        if settings['output'] in ['All', 'Tracker']:
-            tracker = reconcile_to_tracks(
-                inputs=tracks,
-                pos=(card_pos_x - 150, card_pos_y + 60),
-                label=card_label
-            )
-            if settings['output'] == 'Tracker':
-                # Cleanup our created nodes
-                for node in axes + tracks:
-                    nuke.delete(node)
-                nuke.delete(main_axis)
-                return tracker
-
-        # We always need a default corner_pin node for any of the remaining
-        # export types.
-        corner_pin = reconcile_to_corner(
-            inputs=tracks,
-            ref_frame=settings['ref_frame'],
-            pos=(card_pos_x - 50, card_pos_y + 60),
-            label=card_label
-        )
-
-        # Cleanup our created nodes, as we don't need them anymore.
-        for node in axes + tracks:
-            nuke.delete(node)
-        nuke.delete(main_axis)
-
-        if settings['output'] == 'CornerPin':
-            return corner_pin
-
-        corner_matrix = corner_pin_to_corner_matrix(
-            corner_pin=corner_pin,
-            frange=frange,
-            pos=(card_pos_x + 50, card_pos_y + 60),
-            label=card_label
-        )
+    # Evaluate all of our Reconciles together in a single pass over
+    # the frame range.
+    _execute_reconciles(tracks, intervals, view)
 
-        if settings['output'] == "CornerPin(matrix)":
-            # No longer need corner_pin
-            nuke.delete(corner_pin)
-            return corner_matrix
+    view_args = (view,) if view else ()
 
-        roto = matrix_to_roto_matrix(
-            matrix=corner_matrix,
-            frange=frange,
-            pos=(card_pos_x + 150, card_pos_y + 60),
-            label=card_label
+    points = {}
+    for frame in _interval_frames(intervals):
+        points[frame] = tuple(
+            value for track in tracks
+            for value in track['output'].valueAt(frame, -1, *view_args)
         )
 
-        if settings['output'] == "Roto":
-            # No longer need corner_pin
-            nuke.delete(corner_pin)
-            nuke.delete(corner_matrix)
-            return roto
+    # Cleanup our created nodes, as we don't need them anymore.
+    for node in axes + tracks:
+        nuke.delete(node)
+    nuke.delete(main_axis)
 
-        # Only output left is 'All'
-        return tracker, corner_pin, corner_matrix, roto
+    return points
 
-    # Here we'll only do translation
-    else:
-
-        main_track = _create_reconcile3D(main_axis, "MainTrack")
-        nuke.execute(main_track, settings['first'], settings['last'])
-
-        tracker = reconcile_to_tracks(
-            inputs=[main_track],
-            pos=(card_pos_x, card_pos_y + 60),
-            label=card_label,
-            translate_only=True
-        )
+# =============================================================================
 
-        # cleanup
-        nuke.delete(main_axis)
-        nuke.delete(main_track)
 
-        return tracker
+def _execute_reconciles(reconciles, intervals, view=None):
+    """Executes all given Reconcile3D nodes in a single pass over the frames
 
-# =============================================================================
+    Executing each Reconcile3D separately walks the frame range once per
+    node, re-evaluating the camera and axis chain every time. Handing all of
+    them to `nuke.executeMultiple` lets Nuke step through the range once,
+    evaluating every node at each frame before moving on.
 
+    Args:
+        reconciles : [<nuke.nodes.Reconcile3D>]
+            The Reconcile3D nodes to evaluate.
 
-def card_to_track_wrapper():
-    """A wrapper for card_to_track that handles node selection
+        intervals : [(int, int)]
+            The first and last frame of each interval to evaluate.
 
-    Args:
-        N/A
+        view=None : (str)
+            If given, the nodes are executed as this view, rather than as
+            the current one.
 
     Returns:
         None
@@ -458,7 +1072,1257 @@ def card_to_track_wrapper():
         N/A
 
     """
-    # Grab our selected nodes, there should only be three and we'll iterate
+    view_args = ([view],) if view else ()
+
+    nuke.executeMultiple(
+        tuple(reconciles),
+        tuple((first, last, 1) for first, last in intervals),
+        *view_args
+    )
+
+# =============================================================================
+
+
+def _export_rows(card, camera, background, frange, ref_frame=None,
+                 task=None):
+    """Yields a row of projected corners per frame, for exporting
+
+    Corners are projected in python, a chunk of frames at a time, so no
+    nodes are built and only one chunk is ever held in memory.
+
+    Args:
+        card : (<nuke.nodes.Card2>)
+            The card whose corners we wish to export.
+
+        camera : (<nuke.nodes.Camera2>)
+            The camera to project the card through.
+
+        background : (<nuke.Node>)
+            An image type background we can use to determine the format.
+
+        frange : (<nuke.FrameRange>|[int])
+            The frames to export.
+
+        ref_frame=None : (int)
+            If given, each row also holds the corner pin matrix from the
+            corners at this frame to the corners at the row's frame.
+
+        task=None : (<nuke.ProgressTask>)
+            Reports progress and is checked for cancellation per chunk.
+
+    Yields:
+        [float]
+            The frame, followed by the values for `CORNER_COLUMNS` and, if
+            ref_frame was given, `MATRIX_COLUMNS`.
+
+    Raises:
+        N/A
+
+    """
+    cameras = {None: camera}
+
+    ref_points = None
+    if ref_frame is not None:
+        _, projected = next(
+            _project_card(card, cameras, background, [ref_frame])
+        )
+        ref_points = projected[None]
+
+    for chunk in _frame_chunks(frange, task):
+        for frame, projected in _project_card(
+                card, cameras, background, chunk):
+            points = projected[None]
+            row = [frame] + list(points)
+            if ref_points:
+                row.extend(_corner_matrix(points, ref_points))
+            yield row
+
+# =============================================================================
+
+
+def _frame_chunks(frames, task=None, chunk_size=CHUNK_SIZE):
+    """Lazily splits frames into lists of at most chunk_size frames
+
+    Args:
+        frames : (<nuke.FrameRange>|[int])
+            The frames to split. A FrameRange is never expanded in full.
+
+        task=None : (<nuke.ProgressTask>)
+            If given, its progress is updated before each chunk, and no more
+            chunks are yielded once it has been cancelled.
+
+        chunk_size=CHUNK_SIZE : (int)
+            The most frames to yield at a time.
+
+    Yields:
+        [int]
+            The next chunk of frames.
+
+    Raises:
+        N/A
+
+    """
+    try:
+        total = len(frames)
+    except TypeError:
+        total = frames.frames()
+
+    frames = iter(frames)
+    done = 0
+    while True:
+        chunk = list(itertools.islice(frames, chunk_size))
+        if not chunk:
+            return
+
+        if task:
+            if task.isCancelled():
+                return
+            task.setProgress(int(done * 100 / max(total, 1)))
+
+        yield chunk
+
+        done += len(chunk)
+
+# =============================================================================
+
+
+def _frame_intervals(frames):
+    """Collapses a collection of frames into intervals of consecutive frames
+
+    Args:
+        frames : [int]
+            The frames to collapse, in any order.
+
+    Returns:
+        [(int, int)]
+            The first and last frame of each interval, in order.
+
+    Raises:
+        N/A
+
+    """
+    intervals = []
+    for frame in sorted(frames):
+        if intervals and frame == intervals[-1][1] + 1:
+            intervals[-1][1] = frame
+        else:
+            intervals.append([frame, frame])
+
+    return [tuple(interval) for interval in intervals]
+
+# =============================================================================
+
+
+def _interval_frames(intervals):
+    """Expands intervals into a sorted list of every frame they contain"""
+    frames = set()
+    for first, last in intervals:
+        frames.update(xrange(first, last + 1))
+
+    return sorted(frames)
+
+# =============================================================================
+
+
+def _key_curve(knob, index, keys, replace=True, view=None):
+    """Keys one curve of a knob with all of the given keys in a single call
+
+    Args:
+        knob : (<nuke.Array_Knob>)
+            The knob to key.
+
+        index : (int)
+            The index of the curve within the knob.
+
+        keys : [(int, float)]
+            The frame and value of each key.
+
+        replace=True : (bool)
+            If True, any existing animation is replaced. Otherwise only the
+            keys at the given frames are replaced.
+
+        view=None : (str)
+            If given, the knob is split off for this view and only that
+            view is keyed.
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    if view:
+        knob.splitView(view)
+
+    if replace or not knob.isAnimated(index, view):
+        knob.setAnimated(index, view)
+        # setAnimated keys the current frame, which might be outside of
+        # our range.
+        knob.animation(index, view).clear()
+    knob.animation(index, view).addKey(
+        [nuke.AnimationKey(frame, value) for frame, value in keys]
+    )
+
+# =============================================================================
+
+
+def _key_outputs(outputs, points, ref_points=None, replace=False,
+                 view=None):
+    """Keys output nodes with a chunk of projected points
+
+    Args:
+        outputs : [(<nuke.Node>, str)]
+            Each output node with its role: 'tracker', 'corner_pin',
+            'corner_matrix' or 'roto'.
+
+        points : {int: (float, ...)}
+            Projected points as returned by `_evaluate_points`.
+
+        ref_points=None : (float, ...)
+            The projected corners at the reference frame, which matrices are
+            relative to. Only needed for 'corner_matrix' and 'roto' outputs.
+
+        replace=False : (bool)
+            If True, any existing animation is replaced. Otherwise only the
+            keys at the frames in points are replaced.
+
+        view=None : (str)
+            If given, the knobs are split off for this view and only that
+            view is keyed. Roto outputs can't be split, and ignore it.
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    if not points:
+        return
+
+    frames = sorted(points)
+
+    matrices = {}
+    if ref_points and [
+        role for _, role in outputs if role in ['corner_matrix', 'roto']
+    ]:
+        matrices = dict(
+            (frame, _corner_matrix(points[frame], ref_points))
+            for frame in frames
+        )
+
+    for node, role in outputs:
+        if role == 'tracker':
+            for i in xrange(len(points[frames[0]]) // 2):
+                _set_keys(
+                    node['track{0}'.format(i + 1)], points, i * 2,
+                    replace=replace, view=view
+                )
+        elif role == 'corner_pin':
+            for i in xrange(4):
+                _set_keys(
+                    node['to{0}'.format(i + 1)], points, i * 2,
+                    replace=replace, view=view
+                )
+        elif role == 'corner_matrix':
+            for i in xrange(16):
+                _key_curve(
+                    node['transform_matrix'], i,
+                    [(frame, matrices[frame][i]) for frame in frames],
+                    replace=replace, view=view
+                )
+        elif role == 'roto':
+            transform = node['curves'].rootLayer.getTransform()
+            for i in xrange(16):
+                matrix_curve = transform.getExtraMatrixAnimCurve(0, i)
+                for frame in frames:
+                    matrix_curve.addKey(frame, matrices[frame][i])
+
+# =============================================================================
+
+
+def _knob_matrices(node, frames):
+    """Yields the values of a node's transform matrix per frame
+
+    Args:
+        node : (<nuke.Node>)
+            Any node with the 'transform_matrix' knob.
+
+        frames : (iter)
+            The frames to read.
+
+    Yields:
+        (int, [float])
+            The frame and the 16 values of the matrix.
+
+    Raises:
+        N/A
+
+    """
+    matrix_knob = node['transform_matrix']
+    for frame in frames:
+        yield frame, [matrix_knob.getValueAt(frame, i) for i in xrange(16)]
+
+# =============================================================================
+
+
+def _point_chunks(card, camera, background, frames, translate_only=False,
+                  task=None, cached=None, view=None):
+    """Yields projected points a chunk of frames at a time
+
+    Args:
+        card : (<nuke.nodes.Card2>)
+            The card whose corners we wish to track.
+
+        camera : (<nuke.nodes.Camera2>)
+            The camera with the motion we want to track the card through.
+
+        background : (<nuke.Node>)
+            An image type background we can use to determine the format
+            for the trackers.
+
+        frames : (<nuke.FrameRange>|[int])
+            The frames to project.
+
+        translate_only=False : (bool)
+            If True, only the center of the card is projected.
+
+        task=None : (<nuke.ProgressTask>)
+            Reports progress and is checked for cancellation per chunk.
+
+        cached=None : (iter)
+            Chunks of previously evaluated points, as yielded by
+            `_read_point_cache`, to read from instead of evaluating. If they
+            run out or don't line up with our chunks, the remaining chunks
+            are evaluated.
+
+        view=None : (str)
+            If given, the points are evaluated as this view.
+
+    Yields:
+        {int: (float, ...)}
+            Projected points as returned by `_evaluate_points`, for the next
+            `CHUNK_SIZE` frames.
+
+    Raises:
+        N/A
+
+    """
+    for chunk in _frame_chunks(frames, task):
+        points = None
+        if cached is not None:
+            points = next(cached, None)
+            if points is None or sorted(points) != chunk:
+                cached = None
+                points = None
+
+        if points is None:
+            points = _evaluate_points(
+                card, camera, background, _frame_intervals(chunk),
+                translate_only, view
+            )
+
+        yield points
+
+# =============================================================================
+
+
+def _project_card(card, cameras, background, frames, translate_only=False):
+    """Projects the corners of a card through a camera per view, per frame
+
+    No nodes are built or executed. The card's world matrix is read once per
+    frame from the shared transform cache, which already includes its
+    scaling, and the corners are projected through every view's camera
+    with `transforms.project_points`.
+
+    Args:
+        card : (<nuke.nodes.Card2>)
+            The card whose corners we wish to track.
+
+        cameras : {str: <nuke.nodes.Camera2>}
+            The camera to project each view through.
+
+        background : (<nuke.Node>)
+            An image type background we can use to determine the format.
+
+        frames : (<nuke.FrameRange>|[int])
+            The frames to project.
+
+        translate_only=False : (bool)
+            If True, only the center of the card is projected.
+
+    Yields:
+        (int, {str: (float, ...)})
+            The frame, and for each view a flat tuple of the x and y position
+            of each projected point, ordered as in `_evaluate_points`.
+
+    Raises:
+        N/A
+
+    """
+    bg_format = background.format()
+    image_format = (
+        bg_format.width(), bg_format.height(), bg_format.pixelAspect()
+    )
+
+    if translate_only:
+        offsets = [(0.0, 0.0)]
+    else:
+        aspect = float(card.height()) / card.width()
+        offsets = [
+            (-0.5, -0.5 * aspect), (0.5, -0.5 * aspect),
+            (0.5, 0.5 * aspect), (-0.5, 0.5 * aspect),
+        ]
+
+    cache = transforms.get_cache()
+    cache.chain_hash(card, refresh=True)
+    for camera in cameras.values():
+        cache.chain_hash(camera, refresh=True)
+
+    for frame in frames:
+        matrix = cache.world_matrix(card, frame)
+        corners = [
+            (
+                matrix[0] * x + matrix[1] * y + matrix[3],
+                matrix[4] * x + matrix[5] * y + matrix[7],
+                matrix[8] * x + matrix[9] * y + matrix[11],
+            ) for x, y in offsets
+        ]
+
+        projected = {}
+        for view, camera in cameras.items():
+            projected[view] = tuple(
+                value for point in transforms.project_points(
+                    camera, corners, frame, image_format, cull=False,
+                    view=view
+                ) for value in point
+            )
+
+        yield frame, projected
+
+# =============================================================================
+
+
+def _prune_cache(keep=None):
+    """Removes old cache entries until the cache is within its limits
+
+    Entries that haven't been used within `CACHE_MAX_AGE` seconds are
+    removed, then the least recently used entries until the rest fit in
+    `CACHE_MAX_SIZE` bytes. Temporary files are only removed once they're
+    too old, as another session might still be writing them.
+
+    Pruning is best effort, failing to remove an entry will not raise.
+
+    Args:
+        keep=None : (str)
+            The path of an entry to never remove, such as the one just
+            written.
+
+    Returns:
+        (int)
+            The number of files removed.
+
+    Raises:
+        N/A
+
+    """
+    try:
+        names = os.listdir(CACHE_DIR)
+    except OSError:
+        return 0
+
+    entries = []
+    for name in names:
+        path = os.path.join(CACHE_DIR, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    now = time.time()
+    total = 0
+    removed = 0
+    # Most recently used first, so the oldest are the ones past the limit.
+    for mtime, size, path in sorted(entries, reverse=True):
+        total += size
+        if path == keep:
+            continue
+
+        expired = now - mtime > CACHE_MAX_AGE
+        oversized = total > CACHE_MAX_SIZE and not path.endswith('.tmp')
+        if expired or oversized:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+    return removed
+
+# =============================================================================
+
+
+def _read_point_cache(key):
+    """Reads previously evaluated points from the cache a chunk at a time
+
+    Each line of a cache entry holds the rows of one chunk, as written by
+    `_cache_points`, so only a single chunk is ever held in memory.
+
+    Args:
+        key : (str)
+            The cache key as returned by `_cache_key`.
+
+    Returns:
+        (iter)|None
+            Yields the cached points of each chunk as {int: (float, ...)},
+            or None if nothing was cached under the given key. A chunk that
+            can't be read ends the iteration, and the entry is removed so
+            that it's written again on the next run.
+
+    Raises:
+        N/A
+
+    """
+    path = _cache_path(key)
+    try:
+        cache_file = open(path, 'r')
+    except IOError:
+        return None
+
+    # Reading counts as a use, so pruning leaves this entry for longer.
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+
+    def read_chunks():
+        """Yields each chunk, removing the entry if one can't be read"""
+        unreadable = False
+        with cache_file:
+            for line in cache_file:
+                try:
+                    rows = json.loads(line)
+                except ValueError:
+                    unreadable = True
+                    break
+                yield dict((int(row[0]), tuple(row[1:])) for row in rows)
+
+        if unreadable:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    return read_chunks()
+
+# =============================================================================
+
+
+def _record_source(node, role, record):
+    """Records what an output node was generated from on a hidden knob
+
+    The knob holds a record per view the node was keyed for. Recording a
+    view replaces any earlier record of that view, and leaves the others.
+
+    Args:
+        node : (<nuke.Node>)
+            The output node created by `card_to_track`.
+
+        role : (str)
+            What the node is: 'tracker', 'corner_pin', 'corner_matrix' or
+            'roto'.
+
+        record : {str: any}
+            The source record as returned by `_source_record`.
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    records = [dict(record, role=role)]
+
+    if SOURCE_KNOB not in node.knobs():
+        source_knob = nuke.String_Knob(SOURCE_KNOB, 'CardToTrack Source')
+        source_knob.setFlag(nuke.INVISIBLE)
+        node.addKnob(source_knob)
+    elif node[SOURCE_KNOB].value():
+        records.extend(
+            old for old in json.loads(node[SOURCE_KNOB].value())
+            if old['view'] != record['view']
+        )
+
+    node[SOURCE_KNOB].setValue(
+        json.dumps(sorted(records, key=lambda old: old['view']))
+    )
+
+# =============================================================================
+
+
+def _refresh_outputs(outputs):
+    """Recomputes the frames of a single run's outputs whose inputs changed
+
+    Args:
+        outputs : [(<nuke.Node>, {str: any})]
+            Output nodes generated from the same card, camera, background,
+            frame range, reference frame and view, paired with their source
+            record of that view.
+
+    Returns:
+        (int)
+            The number of frames that were recomputed.
+
+    Raises:
+        N/A
+
+    """
+    record = outputs[0][1]
+
+    card = nuke.toNode(record['card'])
+    camera = nuke.toNode(record['camera'])
+    background = nuke.toNode(record['background'])
+    if not card or not camera or not background:
+        nuke.message(
+            "Could not find {card}, {camera} and {background}, which "
+            "{outputs} were generated from. Run CardToTrack again "
+            "instead.".format(
+                card=record['card'],
+                camera=record['camera'],
+                background=record['background'],
+                outputs=', '.join([node.name() for node, _ in outputs])
+            )
+        )
+        return 0
+
+    ref_frame = record['ref_frame']
+    translate_only = record['translate_only']
+    view = record['view']
+    frames = range(record['first'], record['last'] + 1, record['step'])
+
+    # Views tracked along with others were projected in python and keyed on
+    # their own split, the rest were evaluated through Reconcile3D nodes.
+    split_view = view if record['split'] else None
+
+    def point_chunks(frames, task=None):
+        """Yields points a chunk at a time, evaluated as they were created"""
+        if split_view:
+            return (
+                points[view] for points in _view_chunks(
+                    card, {view: camera}, background, frames,
+                    translate_only, task=task
+                )
+            )
+        return _point_chunks(
+            card, camera, background, frames, translate_only, task=task,
+            view=view
+        )
+
+    static = _static_signature(card, background)
+    signatures = _chunk_signatures(card, camera, frames)
+    ref_signature = _chunk_signatures(card, camera, [ref_frame])[0]
+
+    dirty = set()
+    ref_changed = False
+    for node, node_record in outputs:
+        if node_record['static'] != static:
+            dirty.update(frames)
+            ref_changed = True
+            continue
+        if node_record['ref_signature'] != ref_signature:
+            ref_changed = True
+        for chunk, old, new in zip(
+                _frame_chunks(frames), node_record['signatures'], signatures):
+            if old != new:
+                dirty.update(chunk)
+
+    roles = set([node_record['role'] for _, node_record in outputs])
+    if ref_changed and roles.intersection(['corner_matrix', 'roto']):
+        # Our matrices are relative to the reference frame, so every frame
+        # of them changes along with it.
+        dirty.update(frames)
+
+    if dirty or ref_changed:
+        ref_points = None
+        if not translate_only:
+            ref_points = next(point_chunks([ref_frame]))[ref_frame]
+            for node, node_record in outputs:
+                if node_record['role'] == 'corner_pin':
+                    _set_ref_points(node, ref_points, split_view)
+
+        keyed = [(node, node_record['role']) for node, node_record in outputs]
+        task = nuke.ProgressTask("Refreshing CardToTrack")
+        for points in point_chunks(sorted(dirty), task):
+            _key_outputs(keyed, points, ref_points, view=split_view)
+        cancelled = task.isCancelled()
+        del task
+
+        if cancelled:
+            # Leave the old record, so the next refresh redoes these frames.
+            return 0
+
+    # Our outputs now match the current state of the card and camera.
+    new_record = dict(
+        record,
+        static=static,
+        signatures=signatures,
+        ref_signature=ref_signature
+    )
+    for node, node_record in outputs:
+        _record_source(node, node_record['role'], new_record)
+
+    return len(dirty)
+
+# =============================================================================
+
+
+def _set_keys(knob, points, index, replace=True, view=None):
+    """Keys an XY knob with one projected point across every frame
+
+    Rather than setting a value per frame, all of the keys for each curve are
+    added in a single call.
+
+    Args:
+        knob : (<nuke.XY_Knob>)
+            The knob to key.
+
+        points : {int: (float, ...)}
+            Projected points as returned by `_evaluate_points`.
+
+        index : (int)
+            The index of the x value of the point within each frame's values.
+            The y value must directly follow it.
+
+        replace=True : (bool)
+            If True, any existing animation is replaced. Otherwise only the
+            keys at the frames in points are replaced.
+
+        view=None : (str)
+            If given, the knob is split off for this view and only that
+            view is keyed.
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    frames = sorted(points)
+    for i in xrange(2):
+        _key_curve(
+            knob, index=i,
+            keys=[(frame, points[frame][index + i]) for frame in frames],
+            replace=replace,
+            view=view
+        )
+
+# =============================================================================
+
+
+def _set_ref_points(corner_pin, ref_points, view=None):
+    """Sets a CornerPin's 'from' knobs to the corners at the reference frame
+
+    Args:
+        corner_pin : (<nuke.nodes.CornerPin2D>)
+            The corner pin to set.
+
+        ref_points : (float, ...)
+            The projected corners at the reference frame.
+
+        view=None : (str)
+            If given, the knobs are split off for this view and only that
+            view is set.
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    view_args = (view,) if view else ()
+
+    for i in xrange(4):
+        from_knob = corner_pin['from{0}'.format(i + 1)]
+        if view:
+            from_knob.splitView(view)
+        for j, value in enumerate(ref_points[i * 2:i * 2 + 2]):
+            from_knob.setValue(value, j, *view_args)
+
+# =============================================================================
+
+
+def _source_record(card, camera, background, frange, ref_frame,
+                   translate_only, view=None, split=False):
+    """Builds the record of what a card_to_track run was generated from
+
+    Args:
+        card : (<nuke.nodes.Card2>)
+            The card being tracked.
+
+        camera : (<nuke.nodes.Camera2>)
+            The camera the card is being tracked through.
+
+        background : (<nuke.Node>)
+            The image node providing the format.
+
+        frange : (<nuke.FrameRange>)
+            The frame range being evaluated.
+
+        ref_frame : (int)
+            The reference frame of the corner pins and matrices.
+
+        translate_only : (bool)
+            If only the card's center is being tracked.
+
+        view=None : (str)
+            The view being tracked, if one was chosen.
+
+        split=False : (bool)
+            If the view was projected in python along with other views, and
+            keyed on its own split of the knobs.
+
+    Returns:
+        {str: any}
+            A json serializable dictionary of the node names, the range with
+            its step, the view and the signature of every chunk of frames.
+
+    Raises:
+        N/A
+
+    """
+    return {
+        'version': CACHE_VERSION,
+        'card': card.fullName(),
+        'camera': camera.fullName(),
+        'background': background.fullName(),
+        'first': frange.first(),
+        'last': frange.last(),
+        'step': frange.increment(),
+        'ref_frame': ref_frame,
+        'translate_only': translate_only,
+        'view': view,
+        'split': split,
+        'static': _static_signature(card, background),
+        'signatures': _chunk_signatures(card, camera, frange),
+        'ref_signature': _chunk_signatures(card, camera, [ref_frame])[0],
+    }
+
+# =============================================================================
+
+
+def _static_signature(card, background):
+    """Returns a signature of the inputs which aren't evaluated per frame"""
+    bg_format = background.format()
+
+    return repr(
+        (
+            CACHE_VERSION,
+            card.width(),
+            card.height(),
+            bg_format.width(),
+            bg_format.height(),
+            bg_format.pixelAspect(),
+        )
+    )
+
+# =============================================================================
+
+
+def _tracker_script(tracks, translate_only=False):
+    """Serializes any number of tracks into a Tracker4 `tracks` knob script
+
+    The script holds the whole table, a header of the `TRACKS_COLUMNS`
+    followed by a row per track, so every track is read onto the node by a
+    single `readKnobs` call.
+
+    Args:
+        tracks : [{int: (float, float)}]
+            The x and y position of each track, by frame. An empty track
+            gets a disabled row, keeping the rows in the order given.
+
+        translate_only=False (bool)
+            If True, each track only affects translation, not rotation or
+            scale.
+
+    Returns:
+        (str)
+            The knob script of the `tracks` knob, ready to be read in by a
+            single `readKnobs` call.
+
+    Raises:
+        N/A
+
+    """
+    rows = []
+    for i, track in enumerate(tracks):
+        if track:
+            frames = sorted(track)
+            cells = [
+                '1',
+                _curve_script([(frame, track[frame][0]) for frame in frames]),
+                _curve_script([(frame, track[frame][1]) for frame in frames]),
+                '0 0',
+                '1 0 0' if translate_only else '1 1 1',
+            ]
+        else:
+            cells = ['0', '0', '0', '0 0', '0 0 0']
+
+        # Name, then error, pattern and search boxes, and the unused keys.
+        cells.insert(1, '"track {0}"'.format(i + 1))
+        cells.append('0 0 0 -15 -15 15 15 -32 -32 32 32')
+        cells.append(' '.join(['{}'] * 11))
+
+        rows.append(' {{ {0} }}'.format(' '.join(cells)))
+
+    header = '{{ 1 {columns} {rows} }}'.format(
+        columns=len(TRACKS_COLUMNS),
+        rows=len(rows)
+    )
+    columns = '\n'.join(
+        ['{{ {0} {1} {2} {3} {4} 1 }}'.format(*column)
+         for column in TRACKS_COLUMNS]
+    )
+
+    return 'tracks {{ {header}\n{{ {columns}\n}}\n{{\n{rows}\n}}\n}}'.format(
+        header=header,
+        columns=columns,
+        rows='\n'.join(rows)
+    )
+
+# =============================================================================
+
+
+def _view_chunks(card, cameras, background, frames, translate_only=False,
+                 task=None, cached=None):
+    """Yields the projected points of several views a chunk of frames at a time
+
+    Views without cached points are projected together by `_project_card`,
+    so the card is only read once per frame however many views there are.
+
+    Args:
+        card : (<nuke.nodes.Card2>)
+            The card whose corners we wish to track.
+
+        cameras : {str: <nuke.nodes.Camera2>}
+            The camera to project each view through.
+
+        background : (<nuke.Node>)
+            An image type background we can use to determine the format.
+
+        frames : (<nuke.FrameRange>|[int])
+            The frames to project.
+
+        translate_only=False : (bool)
+            If True, only the center of the card is projected.
+
+        task=None : (<nuke.ProgressTask>)
+            Reports progress and is checked for cancellation per chunk.
+
+        cached=None : {str: iter}
+            Chunks of previously projected points for any of the views, as
+            yielded by `_read_point_cache`, to read from instead of
+            projecting. A view whose chunks run out or don't line up with
+            ours is projected for the remaining chunks.
+
+    Yields:
+        {str: {int: (float, ...)}}
+            For each view, projected points as returned by
+            `_evaluate_points`, for the next `CHUNK_SIZE` frames.
+
+    Raises:
+        N/A
+
+    """
+    cached = dict(cached or {})
+
+    try:
+        for chunk in _frame_chunks(frames, task):
+            points = {}
+            for view in sorted(cached):
+                view_points = next(cached[view], None)
+                if view_points is None or sorted(view_points) != chunk:
+                    cached.pop(view).close()
+                else:
+                    points[view] = view_points
+
+            projected = dict(
+                (view, camera) for view, camera in cameras.items()
+                if view not in points
+            )
+            if projected:
+                for view in projected:
+                    points[view] = {}
+                for frame, values in _project_card(
+                        card, projected, background, chunk, translate_only):
+                    for view in projected:
+                        points[view][frame] = values[view]
+
+            yield points
+    finally:
+        # Entries left unread are closed rather than left open.
+        for view_cached in cached.values():
+            view_cached.close()
+
+# =============================================================================
+
+
+def _write_rows(rows, path, columns, task=None):
+    """Writes rows to a .csv or binary file as they're generated
+
+    A .csv file starts with a header of the column names. A .bin file starts
+    with `EXPORT_MAGIC`, the number of columns as a little endian unsigned
+    short, and the comma separated column names prefixed with their length
+    as a little endian unsigned int. After that, each row is packed as
+    little endian 32 bit floats.
+
+    Rows are written to a temporary file next to path, which only replaces
+    path once every row has gone through, so a cancelled or failed export
+    never leaves a partial file behind or clobbers an existing one.
+
+    Args:
+        rows : (iter)
+            The rows to write, each a list of floats.
+
+        path : (str)
+            The file to write, whose extension picks the format.
+
+        columns : [str]
+            The name of each column.
+
+        task=None : (<nuke.ProgressTask>)
+            If given and cancelled once rows runs out, path isn't written.
+
+    Returns:
+        (int)
+            The number of rows written.
+
+    Raises:
+        ValueError
+            If path doesn't end in one of `EXPORT_FORMATS`.
+
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(
+            "Can't export to '{path}', the file extension must be one of: "
+            "{formats}".format(path=path, formats=', '.join(EXPORT_FORMATS))
+        )
+
+    temp_path = path + '.tmp'
+
+    count = 0
+    complete = False
+    try:
+        with open(temp_path, 'wb') as export_file:
+            if extension == '.csv':
+                writer = csv.writer(export_file)
+                writer.writerow(columns)
+                for row in rows:
+                    writer.writerow(row)
+                    count += 1
+            else:
+                names = ','.join(columns)
+                export_file.write(
+                    struct.pack('<4sH', EXPORT_MAGIC, len(columns)) +
+                    struct.pack('<I', len(names)) +
+                    names
+                )
+                row_struct = struct.Struct('<{0}f'.format(len(columns)))
+                for row in rows:
+                    export_file.write(row_struct.pack(*row))
+                    count += 1
+        complete = not task or not task.isCancelled()
+    finally:
+        if complete:
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(temp_path, path)
+        elif os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return count
+
+# =============================================================================
+# PUBLIC FUNCTIONS
+# =============================================================================
+
+
+def card_to_track(card, camera, background, use_cache=True):
+    """Takes the corners of a card and convert it to a variety of 2D outputs
+
+    If the script has more than one view, a single chosen view is evaluated
+    as that view. When more than one is chosen, they're tracked in the same
+    pass by `_card_to_track_views`, and the outputs are keyed with a split
+    for each view.
+
+    Args:
+        card : (<nuke.nodes.Card2>)
+            The card whose corners we wish to track.
+
+        camera : (<nuke.nodes.Camera2>|{str: <nuke.nodes.Camera2>})
+            The camera with the motion we want to track the card through.
+            For stereo rigs built from separate cameras, a dictionary of the
+            camera to use for each view.
+
+        background : (<nuke.Node>)
+            An image type background we can use to determine the format
+            for the trackers.
+
+        use_cache=True : (bool)
+            If True, previously evaluated corner positions for the exact same
+            card, camera, background format and frame range are read from
+            `CACHE_DIR` instead of being evaluated again, and newly evaluated
+            positions are written there. Each view is cached on its own.
+
+    Returns:
+        (<nuke.nodes.Tracker3>|<nuke.nodes.CornerPin2D>|<nuke.nodes.Roto>)
+            The selected node types (or all) will be returned.
+
+    Raises:
+        N/A
+
+    """
+
+    # Open a panel to grab our required settings and return a dictionary.
+    settings = _card_to_track_panel()
+    if not settings:  # If panel canceled, we'll cancel.
+        return
+
+    # Turn our frame range into a nuke.FrameRange object we can iterate over.
+    frange = nuke.FrameRange(settings['frange'])
+    translate_only = settings['axis']
+
+    views = settings['views']
+    if isinstance(camera, dict):
+        views = [view for view in views if view in camera] or sorted(camera)
+        cameras = dict((view, camera[view]) for view in views)
+        camera = cameras[views[0]]
+    else:
+        cameras = dict((view, camera) for view in views)
+
+    # Reconcile3D nodes evaluate a single view, so several chosen views are
+    # projected together in python instead.
+    if len(cameras) > 1:
+        return _card_to_track_views(
+            card, cameras, background, frange, settings, use_cache
+        )
+    view = views[0] if views else None
+
+    # Card values
+    card_pos_x = card['xpos'].value()
+    card_pos_y = card['ypos'].value()
+    card_label = card['label'].value()
+
+    ref_frame = settings['ref_frame']
+
+    # Grab the projected points from our cache if we've evaluated these
+    # exact inputs before, otherwise they're evaluated as we go.
+    cached = None
+    if use_cache:
+        cache_key = _cache_key(
+            card, camera, background, frange, translate_only, view
+        )
+        cached = _read_point_cache(cache_key)
+
+    # Corner pins and matrices are all relative to the reference frame.
+    ref_points = None
+    if not translate_only:
+        ref_chunks = _read_point_cache(cache_key) if cached else None
+        if ref_chunks is not None:
+            # Stopping at the reference frame leaves the entry open, so it's
+            # closed rather than left to the garbage collector.
+            with contextlib.closing(ref_chunks):
+                for points in ref_chunks:
+                    if ref_frame in points:
+                        ref_points = points[ref_frame]
+                        break
+        if ref_points is None:
+            ref_points = _evaluate_points(
+                card, camera, background, [(ref_frame, ref_frame)],
+                view=view
+            )[ref_frame]
+
+    # Only the requested outputs are built, and they're keyed directly from
+    # the projected points rather than from each other.
+    if translate_only:
+        roles = ['tracker']
+        offsets = {'tracker': 0}
+    else:
+        roles = OUTPUT_ROLES[settings['output']]
+        offsets = OUTPUT_OFFSETS
+
+    outputs = [
+        (
+            _create_output(
+                role,
+                pos=(card_pos_x + offsets[role], card_pos_y + 60),
+                label=card_label,
+                ref_frame=ref_frame,
+                ref_points=ref_points,
+                translate_only=translate_only
+            ),
+            role
+        ) for role in roles
+    ]
+
+    # Points are evaluated and keyed a chunk of frames at a time, so memory
+    # use doesn't grow with the length of the range.
+    task = nuke.ProgressTask("CardToTrack")
+    chunks = _point_chunks(
+        card, camera, background, frange, translate_only, task=task,
+        cached=cached, view=view
+    )
+    if use_cache and cached is None:
+        chunks = _cache_points(cache_key, chunks, task)
+
+    for i, points in enumerate(chunks):
+        _key_outputs(outputs, points, ref_points, replace=not i)
+
+    cancelled = task.isCancelled()
+    del task
+
+    if cancelled:
+        for node, _ in outputs:
+            nuke.delete(node)
+        return
+
+    # Every output records what it was generated from, so that it can be
+    # refreshed later with `refresh_outputs`.
+    source = _source_record(
+        card, camera, background, frange, ref_frame, translate_only, view
+    )
+    for node, role in outputs:
+        _record_source(node, role, source)
+
+    if len(outputs) == 1:
+        return outputs[0][0]
+
+    # Only output left is 'All'
+    return tuple(node for node, _ in outputs)
+
+# =============================================================================
+
+
+def card_to_track_wrapper():
+    """A wrapper for card_to_track that handles node selection
+
+    Args:
+        N/A
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    # Grab our selected nodes, there should only be three and we'll iterate
     # over them to determine which is which.
     nodes = nuke.selectedNodes()
 
@@ -504,6 +2368,9 @@ def card_to_track_wrapper():
 def corner_pin_to_corner_matrix(corner_pin, frange, pos=None, label=None):
     """Transforms a CornerPin's to and from corners into a matrix
 
+    Frames are read and keyed `CHUNK_SIZE` at a time, with progress and
+    cancellation checked between chunks.
+
     Args:
         corner_pin : (<nuke.nodes.CornerPin2D>)
             The corner_pin node whose corners we want to create a
@@ -521,69 +2388,89 @@ def corner_pin_to_corner_matrix(corner_pin, frange, pos=None, label=None):
     Returns:
         (<nuke.nodes.CornerPin2D>)
             A corner pin node with the to/from values not set, but the
-            transformation matrix set.
+            transformation matrix set. None if cancelled.
 
     Raises:
         N/A
 
     """
-    # Create our camera matrix
-    to_matrix = nuke.math.Matrix4()
-    from_matrix = nuke.math.Matrix4()
+    corner_new = _create_output('corner_matrix', pos, label)
+
+    task = nuke.ProgressTask("CornerPin to Matrix")
+    for i, chunk in enumerate(_frame_chunks(frange, task)):
+        matrices = list(_corner_pin_matrices(corner_pin, chunk))
+        for index in xrange(16):
+            _key_curve(
+                corner_new['transform_matrix'], index,
+                [(frame, matrix[index]) for frame, matrix in matrices],
+                replace=not i
+            )
 
-    corner_new = nuke.nodes.CornerPin2D()
-    corner_new['transform_matrix'].setAnimated()
-    if pos:
-        corner_new['xpos'].setValue(pos[0])
-        corner_new['ypos'].setValue(pos[1])
-    corner_new['label'].setValue(
-        "{label}Matrix".format(
-            label=label if label else 'CornerPin'
-        )
-    )
+    if task.isCancelled():
+        nuke.delete(corner_new)
+        return
 
-    for frame in frange:
+    return corner_new
 
-        # We'll grab all of our current frame's corners using
-        # some list comprehensions.
-        to_corners = [
-            corner_pin[knob].valueAt(frame) for knob in [
-                'to1', 'to2', 'to3', 'to4'
-            ]
-        ]
-        # This will return a list with 4 elements, but those
-        # elements will be a tuple pair. We need to unpack the two
-        # members of each tuple into a flat list.
-        to_corners = [
-            value for values in to_corners for value in values
-        ]
+# =============================================================================
 
-        # Same as the above. We get a list with tuple elements, then
-        # unpack it into a flat list.
-        from_corners = [
-            corner_pin[knob].valueAt(frame) for knob in [
-                'from1', 'from2', 'from3', 'from4'
-            ]
-        ]
-        from_corners = [
-            value for values in from_corners for value in values
-        ]
 
-        # Pass our flat lists into the matrix methods.
-        to_matrix.mapUnitSquareToQuad(*to_corners)
-        from_matrix.mapUnitSquareToQuad(*from_corners)
+def export_corners(card, camera, background, frange, path, ref_frame=None):
+    """Streams the projected corners of a card straight to a file
 
-        corner_pin_matrix = to_matrix * from_matrix.inverse()
-        corner_pin_matrix.transpose()
+    No nodes are built. The corners are projected through the camera in
+    python, a chunk of frames at a time, and each frame is written out as
+    soon as it's projected, so the full range is never held in memory.
 
-        for i in xrange(16):
-            corner_new['transform_matrix'].setValueAt(
-                corner_pin_matrix[i],
-                frame,
-                i
-            )
+    Args:
+        card : (<nuke.nodes.Card2>)
+            The card whose corners we wish to export.
 
-    return corner_new
+        camera : (<nuke.nodes.Camera2>)
+            The camera to project the card through.
+
+        background : (<nuke.Node>)
+            An image type background we can use to determine the format.
+
+        frange : (<nuke.FrameRange>|[int])
+            The frames to export.
+
+        path : (str)
+            The file to write. The extension picks the format, which can be
+            '.csv' or '.bin'. See `_write_rows` for the layouts.
+
+        ref_frame=None : (int)
+            If given, the 16 values of the corner pin matrix relative to this
+            frame are written after the corners of each frame.
+
+    Returns:
+        (int)
+            The number of frames written. If cancelled, 0 is returned and
+            any existing file at path is left as it was.
+
+    Raises:
+        ValueError
+            If path doesn't end in one of `EXPORT_FORMATS`.
+
+    """
+    columns = ['frame'] + CORNER_COLUMNS
+    if ref_frame is not None:
+        columns += MATRIX_COLUMNS
+
+    task = nuke.ProgressTask("Exporting Corners")
+    task.setMessage(os.path.basename(path))
+
+    count = _write_rows(
+        _export_rows(card, camera, background, frange, ref_frame, task),
+        path,
+        columns,
+        task
+    )
+
+    if task.isCancelled():
+        return 0
+
+    return count
 
 # =============================================================================
 
@@ -591,6 +2478,9 @@ def corner_pin_to_corner_matrix(corner_pin, frange, pos=None, label=None):
 def matrix_to_roto_matrix(matrix, frange, pos=None, label=None):
     """Copies a transform matrix from a node to a roto node with a matrix
 
+    Frames are read and keyed `CHUNK_SIZE` at a time, with progress and
+    cancellation checked between chunks.
+
     Args:
         matrix : (<nuke.Node>)
             Any node with the 'transform_matrix' knob.
@@ -607,33 +2497,126 @@ def matrix_to_roto_matrix(matrix, frange, pos=None, label=None):
     Returns:
         (<nuke.nodes.Roto>)
             The resultant roto node with the transform matrix baked in.
+            None if cancelled.
 
     Raises:
         N/A
 
     """
-    roto = nuke.nodes.Roto()
-    if pos:
-        roto['xpos'].setValue(pos[0])
-        roto['ypos'].setValue(pos[1])
-    if label:
-        roto['label'].setValue(label)
+    roto = _create_output('roto', pos, label)
 
     transform = roto['curves'].rootLayer.getTransform()
+    matrix_curves = [
+        transform.getExtraMatrixAnimCurve(0, i) for i in xrange(16)
+    ]
+
+    task = nuke.ProgressTask("Matrix to Roto")
+    for chunk in _frame_chunks(frange, task):
+        for frame, values in _knob_matrices(matrix, chunk):
+            for matrix_curve, value in zip(matrix_curves, values):
+                matrix_curve.addKey(frame, value)
+
+    if task.isCancelled():
+        nuke.delete(roto)
+        return
+
+    return roto
 
-    for frame in frange:
+# =============================================================================
 
-        matrices = [
-            matrix['transform_matrix'].getValueAt(
-                frame, i
-            ) for i in xrange(16)
-        ]
 
-        for i, value in enumerate(matrices):
-            matrix_curve = transform.getExtraMatrixAnimCurve(0, i)
-            matrix_curve.addKey(frame, value)
+def points_to_tracks(points, camera, background, frange, pos=None,
+                     label=None):
+    """Projects many 3D points through a camera into 2D tracks
 
-    return roto
+    Unlike `reconcile_to_tracks`, no Reconcile3D nodes are built or executed.
+    At each frame, the camera is read once from the shared transform cache
+    and every point is projected through it together. Points behind the
+    camera or outside of the background's format are culled for that frame,
+    leaving a gap in their track. Points that are never visible keep an
+    empty, disabled track as a placeholder, so that point `i` is always
+    track `i + 1` of the tracker.
+
+    Args:
+        points : [<nuke.Node>|(float, float, float)]
+            Nodes with a `world_matrix` knob (such as Axis nodes), whose
+            world position will be tracked, and/or static world positions,
+            such as the points of a point cloud.
+
+        camera : (<nuke.nodes.Camera2>)
+            The camera to project the points through.
+
+        background : (<nuke.Node>)
+            An image type background we can use to determine the format
+            for the trackers.
+
+        frange : (<nuke.FrameRange>|[int])
+            The frames to track.
+
+        pos=None : (int, int)
+            Position to place the tracker.
+
+        label=None : (str)
+            What to label the tracker.
+
+    Returns:
+        <nuke.nodes.Tracker4>|None
+            A single Tracker node holding a track for each point, in the
+            order the points were given. None is returned if cancelled.
+
+    Raises:
+        N/A
+
+    """
+    bg_format = background.format()
+    image_format = (
+        bg_format.width(), bg_format.height(), bg_format.pixelAspect()
+    )
+
+    cache = transforms.get_cache()
+    cache.chain_hash(camera, refresh=True)
+
+    # Static positions are filled in once, node positions at every frame.
+    positions = []
+    nodes = []
+    for i, point in enumerate(points):
+        if isinstance(point, nuke.Node):
+            cache.chain_hash(point, refresh=True)
+            nodes.append((i, point))
+            positions.append(None)
+        else:
+            positions.append(tuple(point))
+
+    tracks = [{} for point in points]
+    frames = list(frange)
+
+    task = nuke.ProgressTask("Projecting Points")
+    task.setMessage(
+        "Projecting {count} points through {camera}".format(
+            count=len(positions),
+            camera=camera.name()
+        )
+    )
+
+    for i, frame in enumerate(frames):
+        if task.isCancelled():
+            return None
+        task.setProgress(int(i * 100 / len(frames)))
+
+        for index, node in nodes:
+            matrix = cache.world_matrix(node, frame)
+            positions[index] = (matrix[3], matrix[7], matrix[11])
+
+        projected = transforms.project_points(
+            camera, positions, frame, image_format
+        )
+        for track, point in zip(tracks, projected):
+            if point:
+                track[frame] = point
+
+    del task
+
+    return tracks_to_tracker(tracks, pos, label, translate_only=True)
 
 # =============================================================================
 
@@ -707,9 +2690,14 @@ def reconcile_to_corner(inputs, ref_frame, pos=None, label=None):
 def reconcile_to_tracks(inputs, pos=None, label=None, translate_only=False):
     """Creates a tracking node with track information from tracks
 
+    The output of each Reconcile3D is read by frame. Where only one of its x
+    and y curves has a key, the other is evaluated at that frame, and an
+    output without any animation is held with a single key at the current
+    frame.
+
     Args:
         inputs : [<nuke.nodes.Reconcile3D>]
-            A list of up to 4 Reconcile3D nodes to add trackers for.
+            The Reconcile3D nodes to add tracks for.
 
         pos=None : (int, int)
             Position to place returned tracker.
@@ -722,38 +2710,154 @@ def reconcile_to_tracks(inputs, pos=None, label=None, translate_only=False):
             rotation or sale.
 
     Returns:
-        (<nuke.nodes.Tracker3>)
+        (<nuke.nodes.Tracker4>)
             Tracker node with the input Reconcile3D tracks being the trackers.
 
     Raises:
-        ValueError
-            If tracks has more than 4 members.
+        N/A
 
     """
-    if len(inputs) > 4:
-        raise ValueError(
-            "reconcile_to_tracks takes at most 4 Reconcile3D nodes in the "
-            "'inputs' arg. Number of Reconcile3D nodes provided: "
-            "{tracks_length}".format(
-                tracks_length=len(inputs)
+    tracks = []
+    for reconcile in inputs:
+        output = reconcile['output']
+
+        # The x and y curves are read by frame, as they needn't be keyed on
+        # the same frames, or be animated at all.
+        curves = []
+        for index in xrange(2):
+            if output.isAnimated(index):
+                curves.append(
+                    dict(
+                        (key.x, key.y)
+                        for key in output.animation(index).keys()
+                    )
+                )
+            else:
+                curves.append(None)
+
+        frames = set()
+        for curve in curves:
+            if curve:
+                frames.update(curve)
+        if not frames:
+            # A static output holds its position with a single key.
+            frames = [nuke.frame()]
+
+        track = {}
+        for frame in frames:
+            values = []
+            for index, curve in enumerate(curves):
+                if curve is None:
+                    values.append(output.value(index))
+                elif frame in curve:
+                    values.append(curve[frame])
+                else:
+                    values.append(output.getValueAt(frame, index))
+            track[frame] = tuple(values)
+        tracks.append(track)
+
+    return tracks_to_tracker(tracks, pos, label, translate_only)
+
+# =============================================================================
+
+
+def refresh_outputs(nodes=None):
+    """Updates CardToTrack outputs to match changes to their card and camera
+
+    Every node created by `card_to_track` records the card, camera and
+    background each of its views was generated from, along with a signature
+    of the card and camera for each `CHUNK_SIZE` chunk of frames. Refreshing
+    compares those signatures against the current card and camera, then
+    evaluates and re-keys only the chunks that changed on the existing
+    Tracker, CornerPin and Roto nodes.
+
+    Outputs created by the same run are refreshed together, so the card is
+    only evaluated once per view for all of them.
+
+    Args:
+        nodes=None : [<nuke.Node>]
+            The output nodes to refresh. Nodes that weren't created by
+            `card_to_track` are ignored.
+
+            Default: nuke.selectedNodes()
+
+    Returns:
+        (int)
+            The number of frames that were recomputed.
+
+    Raises:
+        N/A
+
+    """
+    if nodes is None:
+        nodes = nuke.selectedNodes()
+
+    # Group our outputs by the run and view that created them.
+    runs = {}
+    for node in nodes:
+        if SOURCE_KNOB not in node.knobs():
+            continue
+        for record in json.loads(node[SOURCE_KNOB].value()):
+            run = tuple(
+                record[key] for key in [
+                    'card', 'camera', 'background', 'first', 'last', 'step',
+                    'ref_frame', 'translate_only', 'view', 'split'
+                ]
             )
+            runs.setdefault(run, []).append((node, record))
+
+    if not runs:
+        nuke.message(
+            "Please select one or more nodes created by CardToTrack to "
+            "refresh."
         )
+        return 0
+
+    return sum([_refresh_outputs(outputs) for outputs in runs.values()])
+
+# =============================================================================
+
+
+def tracks_to_tracker(tracks, pos=None, label=None, translate_only=False):
+    """Writes any number of tracks onto a single Tracker4 node in bulk
+
+    Rather than adding each track and keying it curve by curve, the per
+    frame positions of every track are serialized into the knob script of
+    the Tracker4's `tracks` table, which is read onto the node in one
+    `readKnobs` call.
+
+    Args:
+        tracks : [{int: (float, float)}]
+            The x and y position of each track, by frame. Tracks don't need
+            to share frames, and can have gaps. An empty track is kept as a
+            disabled placeholder.
 
-    tracker = nuke.nodes.Tracker3()
+        pos=None : (int, int)
+            Position to place the tracker.
+
+        label=None : (str)
+            What to label the node.
+
+        translate_only=False (bool)
+            If True, each track will be set only affect translation, not
+            rotation or sale.
+
+    Returns:
+        (<nuke.nodes.Tracker4>)
+            A Tracker node holding a track for each of the tracks, in the
+            order the tracks were given.
+
+    Raises:
+        N/A
+
+    """
+    tracker = nuke.nodes.Tracker4()
     if pos:
         tracker['xpos'].setValue(pos[0])
         tracker['ypos'].setValue(pos[1])
     if label:
         tracker['label'].setValue(label)
 
-    for i in xrange(len(inputs)):
-        enable_knob = 'enable{0}'.format(i + 1)
-        track_knob = 'track{0}'.format(i + 1)
-        use_knob = 'use_for{0}'.format(i + 1)
-
-        tracker[enable_knob].setValue(1)
-        tracker[track_knob].copyAnimations(inputs[i]['output'].animations())
-        if not translate_only:
-            tracker[use_knob].setValue(7)
+    tracker.readKnobs(_tracker_script(tracks, translate_only))
 
     return tracker
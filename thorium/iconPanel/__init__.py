@@ -15,14 +15,45 @@ see the an entry for every icon found.
 
 Entries are split into *External icons* and *Internal icons*. External icons
 can be found on disk in the `plugins/icons` folder, and mostly contain toolbar
-icons. Internal icons are built into Nuke, and aren't found on disk at all.
-
-Entries look like:
+icons, or in any other directory on the plugin path, such as facility or show
+icon directories. When an icon is in more than one of those, only the one Nuke
+actually uses is listed. Internal icons are built into Nuke, and aren't found
+on disk at all.
+
+Each tab shows a page of 30 icons at a time, drawn as a single grid of icons
+above their names. Pick another page from the 'Page' pulldown to browse the
+rest. Icons are only loaded once the panel is shown, so it opens just as
+quickly however many icons there are. Opening it again, even after closing
+it, brings back the same panel without scanning the icon folders again. Hit
+'Refresh' to pick up icons added to or removed from the icon folders since,
+which only updates the icons that changed.
+
+To find an icon by name, type part of it into the 'Search' tab and hit enter.
+Both external and internal icons are searched, with icons starting with the
+search listed first.
+
+The listing of each icon folder is kept in `~/.nuke/cache/iconPanel`, and only
+rescanned once the folder changes. Folders that do need scanning are scanned at
+the same time, which saves slow listings on network mounts.
+
+Building the panel with `IconPanel(grid=False)` gives every icon its own
+entry instead, which lets the text be selected and copied. Entries look like:
 ::
     icon_name ICON <knob text>
 
 You can then use this path for assigning external_icons to menus, panels, etc.
 
+If PySide is available, 'Universal Icons (Qt)' is also added to the panes
+menu. It shows every icon in a single scrolling grid with a search field, only
+loading the icons scrolled into view. Select icons and hit `Ctrl+C` (or right
+click and choose 'Copy Name') to copy their names to the clipboard.
+
+The first time it's opened, every icon thumbnail is packed into atlas pages
+of a fixed size, cached in `~/.nuke/cache/iconPanel` with a table of each
+icon's place in them, so later sessions load a few images rather than every
+icon file. The atlas is rebuilt whenever the icon index changes, and atlases
+unused for a month are pruned.
+
 ## Installation
 
 To install, simply ensure the 'iconPanel' directory is in your .nuke
@@ -36,7 +67,8 @@ Then, add the following lines to your 'menu.py' file:
 ## Public Functions
 
     run()
-        Adds the iconPanel panel to the Layout Menu
+        Adds the iconPanel panel to the Layout Menu, along with the Qt based
+        IconView if PySide is available.
 
 ## License
 
@@ -77,7 +109,16 @@ except ImportError:
     pass
 
 # animatedSnap3D Imports
-from .iconPanel import IconPanel
+from .iconPanel import IconIndex, IconPanel, get_icon_panel
+
+try:
+    from .iconView import (
+        IconAtlas, IconModel, IconView, get_icon_atlas, register_panel
+    )
+except ImportError:
+    # Without PySide, only the knob based IconPanel is available.
+    IconAtlas = IconModel = IconView = None
+    get_icon_atlas = register_panel = None
 
 # =============================================================================
 # GLOBALS
@@ -101,8 +142,14 @@ __url__ = "http://github.com/ThoriumGroup/iconPanel"
 # =============================================================================
 
 __all__ = [
+    'get_icon_atlas',
+    'get_icon_panel',
     'run',
-    'IconPanel'
+    'IconAtlas',
+    'IconIndex',
+    'IconModel',
+    'IconPanel',
+    'IconView',
 ]
 
 # =============================================================================
@@ -145,10 +192,14 @@ def run():
     pane_menu = nuke.menu('Pane')
     pane_menu.addCommand(
         'Universal Icons',
-        'iconPanel.IconPanel().addToPane()',
+        'iconPanel.get_icon_panel().addToPane()',
         index=_get_menu_item_index(pane_menu, 'Universal Icons'),
     )
     nukescripts.registerPanel(
         'com.thorium.iconPanel',
-        'iconPanel.IconPanel().addToPane()'
-    )
\ No newline at end of file
+        'iconPanel.get_icon_panel().addToPane()'
+    )
+
+    # The Qt IconView adds itself to the Pane menu when registered.
+    if register_panel:
+        register_panel()
\ No newline at end of file
@@ -9,10 +9,21 @@ in Nuke's icon folder.
 
 ## Classes
 
+    IconIndex
+        A prefix and substring search index over icon names.
+
     IconPanel
         This is the icon panel itself, it displays the icon name, the icon
         itself, and the path to the icon for use.
 
+## Public Functions
+
+    find_icon_paths()
+        Finds the path of every external icon on Nuke's plugin path.
+
+    get_icon_panel()
+        Returns the session's IconPanel, building it the first time.
+
 ## License
 
 The MIT License (MIT)
@@ -45,9 +56,20 @@ SOFTWARE.
 # =============================================================================
 
 # Standard Imports
+from bisect import bisect_left
 from fnmatch import fnmatch
+import json
+from multiprocessing.pool import ThreadPool
 import os
 
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
 # Nuke Imports
 try:
     import nuke
@@ -59,6 +81,23 @@ except ImportError:
 # GLOBALS
 # =============================================================================
 
+# Where the sorted listings of icon directories are kept between sessions.
+INDEX_PATH = os.path.join(
+    os.path.expanduser('~'), '.nuke', 'cache', 'iconPanel', 'index.json'
+)
+
+# Bump whenever the index layout changes.
+INDEX_VERSION = 1
+
+# The most icon directories scanned at once.
+SCAN_THREADS = 8
+
+# The session's IconPanel, built by `get_icon_panel()`
+_ICON_PANEL = None
+
+# How many icons make up each row of the html icon grid.
+GRID_COLUMNS = 3
+
 INTERNAL_ICONS = (
     'NukeApp.png', 'frame.png', 'SliderThumb.png', 'Eyedropper.png',
     'ArrowWhiteLeft.png', 'ArrowWhiteRight.png', 'arrow_left.png',
@@ -144,7 +183,10 @@ INTERNAL_ICONS = (
 # =============================================================================
 
 __all__ = [
-    'IconPanel'
+    'IconIndex',
+    'IconPanel',
+    'find_icon_paths',
+    'get_icon_panel',
 ]
 
 # =============================================================================
@@ -152,58 +194,333 @@ __all__ = [
 # =============================================================================
 
 
-def _find_files(directory, pattern):
-    """Searches a directory finding all files and dirs matching unix pattern.
+def _find_files_in(directories, pattern):
+    """Finds all files and dirs matching unix pattern in many directories.
+
+    Directories are statted, and scanned if their listing in the index is
+    stale, concurrently on a pool of up to `SCAN_THREADS` threads, so slow
+    network mounts are waited on together rather than one after another.
+    The index is read and written once for all of them.
+
+    Args:
+        directories : [str]
+            The directories to search in.
+
+        pattern : (str)
+            A unix style pattern to search for, as fnmatch takes, such as
+            `*.png`.
+
+    Returns:
+        {str: [str]}
+            The sorted names matching the pattern in each directory. A
+            directory that can't be read has an empty list.
+
+    Raises:
+        N/A
+
+    """
+    index = _read_index()
+
+    def listing(directory):
+        """Returns the index entry for directory, scanning it if stale"""
+        try:
+            mtime = os.stat(directory).st_mtime
+            entry = index.get(directory, {})
+            if (entry.get('mtime'), entry.get('pattern')) == (mtime, pattern):
+                return entry
+            files = _scan_files(directory, pattern)
+        except OSError:
+            return None
+
+        return {'mtime': mtime, 'pattern': pattern, 'files': files}
+
+    if len(directories) > 1:
+        pool = ThreadPool(min(SCAN_THREADS, len(directories)))
+        try:
+            entries = pool.map(listing, directories)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        entries = [listing(directory) for directory in directories]
+
+    files = {}
+    changed = False
+    for directory, entry in zip(directories, entries):
+        if entry is None:
+            files[directory] = []
+            continue
+        if index.get(directory) is not entry:
+            index[directory] = entry
+            changed = True
+        files[directory] = entry['files']
+
+    if changed:
+        _write_index(index)
+
+    return files
+
+# =============================================================================
+
+
+def _icon_directories():
+    """Returns every directory Nuke finds icons in, in search order
+
+    That's every directory on Nuke's plugin path, which includes the
+    `plugins/icons` folder next to the Nuke executable.
+
+    Args:
+        N/A
+
+    Returns:
+        [str]
+            The icon directories, in the order Nuke searches them.
+
+    Raises:
+        N/A
+
+    """
+    nuke_dir = os.path.split(nuke.EXE_PATH)[0]
+    directories = list(nuke.pluginPath())
+    directories.append(os.path.join(nuke_dir, 'plugins/icons'))
+
+    unique = []
+    seen = set()
+    for directory in directories:
+        key = os.path.normcase(os.path.normpath(directory))
+        if key not in seen:
+            seen.add(key)
+            unique.append(directory)
+
+    return unique
+
+# =============================================================================
+
+
+def _icon_name(icon):
+    """Returns the name of an icon, without its directory or extension"""
+    return os.path.splitext(icon.split('/')[-1])[0]
+
+# =============================================================================
+
+
+def _read_index():
+    """Reads the icon index, returning an empty one if it can't be read"""
+    try:
+        with open(INDEX_PATH, 'r') as index_file:
+            index = json.load(index_file)
+    except (IOError, ValueError):
+        return {}
+
+    if index.get('version') != INDEX_VERSION:
+        return {}
+
+    return index['directories']
+
+# =============================================================================
+
+
+def _scan_files(directory, pattern):
+    """Lists the files and dirs in directory matching unix pattern, sorted.
+
+    `os.scandir` (or the `scandir` backport) is used when available, falling
+    back to `os.listdir`.
 
     Args:
         directory : (str)
             The directory to search in.
 
-        patterns : (str)
-            A unix style pattern to search for. This should be the same style
-             of pattern that fnmatch or glob would take, and not regex.
+        pattern : (str)
+            A unix style pattern to search for, as fnmatch takes, such as
+            `*.png`.
 
     Returns:
         [str]
-            A list of file and directory names matching one of the patterns is
-            returned. The file names are relative to the directory we were
-            given.
+            The matching names, sorted case insensitively.
 
     Raises:
         N/A
 
     """
-    files = [item for item in os.listdir(directory) if fnmatch(item, pattern)]
+    if scandir:
+        names = [entry.name for entry in scandir(directory)]
+    else:
+        names = os.listdir(directory)
+
+    files = [name for name in names if fnmatch(name, pattern)]
     files.sort(key=lambda v: v.lower())
 
     return files
 
 # =============================================================================
+
+
+def _write_index(index):
+    """Writes the icon index. This is best effort, and will not raise.
+
+    The index is written to a temporary file of this process's own, which
+    then replaces the index, so a crash or another session writing at the
+    same time never leaves a truncated index behind.
+
+    """
+    temp_path = '{0}.{1}.tmp'.format(INDEX_PATH, os.getpid())
+    try:
+        index_dir = os.path.dirname(INDEX_PATH)
+        if not os.path.isdir(index_dir):
+            os.makedirs(index_dir)
+        with open(temp_path, 'w') as index_file:
+            json.dump(
+                {'version': INDEX_VERSION, 'directories': index}, index_file
+            )
+        try:
+            os.rename(temp_path, INDEX_PATH)
+        except OSError:
+            # Windows won't rename over an existing file.
+            os.remove(INDEX_PATH)
+            os.rename(temp_path, INDEX_PATH)
+    except (IOError, OSError):
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+# =============================================================================
 # CLASSES
 # =============================================================================
 
 
+class IconIndex(object):
+    """Finds icons by a prefix or a substring of their name
+
+    The index is built once, after which every search only touches the
+    icons that can possibly match. Names are kept sorted for prefix
+    lookups, and every 3 letter sequence (trigram) of every name points to
+    the icons containing it. Substring searches intersect the postings of
+    the query's trigrams and only check those few candidates.
+
+    Args:
+        icons : [(str, bool)]
+            Each icon filename paired with whether it uses html style.
+
+    """
+
+    def __init__(self, icons):
+        self.icons = list(icons)
+
+        names = [_icon_name(icon).lower() for icon, _ in self.icons]
+        self._names = names
+
+        self._prefixes = sorted((name, i) for i, name in enumerate(names))
+        self._sorted_names = [name for name, _ in self._prefixes]
+
+        self._trigrams = {}
+        for i, name in enumerate(names):
+            for trigram in set(name[j:j + 3] for j in xrange(len(name) - 2)):
+                self._trigrams.setdefault(trigram, set()).add(i)
+
+    # =========================================================================
+
+    def __len__(self):
+        return len(self.icons)
+
+    # =========================================================================
+
+    def _prefix_matches(self, query):
+        """Returns the indices of every name starting with query, sorted"""
+        matches = []
+        for i in xrange(
+                bisect_left(self._sorted_names, query),
+                len(self._sorted_names)):
+            name, index = self._prefixes[i]
+            if not name.startswith(query):
+                break
+            matches.append(index)
+
+        return matches
+
+    # =========================================================================
+
+    def search(self, query):
+        """Returns the icons whose name contains query
+
+        Args:
+            query : (str)
+                The text to search for, case insensitive.
+
+        Returns:
+            [(str, bool)]
+                The matching icons, as given. Icons whose name starts with
+                query come first, sorted by name, followed by the rest in the
+                order they were given. Queries shorter than 3 letters only
+                match the start of names.
+
+        Raises:
+            N/A
+
+        """
+        query = query.strip().lower()
+        if not query:
+            return list(self.icons)
+
+        matches = self._prefix_matches(query)
+
+        if len(query) >= 3:
+            postings = []
+            for trigram in set(query[j:j + 3] for j in xrange(len(query) - 2)):
+                if trigram not in self._trigrams:
+                    postings = []
+                    break
+                postings.append(self._trigrams[trigram])
+
+            if postings:
+                postings.sort(key=len)
+                candidates = postings[0].intersection(*postings[1:])
+                prefixed = set(matches)
+                matches.extend(
+                    i for i in sorted(candidates)
+                    if i not in prefixed and query in self._names[i]
+                )
+
+        return [self.icons[i] for i in matches]
+
+# =============================================================================
+
+
 class IconPanel(nukescripts.PythonPanel):
-    """Displays the icon names, icons, and their paths"""
+    """Displays the icon names, icons, and their paths
+
+    Args:
+        grid=True : (bool)
+            If True, each page of icons is drawn as a single html table in
+            one Text_Knob. Otherwise each icon gets its own String_Knob,
+            whose text can be selected and copied.
+
+    """
 
-    def __init__(self):
+    def __init__(self, grid=True):
         super(IconPanel, self).__init__(
             'Universal Icons',
             'com.thorium.IconPanel'
         )
 
-        self.external_icons = self.find_file_icons()
+        self.icon_paths = find_icon_paths()
+        self.external_icons = sorted(self.icon_paths, key=lambda v: v.lower())
         self.internal_icons = INTERNAL_ICONS
         self.batch = 30
+        self.grid = grid
+
+        # The icons of each list paired with whether they use html style,
+        # by the name of the list's knobs.
+        self.icon_lists = {}
 
         # We'll have two tabs up on top, one for External icons and one for
-        # internal Icons
-        # Inside each tab will be a bunch of subtabs, each containing about 30
-        # icons.
-        #
-        # We accomplish this nested tabbing by starting and ending tab groups.
-        # The top level tab group contains the External and Internal tabs,
-        # then within each tab we'll start and end another tab group.
+        # internal Icons.
+        # Inside each tab is a page selector and a page's worth of icon knobs
+        # (or a single grid knob), which are only filled in with icons once
+        # the panel is shown, and then refilled whenever another page is
+        # picked. Building the panel costs the same no matter how many icons
+        # there are.
+        self.addKnob(nuke.PyScript_Knob('refresh', 'Refresh'))
         self.addKnob(nuke.BeginTabGroup_Knob())
 
         # Build our external icons
@@ -211,18 +528,83 @@ class IconPanel(nukescripts.PythonPanel):
         self.build_icon_list(
             self.external_icons,
             html_style=False,
-            alpha_title=True
+            alpha_title=True,
+            name='external'
         )
 
         # Build our internal icons
         self.addKnob(nuke.Tab_Knob('internal_icons', 'Internal Icons'))
         self.build_icon_list(
             self.internal_icons,
-            html_style=True
+            html_style=True,
+            name='internal'
         )
 
+        # Search across both
+        self.addKnob(nuke.Tab_Knob('search_icons', 'Search'))
+        self.addKnob(nuke.String_Knob('search', 'Search'))
+        self.build_icon_list([], name='results')
+
         self.addKnob(nuke.EndTabGroup_Knob())
 
+        # Searched on every change to the search field, so it's only built
+        # again when the icons change.
+        self.search_index = IconIndex(
+            self.icon_lists['external'] + self.icon_lists['internal']
+        )
+
+    # =========================================================================
+
+    def _set_icon_knob(self, name, i, icon=None):
+        """Fills icon knob i of a list with icon, or hides it if None"""
+        icon_knob = self.knobs()['{0}_{1}'.format(name, i)]
+        if icon is None:
+            icon_knob.setVisible(False)
+            return
+
+        icon_string = self.build_icon_string(*icon)
+        icon_knob.setLabel(icon_string)
+        icon_knob.setValue(icon_string)
+        icon_knob.setVisible(True)
+
+    # =========================================================================
+
+    def build_icon_grid(self, icons):
+        """Builds an html table showing each icon above its name
+
+        Args:
+            icons : [(str, bool)]
+                Each icon filename paired with whether it uses html style.
+
+        Returns:
+            (str)
+                A table `GRID_COLUMNS` icons wide. External icons are linked
+                by their full path, as @ style can't be used within html.
+
+        Raises:
+            N/A
+
+        """
+        cells = []
+        for icon, html_style in icons:
+            if html_style:
+                src = ':qrc/images/' + icon
+            else:
+                src = self.icon_paths[icon].replace('\\', '/')
+            cells.append(
+                '<td align="center"><img src="{src}"><br>{name}</td>'.format(
+                    src=src,
+                    name=_icon_name(icon)
+                )
+            )
+
+        rows = [
+            '<tr>{0}</tr>'.format(''.join(cells[i:i + GRID_COLUMNS]))
+            for i in xrange(0, len(cells), GRID_COLUMNS)
+        ]
+
+        return '<table cellpadding="4">{0}</table>'.format(''.join(rows))
+
     # =========================================================================
 
     @staticmethod
@@ -248,7 +630,92 @@ class IconPanel(nukescripts.PythonPanel):
             N/A
 
         """
-        name = os.path.splitext(icon.split('/')[-1])[0]
+        icon_string = IconPanel.build_icon_string(icon, html_style, html_root)
+
+        icon_knob = nuke.String_Knob(icon, icon_string)
+        icon_knob.setValue(icon_string)
+
+        return icon_knob
+
+    # =========================================================================
+
+    def build_icon_list(self, icon_list, html_style=True, alpha_title=False,
+                        name='icons'):
+        """Builds a page selector and an empty page of icon or grid knobs
+
+        Args:
+            icon_list : [str]
+                The icon filenames to list.
+
+            html_style=True : (bool)
+                To use html <img src=""> code to link to the images, or use
+                @ to find relative images in Nuke's search path.
+
+            alpha_title=False : (bool)
+                If True, pages are titled by the first letters of their first
+                icon, otherwise by the index of their first icon.
+
+            name='icons' : (str)
+                Prefix for the names of the knobs of this list.
+
+        Returns:
+            None
+
+        Raises:
+            N/A
+
+        """
+        self.icon_lists[name] = [(icon, html_style) for icon in icon_list]
+
+        self.addKnob(
+            nuke.Enumeration_Knob(
+                '{0}_page'.format(name),
+                'Page',
+                self.build_page_titles(icon_list, alpha_title)
+            )
+        )
+
+        # The knobs are reused by every page, and stay hidden until they're
+        # filled.
+        if self.grid:
+            grid_knob = nuke.Text_Knob('{0}_grid'.format(name), '')
+            grid_knob.setFlag(nuke.STARTLINE)
+            grid_knob.setVisible(False)
+            self.addKnob(grid_knob)
+            return
+
+        for i in xrange(self.batch):
+            icon_knob = nuke.String_Knob('{0}_{1}'.format(name, i), '')
+            icon_knob.setFlag(nuke.STARTLINE)
+            icon_knob.setVisible(False)
+            self.addKnob(icon_knob)
+
+    # =========================================================================
+
+    @staticmethod
+    def build_icon_string(icon, html_style=True, html_root=None):
+        """Builds the label showing an icon's name and the icon itself
+
+        Args:
+            icon : (str)
+                The icon filename relative to the external_icons directory.
+
+            html_style=True : (bool)
+                To use html <img src=""> code to link to the image, or use
+                @ to find a relative image in Nuke's search path.
+
+            html_root=None : (str)
+                When using html style, the root to prepend to the icon.
+
+        Returns:
+            (str)
+                The icon's name followed by the icon.
+
+        Raises:
+            N/A
+
+        """
+        name = _icon_name(icon)
 
         # HTML style vs @ style:
         # HTML style is used to bring in images that are not in Nuke's search
@@ -268,40 +735,259 @@ class IconPanel(nukescripts.PythonPanel):
                 icon=icon
             )
 
-        icon_knob = nuke.String_Knob(icon, icon_string)
-        icon_knob.setValue(icon_string)
-
-        return icon_knob
+        return icon_string
 
     # =========================================================================
 
-    def build_icon_list(self, icon_list, html_style=True, alpha_title=False):
-        """Builds the panel list of icons"""
-        # Start our tab group
-        self.addKnob(nuke.BeginTabGroup_Knob())
+    def build_page_titles(self, icon_list, alpha_title=False):
+        """Titles every batch of icons for a page selector
 
-        # Add all of our child icon knobs and tabs
-        for i, icon in enumerate(icon_list):
-            # Every time we hit the batch limit, we'll be creating a new tab
-            counter = i % self.batch
-            if counter == 0:
-                tab_name = icon[:2].title() if alpha_title else str(i)
-                tab = nuke.Tab_Knob(tab_name, tab_name)
-                self.addKnob(tab)
+        Args:
+            icon_list : [str]
+                The icon filenames being paged.
 
-            icon_knob = self.build_icon_knob(icon, html_style)
-            self.addKnob(icon_knob)
+            alpha_title=False : (bool)
+                If True, pages are titled by the first letters of their first
+                icon, otherwise by the index of their first icon.
 
-        # End our tab group
-        self.addKnob(nuke.EndTabGroup_Knob())
+        Returns:
+            [str]
+                A unique title for each page.
+
+        Raises:
+            N/A
+
+        """
+        pages = []
+        for i in xrange(0, len(icon_list), self.batch):
+            title = icon_list[i][:2].title() if alpha_title else str(i)
+            pages.append(
+                '{page}. {title}'.format(page=len(pages) + 1, title=title)
+            )
+
+        return pages
 
     # =========================================================================
 
     @staticmethod
     def find_file_icons():
-        """Finds all the external_icons in the Nuke icon folder"""
-        nuke_dir = os.path.split(nuke.EXE_PATH)[0]
-        icon_path = os.path.join(nuke_dir, 'plugins/icons')
-        icons = _find_files(icon_path, '*.png')
+        """Finds all the external_icons on Nuke's plugin path
+
+        Every icon directory on the plugin path is searched. When the same
+        icon is found in more than one, only the first is listed, as that's
+        the one Nuke will use.
+
+        """
+        return sorted(find_icon_paths(), key=lambda v: v.lower())
+
+    # =========================================================================
+
+    def knobChanged(self, knob):
+        """Fills in the icon knobs when shown, or when a page is picked"""
+        if knob.name() == 'search':
+            self.search(knob.value())
+        elif knob.name() == 'refresh':
+            self.refresh()
+        elif knob.name() == 'showPanel':
+            for name in self.icon_lists:
+                self.show_page(name)
+        elif knob.name().endswith('_page'):
+            name = knob.name()[:-len('_page')]
+            if name in self.icon_lists:
+                self.show_page(name)
+
+    # =========================================================================
+
+    def refresh(self):
+        """Updates the external icons to match the icon directories
+
+        The icon directories are listed again, which only rescans those that
+        changed, and the new listing is diffed against the icons the panel
+        already has. If any were added or removed, the page titles are
+        updated and only the icon knobs of the shown page whose icon changed
+        are refilled, or the grid redrawn if any did. The page picked stays
+        picked, unless it no longer
+        exists. Search results are refreshed as well.
+
+        Args:
+            N/A
+
+        Returns:
+            (set, set)
+                The icons added and the icons removed.
+
+        Raises:
+            N/A
+
+        """
+        self.icon_paths = find_icon_paths()
+        external = sorted(self.icon_paths, key=lambda v: v.lower())
+        old_icons = set(icon for icon, _ in self.icon_lists['external'])
+        new_icons = set(external)
+        added = new_icons - old_icons
+        removed = old_icons - new_icons
+        if not added and not removed:
+            return added, removed
+
+        knobs = self.knobs()
+        page_knob = knobs['external_page']
+        page = int(page_knob.getValue())
+        start = page * self.batch
+        shown = self.icon_lists['external'][start:start + self.batch]
+
+        self.external_icons = external
+        self.icon_lists['external'] = [(icon, False) for icon in external]
+
+        titles = self.build_page_titles(external, alpha_title=True)
+        page_knob.setValues(titles)
+        page = min(page, max(len(titles) - 1, 0))
+        page_knob.setValue(page)
+        start = page * self.batch
+        showing = self.icon_lists['external'][start:start + self.batch]
+
+        if self.grid:
+            if showing != shown:
+                self.show_page('external', page)
+        else:
+            for i in xrange(self.batch):
+                old_icon = shown[i] if i < len(shown) else None
+                new_icon = showing[i] if i < len(showing) else None
+                if new_icon != old_icon:
+                    self._set_icon_knob('external', i, new_icon)
+
+        self.search_index = IconIndex(
+            self.icon_lists['external'] + self.icon_lists['internal']
+        )
+        if knobs['search'].value():
+            self.search(knobs['search'].value())
+
+        return added, removed
+
+    # =========================================================================
+
+    def search(self, query):
+        """Shows the icons matching query in the search results
+
+        The search index over every external and internal icon is built
+        with the panel, and only built again when `refresh` finds the icons
+        have changed. Only the page selector and the one page of result
+        knobs are updated.
+
+        Args:
+            query : (str)
+                The text to search icon names for.
+
+        Returns:
+            None
+
+        Raises:
+            N/A
+
+        """
+        results = self.search_index.search(query)
+
+        self.icon_lists['results'] = results
+        page_knob = self.knobs()['results_page']
+        page_knob.setValues(
+            self.build_page_titles([icon for icon, _ in results])
+        )
+        page_knob.setValue(0)
+        self.show_page('results', 0)
+
+    # =========================================================================
+
+    def show_page(self, name, page=None):
+        """Fills the icon knobs or grid of a list with one page of icons
+
+        Args:
+            name : (str)
+                The name the icon list was built with.
+
+            page=None : (int)
+                The index of the page to show.
+
+                Default: The page picked in the list's page selector.
+
+        Returns:
+            None
+
+        Raises:
+            N/A
+
+        """
+        if page is None:
+            page = int(self.knobs()['{0}_page'.format(name)].getValue())
+        start = page * self.batch
+        icons = self.icon_lists[name][start:start + self.batch]
+
+        if self.grid:
+            grid_knob = self.knobs()['{0}_grid'.format(name)]
+            grid_knob.setValue(self.build_icon_grid(icons))
+            grid_knob.setVisible(bool(icons))
+            return
+
+        for i in xrange(self.batch):
+            # The last page might not be full.
+            self._set_icon_knob(name, i, icons[i] if i < len(icons) else None)
+
+# =============================================================================
+# PUBLIC FUNCTIONS
+# =============================================================================
+
+
+def find_icon_paths():
+    """Finds the path of every external icon on Nuke's plugin path
+
+    Every icon directory on the plugin path is searched. When the same icon
+    is found in more than one, the first is used, as that's the one Nuke
+    will use.
+
+    Args:
+        N/A
+
+    Returns:
+        {str: str}
+            The full path of each icon, by its filename.
+
+    Raises:
+        N/A
+
+    """
+    directories = _icon_directories()
+    listings = _find_files_in(directories, '*.png')
+
+    paths = {}
+    for directory in directories:
+        for icon in listings[directory]:
+            if icon not in paths:
+                paths[icon] = os.path.join(directory, icon)
+
+    return paths
+
+# =============================================================================
+
+
+def get_icon_panel():
+    """Returns the session's IconPanel, building it the first time
+
+    The same panel is handed back for the rest of the session, whether it's
+    showing or was hidden, so showing it again never rescans the icon
+    directories or rebuilds its knobs. Only the panel's Refresh button goes
+    back to the icon index.
+
+    Args:
+        N/A
+
+    Returns:
+        (<IconPanel>)
+            The panel to add to a pane.
+
+    Raises:
+        N/A
+
+    """
+    global _ICON_PANEL
+    if _ICON_PANEL is None:
+        _ICON_PANEL = IconPanel()
 
-        return icons
+    return _ICON_PANEL
@@ -0,0 +1,644 @@
+#!/usr/bin/env python
+"""
+
+Icon View
+=========
+
+A Qt alternative to the IconPanel, which shows every icon in a single list
+view rather than building a knob per icon.
+
+Only the rows scrolled into view are ever asked for, and their pixmaps are
+loaded the first time they're shown, with the most recently shown kept in a
+bounded cache. Selected icon names can be copied to the clipboard.
+
+Rather than decoding every icon file on each open, the first open packs every
+icon thumbnail into atlas pages of a fixed size, cached in
+`~/.nuke/cache/iconPanel` along with a table of where each icon sits within
+them. Later opens read back those few pages and draw each icon from its cell.
+The atlas is rebuilt whenever the icon index changes, and atlases left unused
+for a month are pruned.
+
+## Classes
+
+    IconAtlas
+        Every icon thumbnail packed into cached image pages.
+
+    IconModel
+        A list model of icons, loading pixmaps on demand.
+
+    IconView
+        The widget itself, a search field above a list view of every
+        external and internal icon.
+
+## Public Functions
+
+    get_icon_atlas()
+        Returns the atlas of the given icon paths, loading or building it
+        once per session.
+
+    register_panel()
+        Registers the IconView as a dockable Nuke panel.
+
+## License
+
+The MIT License (MIT)
+
+iconPanel
+Copyright (c) 2010-2011 Frank Rueter
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Imports
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import time
+
+# Nuke Imports
+try:
+    import nuke
+    import nukescripts
+except ImportError:
+    pass
+
+# Qt Imports
+try:
+    from PySide2 import QtCore, QtGui, QtWidgets
+except ImportError:
+    # Older Nukes ship PySide, where the widgets still live in QtGui. If
+    # that's missing too, this module can't be used and the ImportError
+    # is left for the importer to handle.
+    from PySide import QtCore, QtGui
+    QtWidgets = QtGui
+
+# iconPanel Imports
+from .iconPanel import INDEX_PATH, INTERNAL_ICONS, IconIndex, find_icon_paths
+
+# =============================================================================
+# GLOBALS
+# =============================================================================
+
+# The width and height icons are shown at.
+ICON_SIZE = 32
+
+# The most pixmaps kept loaded at once.
+PIXMAP_CACHE_SIZE = 512
+
+# Where Nuke's built in icons live within its Qt resources.
+INTERNAL_ROOT = ':qrc/images/'
+
+# Where icon atlases are kept between sessions, alongside the icon index.
+ATLAS_DIR = os.path.dirname(INDEX_PATH)
+
+# Bump whenever the atlas layout changes.
+ATLAS_VERSION = 1
+
+# How many icons make up each row of an atlas page, and how many rows make up
+# a full page. Pages are never larger than this, however many icons there
+# are, while the last page only takes as many rows as it needs.
+ATLAS_COLUMNS = 64
+ATLAS_ROWS = 64
+
+# Atlases unused for this many seconds are pruned whenever a new one is
+# written. Other Nuke versions keep their own atlases alongside this one.
+ATLAS_MAX_AGE = 30 * 24 * 60 * 60
+
+# Atlases already loaded this session, by their key.
+_ATLASES = {}
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'IconAtlas',
+    'IconModel',
+    'IconView',
+    'get_icon_atlas',
+    'register_panel',
+]
+
+# =============================================================================
+# PRIVATE FUNCTIONS
+# =============================================================================
+
+
+def _atlas_key(paths):
+    """Returns the key of the atlas of paths
+
+    Besides the paths themselves, the key covers the Nuke version, as the
+    internal icons change between versions, and the modification time of
+    the icon index, which is only rewritten when an icon directory changes.
+
+    Args:
+        paths : [str]
+            The sorted file or Qt resource path of every icon in the atlas.
+
+    Returns:
+        (str)
+            A hex digest identifying the atlas.
+
+    Raises:
+        N/A
+
+    """
+    try:
+        index_mtime = os.path.getmtime(INDEX_PATH)
+    except OSError:
+        index_mtime = None
+
+    return hashlib.sha1(
+        json.dumps(
+            [
+                ATLAS_VERSION, ICON_SIZE, nuke.NUKE_VERSION_STRING,
+                index_mtime, paths
+            ]
+        )
+    ).hexdigest()
+
+# =============================================================================
+
+
+def _prune_atlases(keep):
+    """Removes the files of atlases that haven't been used in a while
+
+    Atlas files that haven't been used within `ATLAS_MAX_AGE` seconds are
+    removed. Reading an atlas counts as a use, so atlases still used by
+    other Nuke versions sharing `ATLAS_DIR` are left in place.
+
+    Pruning is best effort, failing to remove a file will not raise.
+
+    Args:
+        keep : (str)
+            The key of an atlas to never remove, such as the one just
+            written.
+
+    Returns:
+        (int)
+            The number of files removed.
+
+    Raises:
+        N/A
+
+    """
+    try:
+        names = os.listdir(ATLAS_DIR)
+    except OSError:
+        return 0
+
+    now = time.time()
+    removed = 0
+    for name in names:
+        if not name.startswith('atlas_') or name.startswith('atlas_' + keep):
+            continue
+
+        path = os.path.join(ATLAS_DIR, name)
+        try:
+            if now - os.path.getmtime(path) > ATLAS_MAX_AGE:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            continue
+
+    return removed
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class IconAtlas(object):
+    """Every icon thumbnail packed into cached image pages
+
+    Icons are scaled to fit within `ICON_SIZE` and laid out on pages of
+    `ATLAS_COLUMNS` by at most `ATLAS_ROWS` icons, with an offset table
+    giving the page and cell of each icon. The first time a set of icons is
+    packed, the pages and table are written to `ATLAS_DIR`, pruning atlases
+    left unused for `ATLAS_MAX_AGE`, and later sessions read them back
+    rather than decoding every icon again.
+
+    Args:
+        paths : [str]
+            The file or Qt resource path of every icon to pack.
+
+        key=None : (str)
+            The key of the atlas, if already known.
+
+            Default: Built from paths with `_atlas_key`.
+
+    """
+
+    def __init__(self, paths, key=None):
+        self.paths = sorted(set(paths))
+        self.key = key if key else _atlas_key(self.paths)
+        self.cells = {}
+        self.images = []
+
+        if not self._load():
+            self._build()
+            self._save()
+
+        # Cells are copied out of pixmaps, so nothing is converted per icon.
+        self._pixmaps = [
+            QtGui.QPixmap.fromImage(image) for image in self.images
+        ]
+
+    # =========================================================================
+
+    def _build(self):
+        """Decodes, scales and packs every icon into the atlas pages"""
+        page_size = ATLAS_COLUMNS * ATLAS_ROWS
+        # Even without icons, there's always a page to draw from.
+        for start in xrange(0, max(len(self.paths), 1), page_size):
+            paths = self.paths[start:start + page_size]
+            rows = max(1, -(-len(paths) // ATLAS_COLUMNS))
+            image = QtGui.QImage(
+                ATLAS_COLUMNS * ICON_SIZE, rows * ICON_SIZE,
+                QtGui.QImage.Format_ARGB32_Premultiplied
+            )
+            # Fully transparent, so icons smaller than a cell show nothing
+            # else.
+            image.fill(0)
+
+            page = len(self.images)
+            painter = QtGui.QPainter(image)
+            try:
+                for i, path in enumerate(paths):
+                    icon = QtGui.QImage(path)
+                    if icon.isNull():
+                        continue
+                    icon = icon.scaled(
+                        ICON_SIZE, ICON_SIZE,
+                        QtCore.Qt.KeepAspectRatio,
+                        QtCore.Qt.SmoothTransformation
+                    )
+                    x = (i % ATLAS_COLUMNS) * ICON_SIZE
+                    y = (i // ATLAS_COLUMNS) * ICON_SIZE
+                    painter.drawImage(x, y, icon)
+                    self.cells[path] = (
+                        page, x, y, icon.width(), icon.height()
+                    )
+            finally:
+                painter.end()
+
+            self.images.append(image)
+
+    # =========================================================================
+
+    def _file(self, suffix):
+        """Returns the path of the atlas file ending in suffix"""
+        return os.path.join(
+            ATLAS_DIR, 'atlas_{0}{1}'.format(self.key, suffix)
+        )
+
+    # =========================================================================
+
+    def _load(self):
+        """Reads the cached atlas, returning if it could be used"""
+        table_path = self._file('.json')
+        try:
+            with open(table_path, 'r') as table_file:
+                table = json.load(table_file)
+        except (IOError, OSError, ValueError):
+            return False
+
+        if table.get('version') != ATLAS_VERSION:
+            return False
+
+        image_paths = [
+            self._file('_{0}.png'.format(page))
+            for page in xrange(table['pages'])
+        ]
+        images = [QtGui.QImage(image_path) for image_path in image_paths]
+        if not images or any(image.isNull() for image in images):
+            return False
+
+        # Reading counts as a use, so pruning leaves this atlas in place.
+        for path in [table_path] + image_paths:
+            try:
+                os.utime(path, None)
+            except OSError:
+                pass
+
+        self.images = images
+        self.cells = dict(
+            (path, tuple(cell)) for path, cell in table['cells'].items()
+        )
+
+        return True
+
+    # =========================================================================
+
+    def _save(self):
+        """Writes the atlas, pruning unused ones. This will not raise."""
+        try:
+            if not os.path.isdir(ATLAS_DIR):
+                os.makedirs(ATLAS_DIR)
+
+            for page, image in enumerate(self.images):
+                if not image.save(self._file('_{0}.png'.format(page)), 'PNG'):
+                    return
+            # The table is written last, so an atlas is only ever read back
+            # once all of its pages are complete.
+            with open(self._file('.json'), 'w') as table_file:
+                json.dump(
+                    {
+                        'version': ATLAS_VERSION,
+                        'pages': len(self.images),
+                        'cells': self.cells,
+                    },
+                    table_file
+                )
+        except (IOError, OSError):
+            return
+
+        _prune_atlases(self.key)
+
+    # =========================================================================
+
+    def icon(self, path):
+        """Returns the thumbnail of path, or None if it isn't in the atlas
+
+        Args:
+            path : (str)
+                The file or Qt resource path of the icon.
+
+        Returns:
+            (<QtGui.QPixmap>|None)
+                The icon scaled to fit within `ICON_SIZE`.
+
+        Raises:
+            N/A
+
+        """
+        try:
+            cell = self.cells[path]
+        except KeyError:
+            return None
+
+        page, x, y, width, height = cell
+        return self._pixmaps[page].copy(QtCore.QRect(x, y, width, height))
+
+# =============================================================================
+
+
+class IconModel(QtCore.QAbstractListModel):
+    """A list model of icons, loading their pixmaps on demand
+
+    Views only ask a model for the rows they're showing, so pixmaps are only
+    loaded for icons that are scrolled into view. Loaded pixmaps are kept in
+    a least recently used cache of up to `PIXMAP_CACHE_SIZE` pixmaps.
+
+    Args:
+        icons : [(str, str)]
+            Each icon filename, as it would be given to Nuke, paired with
+            the path it's loaded from.
+
+        parent=None : (<QtCore.QObject>)
+            The Qt parent of the model.
+
+        atlas=None : (<IconAtlas>)
+            An atlas to draw icons from. Icons missing from it are loaded
+            from their own files.
+
+    """
+
+    def __init__(self, icons, parent=None, atlas=None):
+        super(IconModel, self).__init__(parent)
+        self.icons = list(icons)
+        self.atlas = atlas
+        self._pixmaps = OrderedDict()
+
+    # =========================================================================
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """Returns the name, path or pixmap of an icon"""
+        if not index.isValid():
+            return None
+
+        icon, path = self.icons[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return os.path.splitext(icon.split('/')[-1])[0]
+        elif role == QtCore.Qt.ToolTipRole:
+            return icon
+        elif role == QtCore.Qt.DecorationRole:
+            return self.pixmap(path)
+        elif role == QtCore.Qt.UserRole:
+            return icon
+
+        return None
+
+    # =========================================================================
+
+    def pixmap(self, path):
+        """Returns the pixmap for path, drawing and caching it if needed
+
+        Args:
+            path : (str)
+                The file or Qt resource path of the icon.
+
+        Returns:
+            (<QtGui.QPixmap>)
+                The icon scaled to fit within `ICON_SIZE`.
+
+        Raises:
+            N/A
+
+        """
+        try:
+            pixmap = self._pixmaps.pop(path)
+        except KeyError:
+            pixmap = self.atlas.icon(path) if self.atlas else None
+            if pixmap is None:
+                pixmap = QtGui.QPixmap(path)
+                if not pixmap.isNull():
+                    pixmap = pixmap.scaled(
+                        ICON_SIZE, ICON_SIZE,
+                        QtCore.Qt.KeepAspectRatio,
+                        QtCore.Qt.SmoothTransformation
+                    )
+            if len(self._pixmaps) >= PIXMAP_CACHE_SIZE:
+                self._pixmaps.popitem(last=False)
+
+        # Most recently used entries live at the end.
+        self._pixmaps[path] = pixmap
+
+        return pixmap
+
+    # =========================================================================
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """Returns the number of icons"""
+        if parent.isValid():
+            return 0
+
+        return len(self.icons)
+
+    # =========================================================================
+
+    def set_icons(self, icons):
+        """Replaces the icons shown, keeping any pixmaps already loaded"""
+        self.beginResetModel()
+        self.icons = list(icons)
+        self.endResetModel()
+
+# =============================================================================
+
+
+class IconView(QtWidgets.QWidget):
+    """Shows every external and internal icon in a searchable list view"""
+
+    def __init__(self, parent=None):
+        super(IconView, self).__init__(parent)
+
+        paths = find_icon_paths()
+        external = sorted(paths, key=lambda v: v.lower())
+
+        # The search index pairs icons with whether they're html style
+        # (internal), which we map back to the path to load them from.
+        self.all_icons = [(icon, False) for icon in external]
+        self.all_icons.extend((icon, True) for icon in INTERNAL_ICONS)
+        self.paths = dict(
+            ((icon, False), paths[icon]) for icon in external
+        )
+        self.paths.update(
+            ((icon, True), INTERNAL_ROOT + icon) for icon in INTERNAL_ICONS
+        )
+        # Built once here, as every keystroke in the search field searches.
+        self.index = IconIndex(self.all_icons)
+
+        self.search = QtWidgets.QLineEdit(self)
+        self.search.setPlaceholderText('Search')
+        self.search.textChanged.connect(self.filter_icons)
+
+        self.atlas = get_icon_atlas(self.paths.values())
+        self.model = IconModel(
+            self._model_icons(self.all_icons), self, self.atlas
+        )
+
+        self.view = QtWidgets.QListView(self)
+        self.view.setModel(self.model)
+        self.view.setViewMode(QtWidgets.QListView.IconMode)
+        self.view.setResizeMode(QtWidgets.QListView.Adjust)
+        self.view.setMovement(QtWidgets.QListView.Static)
+        self.view.setIconSize(QtCore.QSize(ICON_SIZE, ICON_SIZE))
+        self.view.setGridSize(QtCore.QSize(ICON_SIZE * 4, ICON_SIZE * 2))
+        self.view.setUniformItemSizes(True)
+        self.view.setLayoutMode(QtWidgets.QListView.Batched)
+        self.view.setSelectionMode(
+            QtWidgets.QAbstractItemView.ExtendedSelection
+        )
+        self.view.setContextMenuPolicy(QtCore.Qt.ActionsContextMenu)
+
+        copy_action = QtWidgets.QAction('Copy Name', self.view)
+        copy_action.setShortcut(QtGui.QKeySequence.Copy)
+        copy_action.setShortcutContext(QtCore.Qt.WidgetShortcut)
+        copy_action.triggered.connect(self.copy_names)
+        self.view.addAction(copy_action)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.search)
+        layout.addWidget(self.view)
+
+    # =========================================================================
+
+    def _model_icons(self, icons):
+        """Pairs search index icons with the path to load them from"""
+        return [(icon[0], self.paths[icon]) for icon in icons]
+
+    # =========================================================================
+
+    def copy_names(self):
+        """Copies the names of the selected icons to the clipboard
+
+        Names are copied as they would be given to Nuke, one per line.
+
+        """
+        names = [
+            index.data(QtCore.Qt.UserRole)
+            for index in sorted(
+                self.view.selectedIndexes(), key=lambda index: index.row()
+            )
+        ]
+        if names:
+            QtWidgets.QApplication.clipboard().setText('\n'.join(names))
+
+    # =========================================================================
+
+    def filter_icons(self, query):
+        """Shows only the icons whose name contains query"""
+        results = self.index.search(query)
+        self.model.set_icons(self._model_icons(results))
+
+# =============================================================================
+# PUBLIC FUNCTIONS
+# =============================================================================
+
+
+def get_icon_atlas(paths):
+    """Returns the atlas of paths, loading or building it once per session
+
+    Args:
+        paths : [str]
+            The file or Qt resource path of every icon to pack.
+
+    Returns:
+        (<IconAtlas>)
+            The atlas of paths, read from `ATLAS_DIR` if a current one was
+            cached there, otherwise built and written there.
+
+    Raises:
+        N/A
+
+    """
+    paths = sorted(set(paths))
+    key = _atlas_key(paths)
+    if key not in _ATLASES:
+        _ATLASES[key] = IconAtlas(paths, key)
+
+    return _ATLASES[key]
+
+# =============================================================================
+
+
+def register_panel():
+    """Registers the IconView as a dockable Nuke panel
+
+    Args:
+        N/A
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    nukescripts.panels.registerWidgetAsPanel(
+        'iconPanel.IconView',
+        'Universal Icons (Qt)',
+        'com.thorium.IconView'
+    )
@@ -46,6 +46,7 @@ except ImportError:
 
 # Local Imports
 from . import flags
+from . import transforms
 from .nodes import (allNodes, center_below, center_x, center_y,
                     connect_inline, node_height, node_width,
                     set_link, space_x, space_y)
@@ -69,4 +70,5 @@ __all__ = [
     'set_link',
     'space_x',
     'space_y',
+    'transforms',
 ]
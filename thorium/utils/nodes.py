@@ -102,14 +102,14 @@ __all__ = [
 # =============================================================================
 
 
-def allNodes(filter=None, group=nuke.root(), recurseGroups=False):
+def allNodes(filter=None, group=None, recurseGroups=False):
     """ Wraps nuke.allNodes to allow filtering and recursion.
 
     Args:
         filter=None : (str)
             A Nuke node name to filter for. Must be exact match.
 
-        group=nuke.root() : (<nuke.nodes.Group>)
+        group=None : (<nuke.nodes.Group>)
             A Nuke node of type `Group` to search within. If not provided, will
             begin the search at the root level.
 
@@ -124,6 +124,11 @@ def allNodes(filter=None, group=nuke.root(), recurseGroups=False):
         N/A
 
     """
+    # Resolved here rather than as the default value, so that this module
+    # can be imported outside of a Nuke session.
+    if group is None:
+        group = nuke.root()
+
     # First we'll check if we need to execute our custom allNodes function.
     # If we don't have a filter AND recurseGroups=True, `nuke.allNodes` will
     # do the job fine.
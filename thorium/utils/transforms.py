@@ -0,0 +1,847 @@
+#!/usr/bin/env python
+"""
+
+Thorium Utils Transforms
+========================
+
+A session wide, per-frame cache of world matrices and camera projection
+parameters for Nuke's 3D transform nodes (Axis, Camera, Card, etc).
+
+Tools that need to evaluate the same Camera and Axis chains at the same frames
+(cardToTrack, animatedSnap3D) can pull those values through this cache instead
+of asking Nuke to evaluate the node tree again.
+
+Cached values are keyed by the node, a hash of the node's knobs (including
+animation curves) along with the knobs of every transform node it's parented
+to, and the frame. Changing any knob on a transform node drops the memoized
+hashes and cached values of that node and of every node parented to it, and
+nothing else. Nodes are known by their full name, so renaming a transform node
+clears the whole cache, and deleting one drops its values.
+
+## Classes
+
+    TransformCache
+        A least recently used cache of per-frame world matrices and camera
+        projection parameters.
+
+## Public Functions
+
+    chain_hash()
+        Returns a hash of a transform node's knobs and those of its parents.
+
+    chain_signatures()
+        Returns a signature of a transform node and its parents over each of
+        many frame intervals, without evaluating them at any frame.
+
+    get_cache()
+        Returns the session's TransformCache, creating it if needed.
+
+    invalidate()
+        Invalidates cached values for a node, or for every node.
+
+    project_points()
+        Projects many world space points through a camera into pixel
+        coordinates, culling those behind the camera or off format.
+
+    projection()
+        Returns a camera's projection parameters at a frame.
+
+    to_parent_space()
+        Moves world space points into the space of whatever transform node a
+        node is parented to.
+
+    world_matrix()
+        Returns a transform node's world matrix at a frame.
+
+## License
+
+The MIT License (MIT)
+
+Thorium
+Copyright (c) 2014 Sean Wallitsch
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+
+"""
+
+# =============================================================================
+# IMPORTS
+# =============================================================================
+
+# Standard Imports
+import bisect
+from collections import OrderedDict
+import hashlib
+import math
+import re
+
+# Nuke Imports
+try:
+    import nuke
+except ImportError:
+    pass
+
+# =============================================================================
+# GLOBALS
+# =============================================================================
+
+# Node classes whose transforms are inherited by the nodes parented to them.
+# Only inputs of these classes are followed when hashing a parent chain.
+TRANSFORM_CLASSES = [
+    'Axis', 'Axis2', 'Axis3',
+    'Camera', 'Camera2', 'Camera3',
+    'Card', 'Card2', 'Card3D',
+    'Light', 'Light2', 'Light3',
+    'TransformGeo',
+]
+
+# Knobs that have no effect on a node's transform, and shouldn't invalidate
+# or change the hash of a transform chain.
+IGNORED_KNOBS = frozenset([
+    'gl_color', 'help', 'hide_input', 'indicators', 'label', 'name',
+    'note_font', 'note_font_color', 'note_font_size', 'selected', 'tile_color',
+    'xpos', 'ypos',
+])
+
+# Camera knobs that make up the projection, mapped to their array size.
+PROJECTION_KNOBS = {
+    'far': 1,
+    'focal': 1,
+    'haperture': 1,
+    'near': 1,
+    'vaperture': 1,
+    'win_scale': 2,
+    'win_translate': 2,
+    'winroll': 1,
+}
+
+# How many keys either side of a frame interval are signed along with the keys
+# inside it. Smooth interpolation takes the slope at a key from its neighbors,
+# so the curve within an interval is shaped by the 2 nearest keys outside it.
+CURVE_MARGIN = 2
+
+# Matches the body of an animation curve within a knob script.
+CURVE_RE = re.compile(r'\{curve[^}]*\}')
+
+# The default number of cached values kept before the least recently used
+# are evicted. A world matrix entry is 16 floats, so this caps the cache at
+# a few megabytes.
+MAX_ENTRIES = 20000
+
+# The session's TransformCache, created by `get_cache()`
+_CACHE = None
+
+# =============================================================================
+# EXPORTS
+# =============================================================================
+
+__all__ = [
+    'chain_hash',
+    'chain_signatures',
+    'get_cache',
+    'invalidate',
+    'project_points',
+    'projection',
+    'to_parent_space',
+    'TransformCache',
+    'world_matrix',
+]
+
+# =============================================================================
+# PRIVATE FUNCTIONS
+# =============================================================================
+
+
+def _evaluate_projection(camera, frame, view=None):
+    """Reads the projection knobs of a camera at a frame"""
+    view_args = (view,) if view else ()
+
+    values = {}
+    for knob, size in PROJECTION_KNOBS.items():
+        if size == 1:
+            values[knob] = camera[knob].getValueAt(frame, 0, *view_args)
+        else:
+            values[knob] = tuple(
+                camera[knob].getValueAt(frame, i, *view_args)
+                for i in xrange(size)
+            )
+
+    return values
+
+# =============================================================================
+
+
+def _evaluate_world_matrix(node, frame, view=None):
+    """Reads the world matrix of a node at a frame"""
+    view_args = (view,) if view else ()
+
+    return tuple(
+        node['world_matrix'].getValueAt(frame, i, *view_args)
+        for i in xrange(16)
+    )
+
+# =============================================================================
+
+
+def _invert_matrix(matrix):
+    """Inverts a 4x4 matrix given as 16 row major values
+
+    Args:
+        matrix : (float, ...)
+            The 16 values of the matrix to invert.
+
+    Returns:
+        [float]
+            The 16 row major values of the inverted matrix.
+
+    Raises:
+        ValueError
+            If the matrix is singular.
+
+    """
+    # Gauss-Jordan elimination on the matrix augmented with the identity.
+    rows = [
+        list(matrix[row * 4:row * 4 + 4]) +
+        [1.0 if col == row else 0.0 for col in xrange(4)]
+        for row in xrange(4)
+    ]
+
+    for col in xrange(4):
+        pivot = max(xrange(col, 4), key=lambda row: abs(rows[row][col]))
+        if abs(rows[pivot][col]) < 1e-12:
+            raise ValueError("Cannot invert a singular matrix.")
+        rows[col], rows[pivot] = rows[pivot], rows[col]
+
+        scale = 1.0 / rows[col][col]
+        rows[col] = [value * scale for value in rows[col]]
+
+        for row in xrange(4):
+            if row != col and rows[row][col]:
+                factor = rows[row][col]
+                rows[row] = [
+                    value - factor * pivot_value
+                    for value, pivot_value in zip(rows[row], rows[col])
+                ]
+
+    return [value for row in rows for value in row[4:]]
+
+# =============================================================================
+
+
+def _knob_changed():
+    """Callback that invalidates the session cache when a transform changes"""
+    knob_name = nuke.thisKnob().name()
+    if knob_name == 'name':
+        # Values are keyed by full name, and the old name is already gone,
+        # so we can't tell which values were this node's. Another node
+        # could take the old name, so none of them can be trusted.
+        get_cache().invalidate()
+    elif knob_name not in IGNORED_KNOBS:
+        get_cache().invalidate(nuke.thisNode())
+
+# =============================================================================
+
+
+def _on_destroy():
+    """Callback that drops a deleted transform's values from the cache"""
+    # Otherwise a new node taking its name would inherit them.
+    get_cache().invalidate(nuke.thisNode())
+
+# =============================================================================
+
+
+def _node_script(node):
+    """Returns the script of all of a node's transform relevant knobs.
+
+    Args:
+        node : (<nuke.Node>)
+            The node to serialize.
+
+    Returns:
+        (str)
+            The node's class followed by every non-default knob's script,
+            with all knobs in `IGNORED_KNOBS` filtered out. Animated knobs
+            serialize their curves, so any change to a key changes the
+            returned script.
+
+    Raises:
+        N/A
+
+    """
+    lines = [
+        line for line in node.writeKnobs(
+            nuke.WRITE_NON_DEFAULT_ONLY | nuke.TO_SCRIPT
+        ).split('\n') if line.split(' ', 1)[0] not in IGNORED_KNOBS
+    ]
+    lines.insert(0, node.Class())
+
+    return '\n'.join(lines)
+
+# =============================================================================
+
+
+def _transform_chain(node):
+    """Returns the node along with every transform node it's parented to.
+
+    Args:
+        node : (<nuke.Node>)
+            The transform node to walk up from.
+
+    Returns:
+        [<nuke.Node>]
+            The node itself, followed by each transform node found walking up
+            its inputs. Inputs of classes outside of `TRANSFORM_CLASSES` are
+            not followed.
+
+    Raises:
+        N/A
+
+    """
+    chain = []
+    seen = set()
+    pending = [node]
+
+    while pending:
+        current = pending.pop(0)
+        if current.fullName() in seen:
+            continue
+        seen.add(current.fullName())
+        chain.append(current)
+
+        for i in xrange(current.inputs()):
+            parent = current.input(i)
+            if parent and parent.Class() in TRANSFORM_CLASSES:
+                pending.append(parent)
+
+    return chain
+
+# =============================================================================
+# CLASSES
+# =============================================================================
+
+
+class TransformCache(object):
+    """A least recently used cache of per-frame transforms.
+
+    Stores per-frame world matrices for any transform node, and projection
+    parameters for cameras. Values are keyed by the node's full name, a hash
+    of the node and its parent chain, the frame and the view, so a change
+    anywhere in the chain produces new keys rather than stale hits.
+
+    Args:
+        max_entries=MAX_ENTRIES : (int)
+            The number of cached values to hold before evicting the least
+            recently used.
+
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        # Node full name -> the keys of its entries, so a node's entries can
+        # be dropped without looking through the whole cache.
+        self._keys = {}
+        # Node full name -> chain hash.
+        self._hashes = {}
+        # Node full name -> the full names of every node whose chain hash
+        # covers it, including its own.
+        self._dependents = {}
+
+    # =========================================================================
+    # SPECIAL METHODS
+    # =========================================================================
+
+    def __len__(self):
+        return len(self._entries)
+
+    # =========================================================================
+    # PRIVATE METHODS
+    # =========================================================================
+
+    def _get(self, kind, node, frame, view, evaluate):
+        """Returns a cached value, evaluating and storing it on a miss"""
+        name = node.fullName()
+        key = (kind, name, self.chain_hash(node), frame, view)
+
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            value = evaluate(node, frame, view)
+            self._keys.setdefault(name, set()).add(key)
+        else:
+            self.hits += 1
+
+        # Re-inserting moves the key to the most recently used end.
+        self._entries[key] = value
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._keys[evicted[1]].discard(evicted)
+
+        return value
+
+    # =========================================================================
+    # PUBLIC METHODS
+    # =========================================================================
+
+    def chain_hash(self, node, refresh=False):
+        """Returns a hash of a node's knobs and those of its parent chain.
+
+        The hash is memoized until `invalidate()` is called on the node or
+        on any node in its chain.
+
+        Args:
+            node : (<nuke.Node>)
+                The transform node to hash.
+
+            refresh=False : (bool)
+                If True, the hash is recomputed even if one is memoized. Use
+                this when the hash outlives the session, as keys set through
+                python might not have invalidated the memo.
+
+        Returns:
+            (str)
+                A hex digest covering the knobs and animations of the node
+                and every transform node it's parented to.
+
+        Raises:
+            N/A
+
+        """
+        name = node.fullName()
+        if refresh or name not in self._hashes:
+            digest = hashlib.sha1()
+            for chain_node in _transform_chain(node):
+                chain_name = chain_node.fullName()
+                digest.update(chain_name)
+                digest.update(_node_script(chain_node))
+                self._dependents.setdefault(chain_name, set()).add(name)
+            self._hashes[name] = digest.hexdigest()
+
+        return self._hashes[name]
+
+    # =========================================================================
+
+    def invalidate(self, node=None):
+        """Invalidates the cached values of a node, or of all nodes.
+
+        Since a node's transform is inherited by everything parented to it,
+        the memoized chain hashes and cached values of every node whose
+        chain includes the node are dropped along with its own. Only those
+        nodes' entries are touched, so this is cheap enough to run on every
+        knob change.
+
+        Args:
+            node=None : (<nuke.Node>)
+                The node whose values are no longer valid. If not given, the
+                whole cache is cleared.
+
+        Returns:
+            None
+
+        Raises:
+            N/A
+
+        """
+        if node is None:
+            self._entries.clear()
+            self._keys.clear()
+            self._hashes.clear()
+            self._dependents.clear()
+            return
+
+        name = node.fullName()
+        for dependent in self._dependents.pop(name, set()) | set([name]):
+            self._hashes.pop(dependent, None)
+            for key in self._keys.pop(dependent, ()):
+                del self._entries[key]
+
+    # =========================================================================
+
+    def projection(self, camera, frame, view=None):
+        """Returns the projection parameters of a camera at a frame.
+
+        Args:
+            camera : (<nuke.nodes.Camera2>)
+                The camera to get projection parameters from.
+
+            frame : (int|float)
+                The frame to evaluate at.
+
+            view=None : (str)
+                The view to evaluate, for cameras with split knobs. If not
+                given, the current view is used.
+
+        Returns:
+            {str: float|(float, float)}
+                The value of each knob in `PROJECTION_KNOBS`, with two
+                dimensional knobs as tuples.
+
+        Raises:
+            N/A
+
+        """
+        return self._get(
+            'projection', camera, frame, view, _evaluate_projection
+        )
+
+    # =========================================================================
+
+    def world_matrix(self, node, frame, view=None):
+        """Returns the world matrix of a transform node at a frame.
+
+        Args:
+            node : (<nuke.Node>)
+                Any node with a `world_matrix` knob.
+
+            frame : (int|float)
+                The frame to evaluate at.
+
+            view=None : (str)
+                The view to evaluate, for nodes with split knobs. If not
+                given, the current view is used.
+
+        Returns:
+            (float, ...)
+                The 16 values of the world matrix, in the same row major
+                order as the `world_matrix` knob.
+
+        Raises:
+            N/A
+
+        """
+        return self._get('world', node, frame, view, _evaluate_world_matrix)
+
+# =============================================================================
+# PUBLIC FUNCTIONS
+# =============================================================================
+
+
+def chain_hash(node, refresh=False):
+    """Returns a hash of a transform node's knobs and those of its parents.
+
+    Args:
+        node : (<nuke.Node>)
+            The transform node to hash.
+
+        refresh=False : (bool)
+            If True, ignore any memoized hash and compute it again.
+
+    Returns:
+        (str)
+            A hex digest which changes whenever the node, or any transform
+            node it inherits from, changes.
+
+    Raises:
+        N/A
+
+    """
+    return get_cache().chain_hash(node, refresh)
+
+# =============================================================================
+
+
+def chain_signatures(node, intervals):
+    """Returns a signature of a node and its parents over each frame interval
+
+    Nothing is evaluated at any frame. Every node in the chain is signed by
+    its knob script with the contents of each animation curve stripped out,
+    so a change to a static knob or an expression changes every signature.
+    Each animation curve then only adds the keys that shape it within an
+    interval: those inside it, and the `CURVE_MARGIN` nearest keys on
+    either side.
+
+    Args:
+        node : (<nuke.Node>)
+            The transform node to sign.
+
+        intervals : [(int, int)]
+            The first and last frame of each interval to sign.
+
+    Returns:
+        [str]
+            A hex digest for each interval, in the same order, which changes
+            whenever the node, or any transform node it inherits from,
+            changes within that interval.
+
+    Raises:
+        N/A
+
+    """
+    static = hashlib.sha1()
+    curves = []
+    for chain_node in _transform_chain(node):
+        static.update(chain_node.fullName())
+        static.update(CURVE_RE.sub('{curve}', _node_script(chain_node)))
+
+        for name, knob in sorted(chain_node.knobs().items()):
+            if name in IGNORED_KNOBS or not isinstance(knob, nuke.Array_Knob):
+                continue
+            if not knob.isAnimated():
+                continue
+            for curve in knob.animations():
+                keys = [
+                    (
+                        key.x, key.y, key.lslope, key.rslope, key.la, key.ra,
+                        key.interpolation, key.extrapolation,
+                    ) for key in curve.keys()
+                ]
+                curves.append(
+                    (
+                        (
+                            chain_node.fullName(), name, curve.knobIndex(),
+                            curve.view()
+                        ),
+                        [key[0] for key in keys],
+                        keys,
+                    )
+                )
+    static = static.hexdigest()
+
+    signatures = []
+    for first, last in intervals:
+        digest = hashlib.sha1(static)
+        for curve, frames, keys in curves:
+            start = max(bisect.bisect_left(frames, first) - CURVE_MARGIN, 0)
+            end = bisect.bisect_right(frames, last) + CURVE_MARGIN
+            digest.update(repr((curve, keys[start:end])))
+        signatures.append(digest.hexdigest())
+
+    return signatures
+
+# =============================================================================
+
+
+def get_cache():
+    """Returns the session's TransformCache, creating it if needed.
+
+    The first call also registers knobChanged and onDestroy callbacks on
+    every class in `TRANSFORM_CLASSES`, which invalidate the cache whenever a
+    transform is changed, renamed or deleted through the interface.
+
+    Args:
+        N/A
+
+    Returns:
+        (<TransformCache>)
+            The cache shared by every tool in this session.
+
+    Raises:
+        N/A
+
+    """
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = TransformCache()
+        for node_class in TRANSFORM_CLASSES:
+            nuke.addKnobChanged(_knob_changed, nodeClass=node_class)
+            nuke.addOnDestroy(_on_destroy, nodeClass=node_class)
+
+    return _CACHE
+
+# =============================================================================
+
+
+def invalidate(node=None):
+    """Invalidates the session cache for a node, or for every node.
+
+    Knobs changed through python don't always trigger knobChanged callbacks,
+    so tools that write transform keys should call this when they're done.
+
+    Args:
+        node=None : (<nuke.Node>)
+            The node whose values are no longer valid. If not given, the
+            whole cache is cleared.
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    if _CACHE is not None:
+        _CACHE.invalidate(node)
+
+# =============================================================================
+
+
+def project_points(camera, points, frame, image_format, cull=True,
+                   view=None):
+    """Projects world space points through a camera into pixel coordinates
+
+    The camera's world matrix and projection are fetched once from the cache
+    and applied to every point, so projecting hundreds of points costs little
+    more than projecting one.
+
+    The projection follows Nuke's perspective camera: the horizontal
+    aperture spans the width of the format, the window roll, translate and
+    scale are applied in normalized screen space, and pixel aspect is
+    respected. Orthographic and lens distorted projections are not handled.
+
+    Args:
+        camera : (<nuke.nodes.Camera2>)
+            The camera to project through.
+
+        points : [(float, float, float)]
+            World space positions to project.
+
+        frame : (int|float)
+            The frame to evaluate the camera at.
+
+        image_format : (int, int, float)
+            The width, height and pixel aspect of the image the points are
+            projected onto.
+
+        cull=True : (bool)
+            If True, points behind the camera's near plane or outside of the
+            format are returned as None.
+
+        view=None : (str)
+            The view of the camera to project through. If not given, the
+            current view is used.
+
+    Returns:
+        [(float, float)|None]
+            The pixel coordinates of each point, in the same order as the
+            given points.
+
+    Raises:
+        N/A
+
+    """
+    cache = get_cache()
+    inverse = _invert_matrix(cache.world_matrix(camera, frame, view))
+    params = cache.projection(camera, frame, view)
+
+    width, height, pixel_aspect = image_format
+    lens = 2.0 * params['focal'] / params['haperture']
+    near = params['near']
+    win_x, win_y = params['win_translate']
+    scale_x, scale_y = params['win_scale']
+    roll = math.radians(params['winroll'])
+    cos_roll = math.cos(roll)
+    sin_roll = math.sin(roll)
+
+    # Pull the rows we need out of the inverse for our inner loop.
+    r0, r1, r2, r3 = inverse[0:4]
+    r4, r5, r6, r7 = inverse[4:8]
+    r8, r9, r10, r11 = inverse[8:12]
+
+    projected = []
+    for x, y, z in points:
+        # World to camera space, where the camera looks down -z.
+        depth = -(r8 * x + r9 * y + r10 * z + r11)
+        if depth <= near:
+            if cull:
+                projected.append(None)
+                continue
+            depth = depth or 1e-12
+
+        u = lens * (r0 * x + r1 * y + r2 * z + r3) / depth
+        v = lens * (r4 * x + r5 * y + r6 * z + r7) / depth
+
+        if roll:
+            u, v = u * cos_roll - v * sin_roll, u * sin_roll + v * cos_roll
+
+        u = (u - win_x) / scale_x
+        v = (v - win_y) / scale_y
+
+        pixel_x = width * (u + 1.0) / 2.0
+        pixel_y = height / 2.0 + v * width * pixel_aspect / 2.0
+
+        if cull and not (0 <= pixel_x <= width and 0 <= pixel_y <= height):
+            projected.append(None)
+        else:
+            projected.append((pixel_x, pixel_y))
+
+    return projected
+
+# =============================================================================
+
+
+def projection(camera, frame, view=None):
+    """Returns a camera's projection parameters at a frame from the cache"""
+    return get_cache().projection(camera, frame, view)
+
+# =============================================================================
+
+
+def to_parent_space(node, points, frame, view=None):
+    """Moves world space points into the space of a node's transform parent
+
+    A node's transform knobs are relative to whatever transform node it's
+    parented to, so points a node should be placed at have to be brought
+    into that space first. The parent's world matrix is read through the
+    session cache.
+
+    Args:
+        node : (<nuke.Node>)
+            The node whose parent space the points are moved into.
+
+        points : [(float, float, float)]
+            World space positions.
+
+        frame : (int|float)
+            The frame to evaluate the parent at.
+
+        view=None : (str)
+            The view to evaluate the parent in. If not given, the current
+            view is used.
+
+    Returns:
+        [(float, float, float)]
+            Each point in the parent's space, in the same order as the given
+            points. If the node isn't parented to a transform node, the
+            points are returned as they were given.
+
+    Raises:
+        ValueError
+            If the parent's world matrix is singular.
+
+    """
+    parent = None
+    for i in xrange(node.inputs()):
+        parent = node.input(i)
+        if parent and parent.Class() in TRANSFORM_CLASSES:
+            break
+        parent = None
+
+    if not parent:
+        return [tuple(point) for point in points]
+
+    inverse = _invert_matrix(get_cache().world_matrix(parent, frame, view))
+
+    return [
+        tuple(
+            inverse[row] * x + inverse[row + 1] * y +
+            inverse[row + 2] * z + inverse[row + 3]
+            for row in (0, 4, 8)
+        ) for x, y, z in points
+    ]
+
+# =============================================================================
+
+
+def world_matrix(node, frame, view=None):
+    """Returns a transform node's world matrix at a frame from the cache"""
+    return get_cache().world_matrix(node, frame, view)
@@ -18,11 +18,42 @@ are selectable from a new 'Viewer Sync' tab in the Viewer settings. You can
 choose to sync channels, inputs, viewed input number, luts, input processes,
 color corrections, overlays, ROI, and more.
 
+Synced viewers can be renamed or deleted freely, the rest of their group stays
+in sync. Syncing is done by a single callback for all Viewer nodes, which
+ignores any knob that isn't synced, so viewers keep their own knobChanged
+callbacks. Scripts saved with an older viewerSync keep syncing, and are moved
+over the first time they sync.
+
+Dragging a slider such as gain syncs it to every linked viewer many times a
+second, which can lag with several viewers. To coalesce those syncs, add the
+following to 'menu.py' as well:
+::
+    viewerSync.set_coalescing(True)
+
+Then each knob is synced at most once a UI frame while it's being dragged, and
+the value it's left at is always synced at the end.
+
+To see what syncing costs in a session, viewerSync counts the callbacks it
+receives, the ones it rejects early, and the knobs and viewers it writes to.
+Timing every event as well, and logging a line of the stats to the terminal
+once a minute, is turned on with:
+::
+    viewerSync.set_instrumentation(True, log_interval=60)
+
+The same stats are returned by `viewerSync.stats()` at any time, including a
+histogram of how long each event took.
+
 To remove the synchronization from nodes, select the nodes you wish to remove
 synchronization from, and select 'Remove Viewer Sync'. If no nodes are
 selected, all the viewers found on the root node graph level are de-synced.
 Note that any viewers that are in the same group
 
+Viewers are only synced with other viewers on the same node graph level. To
+sync the viewers inside every Group of a script at once, each level with its
+own sync group, run:
+::
+    viewerSync.setup_sync(recursive=True)
+
 ## Installation
 
 To install, simply ensure the 'viewerSync' directory is in your .nuke
@@ -38,7 +69,8 @@ Hotkey can be set with the `hotkey` argument, which defaults to `Shift+j`.
 ## Public Functions
 
     run()
-        Adds the viewerSync menu item to the User menu.
+        Adds the viewerSync menu item to the User menu, and the Viewer
+        callbacks viewerSync runs on.
 
 ## License
 
@@ -78,7 +110,10 @@ except ImportError:
     pass
 
 # viewerSync Imports
-from .viewerSync import remove_callbacks, setup_sync, sync_viewers
+from .viewerSync import (
+    register_callbacks, remove_callbacks, set_coalescing, set_instrumentation,
+    setup_sync, stats, sync_viewers
+)
 
 # ==============================================================================
 # GLOBALS
@@ -102,9 +137,13 @@ __url__ = "http://github.com/ThoriumGroup/viewerSync"
 # ==============================================================================
 
 __all__ = [
+    'register_callbacks',
     'remove_callbacks',
     'run',
+    'set_coalescing',
+    'set_instrumentation',
     'setup_sync',
+    'stats',
     'sync_viewers',
 ]
 
@@ -145,7 +184,7 @@ def _get_menu_item_index(menu, item):
 
 def run(menu='Viewer', hotkey='Shift+j', submenu=None, submenu_index=None,
         item_index=-1):
-    """Adds viewerSync menu items.
+    """Adds viewerSync menu items and the Viewer callbacks it runs on.
 
     Args:
         menu='Viewer' : (str)
@@ -213,3 +252,5 @@ def run(menu='Viewer', hotkey='Shift+j', submenu=None, submenu_index=None,
         index=item_index if item_index is not None else
         _get_menu_item_index(dest_menu, 'Remove Viewer Sync')
     )
+
+    register_callbacks()
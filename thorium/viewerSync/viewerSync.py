@@ -8,12 +8,26 @@ Contains the functions required for two views to be kept in sync.
 
 ## Public Functions
 
+    register_callbacks()
+        Adds the Viewer callbacks that viewerSync runs on.
+
     remove_callback()
         Removes callback from all selected viewers and all viewers linked.
 
+    set_coalescing()
+        Turns coalescing of rapid knob changes, such as slider drags, on or
+        off.
+
+    set_instrumentation()
+        Turns timing of every Viewer event, and an optional periodic log line
+        of the sync stats, on or off.
+
     setup_sync()
         Sets up a viewerSync between a group of Viewer nodes.
 
+    stats()
+        Returns the callbacks, writes and timings recorded by viewerSync.
+
     sync_viewers()
         Syncs all the given viewers to the settings on the caller node.
 
@@ -50,6 +64,10 @@ SOFTWARE.
 
 # Standard Imports
 from ast import literal_eval
+from bisect import bisect_right
+from contextlib import contextmanager
+import threading
+import time
 
 # Nuke Imports
 try:
@@ -164,13 +182,74 @@ VIEWER_SYNC_KNOBS = [
     'vs_{knob}'.format(knob=sync_knob) for sync_knob in SYNC_DEFAULTS.keys()
 ]
 
+# The viewers each synced viewer is linked to, by the linked viewer's full
+# name. Groups are registered by `setup_sync`, or the first time a viewer
+# loaded from a script syncs, so callbacks never need to resolve names.
+_SYNC_GROUPS = {}
+
+# The shortest time between syncs while coalescing, about one UI frame.
+COALESCE_INTERVAL = 1.0 / 30
+
+# Whether syncs are coalesced, when they last went out, and whether one is
+# already waiting to. See `set_coalescing`.
+_COALESCING = {
+    'enabled': False,
+    'interval': COALESCE_INTERVAL,
+    'last_flush': 0.0,
+    'scheduled': False,
+}
+
+# The syncs waiting to go out while coalescing, by caller name and knob.
+_PENDING_SYNCS = {}
+
+# How many syncs are being applied. See `_sync_transaction`.
+_TRANSACTION = {
+    'depth': 0,
+}
+
+# The upper bounds, in milliseconds, of the wall time histogram buckets. The
+# last bucket holds every event slower than the last bound.
+STATS_BUCKETS = [0.1, 0.5, 1, 5, 10, 50, 100]
+
+# What viewerSync has done since the stats were last reset. See `stats`.
+_STATS = {
+    'callbacks': 0,
+    'rejected': 0,
+    'suppressed': 0,
+    'targets': 0,
+    'written': 0,
+    'skipped': 0,
+    'timed': 0,
+    'wall_time': 0.0,
+    'histogram': [0] * (len(STATS_BUCKETS) + 1),
+}
+
+# Whether events are timed, and how often the stats are logged. See
+# `set_instrumentation`.
+_INSTRUMENTATION = {
+    'enabled': False,
+    'log_interval': None,
+    'last_log': 0.0,
+}
+
+# Every knob viewerSync reacts to a change of. Any other knob changing on a
+# Viewer is rejected with a single set lookup.
+EVENT_KNOBS = frozenset(
+    SYNC_DEFAULTS.keys() + VIEWER_SYNC_KNOBS +
+    ['inputChange', 'name']
+)
+
 # =============================================================================
 # EXPORTS
 # =============================================================================
 
 __all__ = [
+    'register_callbacks',
     'remove_callbacks',
+    'set_coalescing',
+    'set_instrumentation',
     'setup_sync',
+    'stats',
     'sync_viewers',
 ]
 
@@ -246,40 +325,411 @@ def _add_sync_knobs(viewer):
 # =============================================================================
 
 
+def _dispatch():
+    """Handles a knob change on any Viewer. Added by `register_callbacks`."""
+    _timed_event(nuke.thisNode(), nuke.thisKnob().name())
+
+# =============================================================================
+
+
 def _extract_viewer_list(viewer):
-    """Extracts a list of Viewer nodes from a callback.
+    """Extracts a list of Viewer nodes from a synced viewer.
 
-    Searches a viewer node for a viewerSync callback, and extracts the
-    value of the `viewers` arg.
+    The full names of the viewers a viewer is synced to are stored in its
+    hidden `vs_viewers` knob. Viewers synced by older versions of viewerSync
+    have them as the `viewers` arg of a viewerSync knobChanged callback
+    instead, which is read when there's no `vs_viewers` knob.
 
     Args:
         viewer : (<nuke.nodes.Viewer>)
-            The viewer node with the callback attached.
+            The viewer node to find the linked viewers of.
 
     Returns:
         [<nuke.nodes.Viewer>]
-            A list of viewer nodes that were listed in the callback arg.
+            A list of the linked viewer nodes that still exist.
 
     Raises:
         ValueError
-            If the callback found on the viewer is present, but not for
-            viewerSync.
+            If the viewer has no `vs_viewers` knob, and a callback that
+            isn't for viewerSync.
+
+    """
+    if 'vs_viewers' in viewer.knobs():
+        linked_viewers = viewer['vs_viewers'].value().split()
+    else:
+        callback = viewer['knobChanged'].value()
+
+        if not callback:
+            return []
+        elif 'viewerSync' not in callback:
+            raise ValueError("Not a viewerSync'd viewer.")
+
+        callback = callback.replace('viewerSync.sync_viewers(', '')[:-1]
+        linked_viewers = literal_eval(callback)
+
+    viewer_nodes = [nuke.toNode(node) for node in linked_viewers]
+
+    return [node for node in viewer_nodes if node]
+
+# =============================================================================
+
+
+def _flush_syncs():
+    """Applies every sync waiting to go out while coalescing.
+
+    Each sync copies the value its caller has now, which is the latest one
+    however many changes were coalesced.
+
+    Args:
+        N/A
+
+    Returns:
+        (int)
+            The number of writes skipped, as the target already had the
+            caller's value.
+
+    Raises:
+        N/A
+
+    """
+    _COALESCING['scheduled'] = False
+    _COALESCING['last_flush'] = time.time()
+
+    syncs = _PENDING_SYNCS.values()
+    _PENDING_SYNCS.clear()
+
+    skipped = 0
+    with _sync_transaction():
+        for caller, targets, knob in syncs:
+            if _is_deleted(caller):
+                # The caller was deleted while the sync waited.
+                continue
+            # As might any of its targets be.
+            targets = [
+                target for target in targets if not _is_deleted(target)
+            ]
+            skipped += _sync_knob(caller, targets, knob)
+
+    return skipped
+
+# =============================================================================
+
+
+def _forget_viewer(viewer=None):
+    """Drops the sync group of a viewer from the registry.
+
+    This is also added as an onDestroy callback for Viewer nodes, so that
+    deleted viewers are never synced to. The rest of the group is dropped
+    along with it, and registered again without the viewer the next time
+    one of them syncs. The names stored on the rest of the group are
+    written again without the viewer, so that a new viewer given its name
+    isn't synced to them.
+
+    Args:
+        viewer=None : (<nuke.nodes.Viewer>)
+            The viewer to forget.
+
+            Default: The node the callback was called from.
+
+    Returns:
+        None
+
+    Raises:
+        N/A
 
     """
-    callback = viewer['knobChanged'].value()
+    if viewer is None:
+        viewer = nuke.thisNode()
 
-    if not callback:
-        return []
-    elif 'viewerSync' not in callback:
-        raise ValueError("Not a viewerSync'd viewer.")
+    try:
+        linked = _SYNC_GROUPS.pop(viewer.fullName())
+    except KeyError:
+        # Not synced this session, but it may still be stored on others.
+        linked = _stored_viewers(viewer)
 
-    callback = callback.replace('viewerSync.sync_viewers(', '')[:-1]
-    linked_viewers = literal_eval(callback)
-    viewer_nodes = [
-        nuke.toNode(node) for node in linked_viewers if nuke.toNode(node)
-    ]
+    remaining = [node for node in linked if not _is_deleted(node)]
+    for node in remaining:
+        _SYNC_GROUPS.pop(node.fullName(), None)
+        _set_callback(node, remaining)
 
-    return viewer_nodes
+# =============================================================================
+
+
+def _format_stats(recorded):
+    """Returns the stats recorded by `stats` as a single log line.
+
+    Args:
+        recorded : (dict)
+            The stats as returned by `stats`.
+
+    Returns:
+        (str)
+            A line such as: `viewerSync: 120 callbacks, 96 rejected, ...`
+
+    Raises:
+        N/A
+
+    """
+    counts = ', '.join(
+        [
+            '{0} {1}'.format(recorded[key], key) for key in (
+                'callbacks', 'rejected', 'suppressed', 'targets', 'written',
+                'skipped'
+            )
+        ]
+    )
+    buckets = ' '.join(
+        ['<{0}ms:{1}'.format(bound, count)
+         for bound, count in recorded['histogram'][:-1]] +
+        ['>={0}ms:{1}'.format(STATS_BUCKETS[-1], recorded['histogram'][-1][1])]
+    )
+    mean = recorded['wall_time'] * 1000 / max(recorded['timed'], 1)
+
+    return 'viewerSync: {0}, {1} timed, mean {2:.3f}ms, {3}'.format(
+        counts, recorded['timed'], mean, buckets
+    )
+
+# =============================================================================
+
+
+def _handle_event(caller, caller_knob, viewers=None):
+    """Syncs the viewers linked to caller after caller_knob changed.
+
+    Before anything else, we compare the calling knob to the set of knobs
+    that viewerSync is concerned about, and return straight away if it isn't
+    one of them, or if the caller isn't synced. We also return early if the
+    calling knob isn't currently set to sync (via the caller node's
+    settings), or if the change was set off by a sync being applied.
+
+    Otherwise we sync the knob values for the knob that called us.
+
+    Args:
+        caller : (<nuke.nodes.Viewer>)
+            The viewer with the knob that changed.
+
+        caller_knob : (str)
+            The name of the knob that changed.
+
+        viewers=None : [str]
+            The absolute names of the viewers linked to the caller, as
+            written in an older viewerSync knobChanged callback.
+
+            Default: The registered group of the caller, or failing that
+            the names stored on the caller.
+
+    Returns:
+        (int)
+            The number of writes skipped, as the target already had the
+            caller's value. Syncs that are coalesced aren't counted here.
+
+    Raises:
+        N/A
+
+    """
+    _STATS['callbacks'] += 1
+
+    if caller_knob not in EVENT_KNOBS:
+        _STATS['rejected'] += 1
+        return 0
+
+    if viewers is None and caller.fullName() not in _SYNC_GROUPS:
+        if 'vs_viewers' not in caller.knobs():
+            # Not a synced viewer.
+            _STATS['rejected'] += 1
+            return 0
+
+    if _TRANSACTION['depth']:
+        # Set off by a sync being applied, which already reaches every
+        # viewer in the group.
+        _STATS['suppressed'] += 1
+        return 0
+
+    with _sync_transaction():
+        if caller_knob == 'name':
+            _rename_viewer(caller, viewers)
+            return 0
+
+        if caller_knob in SYNC_DEFAULTS:
+            if not caller['vs_{knob}'.format(knob=caller_knob)].value():
+                # Sync setting is false for this knob
+                _STATS['rejected'] += 1
+                return 0
+
+        viewer_nodes = _linked_viewers(caller, viewers)
+        _STATS['targets'] += len(viewer_nodes)
+        skipped = 0
+
+        if caller_knob in VIEWER_SYNC_KNOBS:
+            # Sync setting and continue
+            skipped += _sync_knob(caller, viewer_nodes, caller_knob)
+            if caller[caller_knob].value():
+                caller_knob = caller_knob.replace('vs_', '')
+
+        if caller_knob in ['inputChange', 'inputs']:
+            if caller['vs_inputs'].value():
+                skipped += _sync_inputs(caller, viewer_nodes)
+            return skipped
+
+        # Update remaining viewers to point at our current node.
+        if _COALESCING['enabled']:
+            _queue_sync(caller, viewer_nodes, caller_knob)
+        else:
+            skipped += _sync_knob(caller, viewer_nodes, caller_knob)
+
+        return skipped
+
+# =============================================================================
+
+
+def _is_deleted(node):
+    """Returns if node was deleted since it was looked up.
+
+    Args:
+        node : (<nuke.Node>)
+            The node to check.
+
+    Returns:
+        (bool)
+            True if the node no longer exists.
+
+    Raises:
+        N/A
+
+    """
+    try:
+        node.fullName()
+    except ValueError:
+        # Nuke raises for any use of a deleted node.
+        return True
+
+    return False
+
+# =============================================================================
+
+
+def _linked_viewers(viewer, names=None):
+    """Returns the viewers synced to viewer, registering them if needed.
+
+    A registered group with a viewer that has since been deleted, such as
+    while the callbacks weren't registered, is registered again without it.
+    The names stored on every viewer of a group are written again whenever
+    it's registered, should any of them have been renamed.
+
+    Args:
+        viewer : (<nuke.nodes.Viewer>)
+            The viewer to get the linked viewers of.
+
+        names=None : [str]
+            The full names of the linked viewers, as written in an older
+            viewerSync knobChanged callback. The group is moved over to
+            the viewer dispatcher as it's registered.
+
+            Default: The names stored on the viewer, which are only read if
+            the viewer isn't in the registry yet, such as after a script
+            is opened.
+
+    Returns:
+        [<nuke.nodes.Viewer>]
+            The viewers synced to `viewer`, not including itself.
+
+    Raises:
+        N/A
+
+    """
+    try:
+        linked = _SYNC_GROUPS[viewer.fullName()]
+    except KeyError:
+        group = [viewer] + _stored_viewers(viewer, names)
+    else:
+        remaining = [node for node in linked if not _is_deleted(node)]
+        if len(remaining) == len(linked):
+            return linked
+        group = [viewer] + remaining
+
+    _register_group(group)
+    for node in group:
+        _set_callback(node, group)
+
+    if names is not None:
+        register_callbacks()
+
+    return _SYNC_GROUPS[viewer.fullName()]
+
+# =============================================================================
+
+
+def _queue_sync(caller, targets, knob):
+    """Queues a sync of knob, applying it now if the last flush was long ago.
+
+    Only the latest sync of each knob on each caller is kept. If syncs went
+    out less than the coalescing interval ago, a flush is scheduled for the
+    end of the interval, so the last change of a drag is always applied.
+
+    Args:
+        caller : (<nuke.nodes.Viewer>)
+            The viewer with the knob that changed.
+
+        targets : [<nuke.nodes.Viewer>]
+            The viewers to sync the knob to.
+
+        knob : (str)
+            The name of the knob that changed.
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    _PENDING_SYNCS[(caller.fullName(), knob)] = (caller, targets, knob)
+    if _COALESCING['scheduled']:
+        return
+
+    wait = _COALESCING['interval'] - (time.time() - _COALESCING['last_flush'])
+    if wait <= 0:
+        _flush_syncs()
+        return
+
+    # Knobs can only be set from the main thread, so the timer hands the
+    # flush back to it.
+    _COALESCING['scheduled'] = True
+    timer = threading.Timer(wait, nuke.executeInMainThread, [_flush_syncs])
+    timer.daemon = True
+    timer.start()
+
+# =============================================================================
+
+
+def _register_group(viewers):
+    """Registers viewers as a sync group, each linked to all the others.
+
+    Args:
+        viewers : [<nuke.nodes.Viewer>]
+            The viewers synced together.
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    for viewer in viewers:
+        _SYNC_GROUPS[viewer.fullName()] = [
+            linked for linked in viewers if linked is not viewer
+        ]
+
+    # Viewers renamed or deleted since they were registered leave their old
+    # names behind, which a new viewer could be given. Every registered
+    # viewer is in the group of another, so any name that isn't is stale.
+    names = set(viewer.fullName() for viewer in viewers)
+    for linked in _SYNC_GROUPS.values():
+        names.update(
+            node.fullName() for node in linked if not _is_deleted(node)
+        )
+    for name in [name for name in _SYNC_GROUPS if name not in names]:
+        del _SYNC_GROUPS[name]
 
 # =============================================================================
 
@@ -313,6 +763,146 @@ def _remove_knobs(viewer):
 # =============================================================================
 
 
+def _rename_viewer(viewer, names=None):
+    """Registers the sync group of a renamed viewer under its new name.
+
+    The names stored on every viewer in the group are written again as well,
+    so that the group can still be found when the script is next opened.
+
+    Args:
+        viewer : (<nuke.nodes.Viewer>)
+            The viewer that was renamed.
+
+        names=None : [str]
+            The full names of the viewers linked to `viewer`, as written
+            in an older viewerSync knobChanged callback.
+
+            Default: The names stored on the viewer.
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    group = [viewer] + _stored_viewers(viewer, names)
+
+    # Registering drops the old name of the viewer.
+    _register_group(group)
+    for node in group:
+        _set_callback(node, group)
+
+# =============================================================================
+
+
+@contextmanager
+def _sync_transaction():
+    """Marks a sync as being applied for the duration of the block.
+
+    Every knob a sync writes sets off the target viewer's own callbacks
+    straight away, which would sync the same change from the target to every
+    other viewer in the group, and from each of those to every other viewer
+    again. While a sync is being applied, those callbacks are suppressed,
+    so one change costs one sync however many viewers are linked.
+
+    Transactions can be nested, such as when a coalesced sync is flushed
+    from within a sync.
+
+    Args:
+        N/A
+
+    Yields:
+        None
+
+    Raises:
+        N/A
+
+    """
+    _TRANSACTION['depth'] += 1
+    try:
+        yield
+    finally:
+        _TRANSACTION['depth'] -= 1
+
+# =============================================================================
+
+
+def _sync_group(caller):
+    """Syncs every knob caller is set to sync, and its inputs, to its group.
+
+    This brings a newly linked group in line with one of its viewers, as
+    until one of them changes a synced knob, nothing else would. The knobs
+    are synced together with `_sync_knobs`.
+
+    Args:
+        caller : (<nuke.nodes.Viewer>)
+            The synced viewer to copy the settings of.
+
+    Returns:
+        (int)
+            The number of writes skipped, as the target already had the
+            caller's value.
+
+    Raises:
+        N/A
+
+    """
+    with _sync_transaction():
+        viewer_nodes = _linked_viewers(caller)
+        _STATS['targets'] += len(viewer_nodes)
+
+        knobs = [
+            knob for knob in SYNC_DEFAULTS
+            if knob != 'inputs' and caller['vs_' + knob].value()
+        ]
+        skipped = _sync_knobs(caller, viewer_nodes, knobs)
+
+        if caller['vs_inputs'].value():
+            skipped += _sync_inputs(caller, viewer_nodes)
+
+    return skipped
+
+# =============================================================================
+
+
+def _sync_inputs(source, targets):
+    """Connects each target's inputs to the same nodes as the source's.
+
+    Args:
+        source : (<nuke.nodes.Viewer>)
+            The viewer whose inputs we want to copy.
+
+        targets : [<nuke.nodes.Viewer>]
+            The viewers to connect.
+
+    Returns:
+        (int)
+            The number of inputs that were already connected to the same
+            node, and so weren't set.
+
+    Raises:
+        N/A
+
+    """
+    inputs = [source.input(i) for i in xrange(source.inputs())]
+
+    skipped = 0
+    for target in targets:
+        for i, node in enumerate(inputs):
+            if target.input(i) == node:
+                skipped += 1
+            else:
+                target.setInput(i, node)
+                _STATS['written'] += 1
+
+    _STATS['skipped'] += skipped
+
+    return skipped
+
+# =============================================================================
+
+
 def _sync_knob(source, targets, knob):
     """Syncs a knob setting from the source to the target.
 
@@ -330,31 +920,145 @@ def _sync_knob(source, targets, knob):
             The knob name to match between the source and the targets.
 
     Returns:
-        None
+        (int)
+            The number of targets that already had the value, and so weren't
+            set. Setting a knob fires the target's own callbacks, even if
+            the value doesn't change.
 
     Raises:
         N/A
 
     """
+    try:
+        value = source[knob].value()
+    except NameError:
+        # Knob doesn't exist on source.
+        return 0
+
+    skipped = 0
     for target in targets:
         try:
-            target[knob].setValue(source[knob].value())
+            target_knob = target[knob]
         except NameError:
             # Knob doesn't exist on target.
             continue
 
+        if target_knob.value() == value:
+            skipped += 1
+        else:
+            target_knob.setValue(value)
+            _STATS['written'] += 1
+
+    _STATS['skipped'] += skipped
+
+    return skipped
+
+# =============================================================================
+
+
+def _sync_knobs(source, targets, knobs):
+    """Syncs many knob settings from the source to the targets at once.
+
+    The source knobs are serialized once, and each target reads every knob
+    that differs from a single knob script, rather than having each knob set
+    in turn. Values are serialized quoted, so values with spaces, such as
+    an OCIO viewerProcess, and array knobs, such as gain, stay one value
+    each. Knobs that don't serialize are synced with `_sync_knob` instead,
+    as is every knob of a target that fails to read the script, or that
+    doesn't hold the source's value after reading it.
+
+    Args:
+        source : (<nuke.Node>)
+            Any node that has the knobs with values we want to sync from.
+
+        targets : [<nuke.Node>]
+            A list of nodes that should have the same knobs as source, that
+            we want to have the same values as source. Knobs missing from a
+            target are left out.
+
+        knobs : [str]
+            The knob names to match between the source and the targets.
+
+    Returns:
+        (int)
+            The number of knobs on targets that already had the value, and
+            so weren't set.
+
+    Raises:
+        N/A
+
+    """
+    scripts = {}
+    unbatched = []
+    for knob in knobs:
+        try:
+            script = source[knob].toScript(True)
+        except NameError:
+            # Knob doesn't exist on source.
+            continue
+
+        if script:
+            scripts[knob] = script
+        else:
+            unbatched.append(knob)
+
+    skipped = 0
+    for target in targets:
+        target_knobs = target.knobs()
+        batched = [knob for knob in scripts if knob in target_knobs]
+        changed = [
+            knob for knob in batched
+            if target_knobs[knob].toScript(True) != scripts[knob]
+        ]
+        skipped += len(batched) - len(changed)
+
+        if not changed:
+            continue
+
+        try:
+            target.readKnobs(
+                ' '.join(
+                    ['{0} {1}'.format(knob, scripts[knob]) for knob in changed]
+                )
+            )
+        except Exception:
+            # Nuke raises RuntimeError for a script it can't read, but the
+            # knobs are synced one by one below whatever went wrong.
+            pass
+
+        # A script that was misread can set the wrong knobs, so every
+        # batched knob is checked, not only the ones that changed. Writes
+        # made here are counted by `_sync_knob`.
+        for knob in batched:
+            if target_knobs[knob].toScript(True) != scripts[knob]:
+                _sync_knob(source, [target], knob)
+            elif knob in changed:
+                _STATS['written'] += 1
+
+    _STATS['skipped'] += skipped
+
+    for knob in unbatched:
+        skipped += _sync_knob(source, targets, knob)
+
+    return skipped
+
 # =============================================================================
 
 
 def _set_callback(node, viewers):
-    """Sets the callback on the node with the viewers and knobs args.
+    """Stores the names of the viewers node is synced to on node.
+
+    The names are kept in a hidden `vs_viewers` knob, which is read to find
+    the sync group again once the script is reopened. The syncing itself
+    is done by the Viewer dispatcher, so a viewerSync knobChanged callback
+    left by an older version of viewerSync is removed.
 
     Args:
         node : (<nuke.nodes.Viewer>)
-            The viewer node we're going to set the callback on.
+            The viewer node we're going to store the viewers on.
 
         viewers : [<nuke.nodes.Viewer>]
-            The viewers the callback should reference.
+            The viewers the node is synced to.
 
     Returns:
         None
@@ -363,26 +1067,139 @@ def _set_callback(node, viewers):
         N/A
 
     """
-    # Create a copy of list, as we're poppin' the `node` if found.
-    viewers = list(viewers)
-    # Remove our caller from the nodes to update if present.
-    if node in viewers:
-        viewers.pop(viewers.index(node))
-
-    # Get the list of node names to populate the arg with
-    viewer_names = [viewer.fullName() for viewer in viewers]
-
-    node['knobChanged'].setValue(
-        'viewerSync.sync_viewers({viewers})'.format(
-            viewers=viewer_names
-        )
+    # Get the names of the other viewers to store, leaving out our caller if
+    # present. Node names can't have spaces.
+    node_name = node.fullName()
+    viewer_names = ' '.join(
+        [
+            name for name in (viewer.fullName() for viewer in viewers)
+            if name != node_name
+        ]
     )
 
+    if 'vs_viewers' not in node.knobs():
+        names_knob = nuke.String_Knob('vs_viewers', 'linked viewers')
+        names_knob.setFlag(nuke.INVISIBLE)
+        node.addKnob(names_knob)
+    if node['vs_viewers'].value() != viewer_names:
+        node['vs_viewers'].setValue(viewer_names)
+
+    if 'viewerSync' in node['knobChanged'].value():
+        node['knobChanged'].setValue('')
+
+# =============================================================================
+
+
+def _stored_viewers(viewer, names=None):
+    """Resolves the viewers linked to viewer from their stored names.
+
+    Args:
+        viewer : (<nuke.nodes.Viewer>)
+            The viewer to find the linked viewers of.
+
+        names=None : [str]
+            The full names of the linked viewers.
+
+            Default: The names stored on the viewer.
+
+    Returns:
+        [<nuke.nodes.Viewer>]
+            The linked viewers that still exist.
+
+    Raises:
+        N/A
+
+    """
+    if names is None:
+        try:
+            return _extract_viewer_list(viewer)
+        except ValueError:
+            return []
+
+    viewer_nodes = [nuke.toNode(name) for name in names]
+
+    return [node for node in viewer_nodes if node]
+
+# =============================================================================
+
+
+def _timed_event(caller, caller_knob, viewers=None):
+    """Handles an event, timing it if instrumentation is on.
+
+    With instrumentation on, the wall time of the event is added to the
+    histogram in the stats, and the stats are logged if the log interval
+    has passed since they were last logged.
+
+    Args:
+        caller : (<nuke.nodes.Viewer>)
+            The viewer with the knob that changed.
+
+        caller_knob : (str)
+            The name of the knob that changed.
+
+        viewers=None : [str]
+            The absolute names of the viewers linked to the caller. See
+            `_handle_event`.
+
+    Returns:
+        (int)
+            The number of writes skipped, as returned by `_handle_event`.
+
+    Raises:
+        N/A
+
+    """
+    if not _INSTRUMENTATION['enabled']:
+        return _handle_event(caller, caller_knob, viewers)
+
+    start = time.time()
+    try:
+        return _handle_event(caller, caller_knob, viewers)
+    finally:
+        now = time.time()
+        elapsed = now - start
+        _STATS['timed'] += 1
+        _STATS['wall_time'] += elapsed
+        _STATS['histogram'][bisect_right(STATS_BUCKETS, elapsed * 1000)] += 1
+
+        interval = _INSTRUMENTATION['log_interval']
+        if interval and now - _INSTRUMENTATION['last_log'] >= interval:
+            _INSTRUMENTATION['last_log'] = now
+            nuke.tprint(_format_stats(stats()))
+
 # =============================================================================
 # PUBLIC FUNCTIONS
 # =============================================================================
 
 
+def register_callbacks():
+    """Adds the Viewer callbacks that viewerSync runs on.
+
+    Rather than a knobChanged script on every synced viewer, a single
+    knobChanged callback is added for the Viewer class, which returns
+    straight away for any knob viewerSync doesn't sync, or any viewer that
+    isn't synced. An onDestroy callback drops deleted viewers from their
+    sync group.
+
+    Nuke ignores callbacks that have already been added, so this can be
+    called any number of times.
+
+    Args:
+        N/A
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    nuke.addKnobChanged(_dispatch, nodeClass='Viewer')
+    nuke.addOnDestroy(_forget_viewer, nodeClass='Viewer')
+
+# =============================================================================
+
+
 def remove_callbacks():
     """Removes callback from all selected viewers and all viewers linked.
 
@@ -420,26 +1237,110 @@ def remove_callbacks():
         if 'viewerSync' in viewer['knobChanged'].value():
             viewer['knobChanged'].setValue('')
         _remove_knobs(viewer)
+        _forget_viewer(viewer)
+
+# =============================================================================
+
+
+def set_coalescing(enabled=True, interval=None):
+    """Turns coalescing of rapid knob changes on or off.
+
+    Dragging a slider such as gain or gamma changes it many times a second,
+    and without coalescing every change is synced to every linked viewer
+    straight away. With coalescing on, a change is synced straight away
+    only if nothing was synced for `interval`. Otherwise only the latest
+    value of each knob is kept, and synced once `interval` has passed. The
+    final value of a drag is always synced.
+
+    Args:
+        enabled=True : (bool)
+            Whether to coalesce syncs.
+
+        interval=None : (float)
+            The shortest time, in seconds, between syncs.
+
+            Default: The interval already set, which starts out as
+            `COALESCE_INTERVAL`.
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    _COALESCING['enabled'] = enabled
+    if interval is not None:
+        _COALESCING['interval'] = interval
+
+    if not enabled and _PENDING_SYNCS:
+        _flush_syncs()
+
+# =============================================================================
+
+
+def set_instrumentation(enabled=True, log_interval=None):
+    """Turns timing of Viewer events, and logging of the stats, on or off.
+
+    The counts returned by `stats` are always kept, as they cost little more
+    than the work they count. Timing each event is left off unless turned on
+    here, which also resets the stats, so that each configuration compared
+    starts from nothing.
+
+    Args:
+        enabled=True : (bool)
+            Whether to time every Viewer event.
+
+        log_interval=None : (float)
+            How often, in seconds, to log a line of the stats to the
+            terminal. The line is written by the first event after the
+            interval has passed, so nothing is logged while idle.
+
+            Default: Don't log.
+
+    Returns:
+        None
+
+    Raises:
+        N/A
+
+    """
+    _INSTRUMENTATION['enabled'] = enabled
+    _INSTRUMENTATION['log_interval'] = log_interval if enabled else None
+    _INSTRUMENTATION['last_log'] = time.time()
+
+    if enabled:
+        stats(reset=True)
 
 # =============================================================================
 
 
-def setup_sync():
+def setup_sync(recursive=False):
     """Sets up a viewerSync between a group of Viewer nodes.
 
     This sets up callbacks between either all selected viewers, or all viewers
     at the current node graph level (as defined by what nuke.allNodes()
     returns). It also sets up a series of settings on the Viewer nodes
     themselves, controlling which knobs get synced between the Viewers.
+    Each new group is synced straight away from the active viewer, if it's
+    in the group, or else from any one of the group's viewers.
 
-    Before setting up the viewers, we check the current knobChanged value.
-    Often that value is a viewerSync callback already. If so, we deactivate
-    that viewerSync group before continuing. If the callback is foreign (not
-    a viewerSync callback), we leave it alone and remove that Viewer from the
-    viewerSync group, rather than mess up another python process.
+    Viewers are only ever synced with viewers on the same node graph level,
+    so selected viewers inside different Groups make a sync group for each
+    level. With `recursive`, every viewer in the script is found in a single
+    walk through the node graph, and a sync group is set up for every level
+    with more than one viewer.
+
+    Before setting up the viewers, we check if they're synced already. If
+    so, we deactivate that viewerSync group before continuing. Syncing is
+    done by the Viewer callbacks added by `register_callbacks`, so viewers
+    with a foreign knobChanged callback can be synced too, and the callback
+    is left alone.
 
     Args:
-        N/A
+        recursive=False : (bool)
+            If no viewers are selected, find viewers on every level of the
+            node graph, rather than only the current one.
 
     Returns:
         None
@@ -450,139 +1351,162 @@ def setup_sync():
     """
     # Grab all of our currently selected Viewer nodes:
     viewers = nuke.selectedNodes('Viewer')
-
-    # We'll be using the viewer_levels dictionary to link viewers
-    # across the same DAG level, and avoid linking lone viewers on sub DAGs.
+    if not viewers:
+        if recursive:
+            viewers = nuke.allNodes('Viewer', nuke.root(), recurseGroups=True)
+        else:
+            # No viewers were provided, so we'll just grab all the viewers
+            # at our current level
+            viewers = nuke.allNodes('Viewer')
+
+    # Viewers are linked across the same DAG level, and lone viewers on sub
+    # DAGs aren't linked at all. Each level maps the full name of each of
+    # its viewers to the viewer. Nuke hands out a new object for a node each
+    # time it's looked up, so nodes are keyed by name rather than object.
     viewer_levels = {}
+    for viewer in viewers:
+        name = viewer.fullName()
+        level = name.rpartition('.')[0] or 'root'
+        viewer_levels.setdefault(level, {})[name] = viewer
+
+    viewer_levels = dict(
+        (level, level_viewers)
+        for level, level_viewers in viewer_levels.iteritems()
+        if len(level_viewers) > 1
+    )
 
-    # If we find ANY viewers of the currently selected set having a
-    # knobChanged value, we'll turn off syncing on all the node's it's linked
-    # to. Safer that way.
-    remove_viewers = []
-
-    if viewers:
-        for viewer in viewers:
-            # In case Nuke returns us viewers split across different levels,
-            # we'll need to split them up by level so that we don't
-            # attempt to link those.
-            group = '.'.join(viewer.fullName().split('.')[:-1])
-            if not group:
-                group = 'root'
-            group_viewers = viewer_levels.get(group, [])
-            group_viewers.append(viewer)
-            viewer_levels[group] = group_viewers
-    else:
-        # No viewers were provided, so we'll just grab all the viewers
-        # at our current level
-        viewers = nuke.allNodes('Viewer')
-        viewer_levels['group'] = viewers
-
-    for level in viewer_levels.keys():
-        if len(viewer_levels[level]) <= 1:
-            # Nothing to sync, delete this level.
-            del viewer_levels[level]
-
-    bad_viewers = []  # List of viewers that have foreign callbacks
+    syncing = set()
+    for level_viewers in viewer_levels.itervalues():
+        syncing.update(level_viewers)
 
-    for viewers in viewer_levels.values():
-        for viewer in viewers:
+    # If we find ANY viewers of the set being synced are synced already,
+    # we'll turn off syncing on all the viewers they're linked to that aren't
+    # being synced again. Safer that way.
+    remove_viewers = {}
+    for level_viewers in viewer_levels.itervalues():
+        for viewer in level_viewers.itervalues():
             try:
                 linked_viewers = _extract_viewer_list(viewer)
             except ValueError:
-                bad_viewers.append(viewer)
-            else:
-                remove_viewers.extend(linked_viewers)
+                # A foreign callback, which we leave alone.
+                continue
 
-    for rm_viewer in list(remove_viewers):
-        for viewers in viewer_levels.values():
-            if rm_viewer in viewers:
-                remove_viewers.remove(rm_viewer)
-        if rm_viewer in bad_viewers:
-            try:
-                remove_viewers.remove(rm_viewer)
-            except ValueError:
-                # We probably already removed this viewer above.
-                pass
+            for linked_viewer in linked_viewers:
+                name = linked_viewer.fullName()
+                if name not in syncing:
+                    remove_viewers[name] = linked_viewer
 
-    if remove_viewers:
-        for viewer in set(remove_viewers):
+    for viewer in remove_viewers.itervalues():
+        if 'viewerSync' in viewer['knobChanged'].value():
             viewer['knobChanged'].setValue('')
-            _remove_knobs(viewer)
+        _remove_knobs(viewer)
+        _forget_viewer(viewer)
+
+    register_callbacks()
+
+    active = nuke.activeViewer()
+    active_name = active.node().fullName() if active else None
 
-    for viewers in viewer_levels.values():
-        for viewer in bad_viewers:
-            if viewer in viewers:
-                viewers.remove(viewer)
+    for level_viewers in viewer_levels.itervalues():
+        viewers = level_viewers.values()
         for viewer in viewers:
             _add_sync_knobs(viewer)
             _set_callback(viewer, viewers)
+        _register_group(viewers)
 
-# =============================================================================
-
+        # Nothing syncs until a synced knob changes, so bring the group in
+        # line with the active viewer, or any of them if it isn't in the
+        # group.
+        _sync_group(level_viewers.get(active_name, viewers[0]))
 
-def sync_viewers(viewers):
-    """Syncs all the given viewers to the settings on the caller node.
+# =============================================================================
 
-    This is the primary callback for viewerSync. Through it, the actual sync
-    happens. Before the callback executes, we compare the calling knob to a
-    list of knobs that viewerSync is concerned about. If the caller knob isn't
-    on the white-list, or the calling knob isn't currently set to sync (via the
-    caller node's settings) we return early.
 
-    Otherwise we sync the knob values for the knob that called us.
+def stats(reset=False):
+    """Returns the callbacks, writes and timings recorded by viewerSync.
 
     Args:
-        viewers : [str]
-            This list of absolute viewer names will be resolved into
-            <nuke.nodes.Viewer>s, which will be synced to the caller
-            node's knob values.
+        reset=False : (bool)
+            Set every count back to zero once they've been read.
 
     Returns:
-        None
+        (dict)
+            callbacks : (int)
+                Viewer events handled, through the dispatcher or an older
+                knobChanged callback.
+
+            rejected : (int)
+                Events returned from early, as the knob isn't synced, the
+                viewer isn't synced, or syncing the knob is turned off.
+
+            suppressed : (int)
+                Events set off by a sync's own writes, and so ignored.
+
+            targets : (int)
+                Linked viewers synced to, summed over every event that
+                synced. Divided by the events that synced, this is the
+                fan-out of a sync.
+
+            written : (int)
+                Knobs and inputs set on targets.
+
+            skipped : (int)
+                Knobs and inputs left alone, as the target already had the
+                value.
+
+            timed : (int)
+                Events timed while instrumentation was on.
+
+            wall_time : (float)
+                Total seconds spent handling the timed events.
+
+            histogram : [(float, int)]
+                The number of timed events that took less than each bound
+                in `STATS_BUCKETS`, in milliseconds, and at least the bound
+                before. The last bound is `None`, for events slower than
+                every bound.
 
     Raises:
         N/A
 
     """
+    recorded = dict(_STATS)
+    recorded['histogram'] = zip(STATS_BUCKETS + [None], _STATS['histogram'])
 
-    caller = nuke.thisNode()
-    caller_knob = nuke.thisKnob().name()
+    if reset:
+        for key in _STATS:
+            _STATS[key] = 0
+        _STATS['wall_time'] = 0.0
+        _STATS['histogram'] = [0] * (len(STATS_BUCKETS) + 1)
 
-    # We need to check what knob is calling us first- if that knob isn't a
-    # syncing knob, we'll return.
-    if caller_knob not in ['inputChange', 'knobChanged']:
-        if caller_knob not in SYNC_DEFAULTS.keys() + VIEWER_SYNC_KNOBS:
-            return
+    return recorded
 
-        if caller_knob not in VIEWER_SYNC_KNOBS:
-            if not caller['vs_{knob}'.format(knob=caller_knob)].value():
-                # Sync setting is false for this knob
-                return
+# =============================================================================
 
-    # Grab our viewer nodes and remove any that have been deleted.
-    viewer_nodes = [
-        nuke.toNode(viewer) for viewer in viewers if nuke.toNode(viewer)
-    ]
 
-    if caller_knob in VIEWER_SYNC_KNOBS:
-        # Sync setting and continue
-        _sync_knob(caller, viewer_nodes, caller_knob)
-        if caller[caller_knob].value():
-            caller_knob = caller_knob.replace('vs_', '')
+def sync_viewers(viewers=None):
+    """Syncs all the given viewers to the settings on the caller node.
 
-    if caller_knob in ['inputChange', 'inputs']:
-        if caller['vs_inputs'].value():
-            for viewer in viewer_nodes:
-                for i in xrange(caller.inputs()):
-                    viewer.setInput(i, caller.input(i))
-        return
-    elif caller_knob == 'knobChanged':
-        knob_list = [
-            knob for knob in SYNC_DEFAULTS.keys() if SYNC_DEFAULTS[knob]
-        ]
-    else:
-        knob_list = [caller_knob]
+    This was the knobChanged callback of every synced viewer in older
+    versions of viewerSync, and keeps scripts saved with those callbacks
+    syncing. The first time one of those viewers syncs, its group is moved
+    over to the Viewer callbacks added by `register_callbacks`, and the old
+    callbacks are removed.
+
+    Args:
+        viewers=None : [str]
+            The absolute names of the viewers linked to the caller node.
+
+            Default: The names stored on the caller node.
+
+    Returns:
+        (int)
+            The number of writes skipped, as the target already had the
+            caller's value.
+
+    Raises:
+        N/A
+
+    """
+    return _timed_event(nuke.thisNode(), nuke.thisKnob().name(), viewers)
 
-    # Update remaining viewers to point at our current node.
-    for knob in knob_list:
-        _sync_knob(caller, viewer_nodes, knob)